@@ -1,6 +1,25 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from pydantic import Field
-from typing import Literal
+from pydantic import BaseModel, Field
+from typing import Any, Literal
+
+
+class StrategyConfig(BaseModel):
+    """
+    One strategy variant sharing the market data hub; unset fields fall
+    back to the top-level settings.
+    """
+
+    name: str
+    entry_rules: list[str] | None = None
+    ranking_weights: dict[str, float] | None = None
+    ranking_method: Literal["ZSCORE", "RANK"] | None = None
+    trade_amount_usdt: float | None = None
+    take_profit_pct: float | None = None
+    stop_loss_pct: float | None = None
+
+    class Config:
+        extra = "forbid"
 
 
 class Settings(BaseSettings):
@@ -11,6 +30,22 @@ class Settings(BaseSettings):
     # ---- Binance ----
     binance_api_key: str = Field(..., env="BINANCE_API_KEY")
     binance_api_secret: str = Field(..., env="BINANCE_API_SECRET")
+    # Order endpoints for LIVE mode; point at a local mock for dry runs
+    binance_api_url: str = "https://api.binance.com"
+    binance_recv_window_ms: int = 5000
+    # Market data hosts; requests go to the fastest healthy one and, with
+    # hedging on, are duplicated to a second host when slower than that
+    # host's p95. Hedges count against the same per-IP request weight.
+    binance_hosts: list[str] = [
+        "https://api.binance.com",
+        "https://api1.binance.com",
+        "https://api2.binance.com",
+        "https://api3.binance.com",
+        "https://api4.binance.com",
+    ]
+    hedge_requests: bool = False
+    # How often to re-estimate the exchange clock offset
+    clock_sync_interval_seconds: float = 60.0
 
     # ---- Trading ----
     symbols: list[str] = [
@@ -21,9 +56,56 @@ class Settings(BaseSettings):
     trade_amount_usdt: float = 40.0  # ≈ ₹3–4k
     max_trades_per_day: int = 10
 
+    # Entry rules in the core.rule_dsl syntax; None uses DEFAULT_ENTRY_RULES
+    entry_rules: list[str] | None = None
+
+    # Candidate ranking, see core.ranking.FACTORS; None uses the defaults
+    ranking_weights: dict[str, float] | None = None
+    ranking_method: Literal["ZSCORE", "RANK"] = "ZSCORE"
+
+    # Extra strategy variants run side by side on one market data hub;
+    # empty runs the single strategy defined by the settings above
+    strategies: list[StrategyConfig] = []
+
     take_profit_pct: float = 0.009   # 0.9%
     stop_loss_pct: float = 0.0065    # 0.65%
 
+    # Snapshots younger than this are served from cache
+    snapshot_ttl_seconds: float = 1.0
+    # 1m candles of history kept per symbol (1440 = one day)
+    kline_history_size: int = 1440
+    # Higher timeframes resampled locally from 1m candles (e.g. ["5m", "15m"]);
+    # adds close_<tf>, ema_9_<tf>, ema_21_<tf> and volume_<tf> rule fields
+    timeframes: list[str] = []
+    # Symbols whose data is older than this (or keeps failing) are not traded
+    max_data_age_seconds: float = 10.0
+    # How often data age and failure rates are logged
+    freshness_report_seconds: float = 60.0
+    # Refresh each symbol on its own interval (volatility, closeness to the
+    # entry rules, candle close) instead of the whole universe every tick;
+    # single-strategy runs only
+    adaptive_polling: bool = False
+    poll_min_interval_seconds: float = 1.0
+    poll_max_interval_seconds: float = 30.0
+    # Request weight per minute the scanner may spend (Binance allows 6000)
+    api_weight_per_minute: float = 1200.0
+    # Keep scanning and ranking while a trade is open, so the next entry is
+    # taken from a fresh ranking right after it closes
+    scan_during_trade: bool = True
+
+    # Split scanning and trading into two processes sharing market state in
+    # shared memory (market.shared_state): SCANNER fetches, computes and
+    # publishes, TRADER runs the engines on the published state. NONE runs
+    # both in one process.
+    market_state_role: Literal["NONE", "SCANNER", "TRADER"] = "NONE"
+    market_state_name: str = "binance_bot_market"
+    market_state_interval_seconds: float = 1.0
+
+    # Maintain local order books from the depth stream for spread and fills
+    use_order_book: bool = False
+    # Simulated order latency for paper fills against the local book
+    paper_latency_ms: float = 0.0
+
     # ---- Risk ----
     max_daily_loss_usdt: float = 2.0
     cooldown_minutes: int = 60
@@ -37,6 +119,23 @@ class Settings(BaseSettings):
     database_url: str = Field(default="", env="DATABASE_URL")  # For local PostgreSQL
     supabase_url: str = Field(default="", env="SUPABASE_URL")
     supabase_key: str = Field(default="", env="SUPABASE_KEY")
+    # bot_events older than this are rolled up into bot_event_rollups and
+    # their partitions dropped (LOCAL database; see init_database.py)
+    event_retention_days: int = 30
+
+    # ---- State ----
+    checkpoint_path: str = "state/checkpoint.json"
+
+    # ---- Logging ----
+    # Queue-backed JSON logging with rate limits on per-tick events
+    log_async: bool = False
+
+    # ---- Profiling ----
+    # SIGUSR1 profiles the running bot, SIGUSR2 dumps asyncio task stacks
+    profile_dir: str = "state/profiles"
+    profile_seconds: float = 30.0
+    # Local admin endpoint (/profile, /tasks) on 127.0.0.1; None disables it
+    admin_port: int | None = None
 
     # ---- Notifications ----
     telegram_bot_token: str | None = None
@@ -47,4 +146,17 @@ class Settings(BaseSettings):
         extra = "forbid"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build settings on first use instead of at import time, so modules that
+    only need `core`/`market` never touch the environment or `.env`.
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from config.settings import settings` working
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,224 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from core.models import Trade
+
+# Days of summaries kept in memory; older ones live only in the database
+DAYS_RETAINED = 31
+
+
+@dataclass
+class DailySummary:
+    day: date
+    strategy: str
+    trades: int = 0
+    wins: int = 0
+    pnl: Decimal = Decimal("0")
+    gross_profit: Decimal = Decimal("0")
+    gross_loss: Decimal = Decimal("0")
+    # Largest peak-to-trough drop of the running equity within the day
+    max_drawdown: Decimal = Decimal("0")
+    per_symbol: dict[str, Decimal] = field(default_factory=dict)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "day": self.day.isoformat(),
+            "strategy": self.strategy,
+            "trades": self.trades,
+            "wins": self.wins,
+            "pnl": str(self.pnl),
+            "gross_profit": str(self.gross_profit),
+            "gross_loss": str(self.gross_loss),
+            "max_drawdown": str(self.max_drawdown),
+            "per_symbol": {s: str(v) for s, v in self.per_symbol.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DailySummary":
+        return cls(
+            day=date.fromisoformat(data["day"]),
+            strategy=data["strategy"],
+            trades=int(data["trades"]),
+            wins=int(data["wins"]),
+            pnl=Decimal(data["pnl"]),
+            gross_profit=Decimal(data["gross_profit"]),
+            gross_loss=Decimal(data["gross_loss"]),
+            max_drawdown=Decimal(data["max_drawdown"]),
+            per_symbol={s: Decimal(v) for s, v in data.get("per_symbol", {}).items()},
+        )
+
+
+class PerformanceTracker:
+    """
+    Running performance aggregates, updated once per closed trade.
+
+    Every figure (equity, drawdown, win rate, Sharpe, per-symbol PnL and
+    the current day's summary) is maintained incrementally, so reading it
+    never scans trade history. Sharpe is per trade, from Welford's running
+    mean and variance of each trade's return on its notional.
+    """
+
+    def __init__(self, strategy: str = "default", curve_size: int = 1000) -> None:
+        self.strategy = strategy
+        self.equity = Decimal("0")
+        self.peak_equity = Decimal("0")
+        self.max_drawdown = Decimal("0")
+        self.trades = 0
+        self.wins = 0
+        self.gross_profit = Decimal("0")
+        self.gross_loss = Decimal("0")
+        self.per_symbol: dict[str, Decimal] = {}
+        # (closed_at, equity) after each trade
+        self.curve: deque[tuple[datetime, Decimal]] = deque(maxlen=curve_size)
+        self._days: dict[date, DailySummary] = {}
+        self._day_peak: dict[date, Decimal] = {}
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def record(self, trade: Trade) -> DailySummary:
+        """
+        Fold a closed trade into the aggregates.
+
+        Returns:
+            The updated summary for the trade's closing day
+        """
+        assert trade.closed_at is not None
+        pnl = trade.pnl or Decimal("0")
+
+        self.trades += 1
+        self.equity += pnl
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        else:
+            self.gross_loss -= pnl
+
+        self.peak_equity = max(self.peak_equity, self.equity)
+        self.max_drawdown = max(self.max_drawdown, self.peak_equity - self.equity)
+        self.per_symbol[trade.symbol] = self.per_symbol.get(trade.symbol, Decimal("0")) + pnl
+        self.curve.append((trade.closed_at, self.equity))
+
+        notional = trade.entry_price * trade.quantity
+        ret = float(pnl / notional) if notional else 0.0
+        delta = ret - self._mean
+        self._mean += delta / self.trades
+        self._m2 += delta * (ret - self._mean)
+
+        return self._record_day(trade, pnl)
+
+    def _record_day(self, trade: Trade, pnl: Decimal) -> DailySummary:
+        day = trade.closed_at.date()
+        summary = self._days.get(day)
+        if summary is None:
+            summary = self._days[day] = DailySummary(day=day, strategy=self.strategy)
+            self._day_peak[day] = Decimal("0")
+            for old in sorted(self._days)[:-DAYS_RETAINED]:
+                del self._days[old]
+                self._day_peak.pop(old, None)
+
+        summary.trades += 1
+        summary.pnl += pnl
+        if pnl > 0:
+            summary.wins += 1
+            summary.gross_profit += pnl
+        else:
+            summary.gross_loss -= pnl
+        summary.per_symbol[trade.symbol] = summary.per_symbol.get(trade.symbol, Decimal("0")) + pnl
+
+        self._day_peak[day] = max(self._day_peak[day], summary.pnl)
+        summary.max_drawdown = max(summary.max_drawdown, self._day_peak[day] - summary.pnl)
+        return summary
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def profit_factor(self) -> float | None:
+        if not self.gross_loss:
+            return None
+        return float(self.gross_profit / self.gross_loss)
+
+    @property
+    def sharpe(self) -> float | None:
+        if self.trades < 2:
+            return None
+        std = math.sqrt(self._m2 / (self.trades - 1))
+        return self._mean / std if std else None
+
+    def day(self, day: date) -> DailySummary | None:
+        return self._days.get(day)
+
+    def seed_day(self, summary: DailySummary) -> None:
+        """
+        Continue a day from its stored summary, e.g. after a restart without
+        a checkpoint, so the next upsert does not overwrite it with only the
+        trades closed since. The intraday peak is not stored; the larger of
+        zero and the day's PnL stands in for it.
+        """
+        if summary.day in self._days:
+            return
+        self._days[summary.day] = summary
+        self._day_peak[summary.day] = max(summary.pnl, Decimal("0"))
+
+    def summary(self) -> dict[str, Any]:
+        sharpe = self.sharpe
+        profit_factor = self.profit_factor
+        return {
+            "strategy": self.strategy,
+            "trades": self.trades,
+            "win_rate": round(self.win_rate, 4),
+            "equity": str(self.equity),
+            "max_drawdown": str(self.max_drawdown),
+            "sharpe": round(sharpe, 4) if sharpe is not None else None,
+            "profit_factor": round(profit_factor, 4) if profit_factor is not None else None,
+            "per_symbol": {s: str(v) for s, v in self.per_symbol.items()},
+        }
+
+    def export_state(self) -> dict[str, Any]:
+        return {
+            "equity": str(self.equity),
+            "peak_equity": str(self.peak_equity),
+            "max_drawdown": str(self.max_drawdown),
+            "trades": self.trades,
+            "wins": self.wins,
+            "gross_profit": str(self.gross_profit),
+            "gross_loss": str(self.gross_loss),
+            "per_symbol": {s: str(v) for s, v in self.per_symbol.items()},
+            "curve": [[ts.isoformat(), str(eq)] for ts, eq in self.curve],
+            "days": [s.to_dict() for s in self._days.values()],
+            "day_peaks": {d.isoformat(): str(p) for d, p in self._day_peak.items()},
+            "mean": self._mean,
+            "m2": self._m2,
+        }
+
+    def restore_state(self, state: dict[str, Any]) -> None:
+        self.equity = Decimal(state["equity"])
+        self.peak_equity = Decimal(state["peak_equity"])
+        self.max_drawdown = Decimal(state["max_drawdown"])
+        self.trades = int(state["trades"])
+        self.wins = int(state["wins"])
+        self.gross_profit = Decimal(state["gross_profit"])
+        self.gross_loss = Decimal(state["gross_loss"])
+        self.per_symbol = {s: Decimal(v) for s, v in state["per_symbol"].items()}
+        self.curve.clear()
+        self.curve.extend(
+            (datetime.fromisoformat(ts), Decimal(eq)) for ts, eq in state["curve"]
+        )
+        self._days = {}
+        for data in state["days"]:
+            summary = DailySummary.from_dict(data)
+            self._days[summary.day] = summary
+        self._day_peak = {
+            date.fromisoformat(d): Decimal(p) for d, p in state["day_peaks"].items()
+        }
+        self._mean = float(state["mean"])
+        self._m2 = float(state["m2"])
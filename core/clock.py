@@ -0,0 +1,170 @@
+"""
+Time source for the bot.
+
+Everything time-dependent in `core`, `execution` and `wallet` reads the
+time and sleeps through a Clock, so it can run on simulated time:
+
+    clock = VirtualClock(start=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    engine = TradingEngine(..., clock=clock)
+    task = asyncio.create_task(engine.run())
+    await clock.advance(24 * 3600)   # a trading day, see sim.virtual_day
+
+Components take an optional `clock` and fall back to the process-wide one
+from get_clock(). The module-level functions below delegate to it.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+
+class Clock(ABC):
+    @abstractmethod
+    def time(self) -> float:
+        """Exchange-corrected epoch seconds."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        ...
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        ...
+
+    def now_ms(self) -> int:
+        return int(self.time() * 1000)
+
+    def utc_now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    def ms_until_candle_close(self, interval_ms: int = 60_000) -> int:
+        """
+        Milliseconds until the current exchange candle of `interval_ms` closes.
+        """
+        return interval_ms - self.now_ms() % interval_ms
+
+
+class SystemClock(Clock):
+    """
+    Wall-clock time shifted by the exchange offset that
+    market.clock_sync.ClockSync maintains.
+    """
+
+    def __init__(self) -> None:
+        self.offset_ms = 0.0
+
+    def time(self) -> float:
+        return time.time() + self.offset_ms / 1000
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def utc_now(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(milliseconds=self.offset_ms)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time that only moves when advanced.
+
+    Sleepers are kept in a heap by deadline. advance() wakes them in
+    deadline order and, after each wake-up, lets the event loop run
+    `settle_rounds` iterations. Code woken from a sleep that goes on to
+    sleep again therefore registers its next deadline before time moves
+    further. Work that blocks on real I/O or threads is not waited for.
+    """
+
+    def __init__(self, start: datetime | None = None, settle_rounds: int = 20) -> None:
+        start = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._now = start.timestamp()
+        self._settle_rounds = settle_rounds
+        self._sleepers: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + seconds, next(self._seq), future))
+        # A cancelled sleeper stays in the heap and is skipped when due
+        await future
+
+    @property
+    def next_deadline(self) -> float | None:
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        return self._sleepers[0][0] if self._sleepers else None
+
+    async def _settle(self) -> None:
+        for _ in range(self._settle_rounds):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds: float) -> None:
+        """
+        Move time forward by `seconds`, waking every sleeper due on the way.
+        """
+        target = self._now + seconds
+        await self._settle()
+
+        while (deadline := self.next_deadline) is not None and deadline <= target:
+            _, _, future = heapq.heappop(self._sleepers)
+            self._now = max(self._now, deadline)
+            future.set_result(None)
+            await self._settle()
+
+        self._now = max(self._now, target)
+
+    async def advance_to(self, when: datetime) -> None:
+        await self.advance(when.timestamp() - self._now)
+
+
+_system_clock = SystemClock()
+_clock: Clock = _system_clock
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    """
+    Replace the process-wide clock, e.g. with a VirtualClock for a replay.
+    """
+    global _clock
+    _clock = clock
+
+
+def set_exchange_offset(offset_ms: float) -> None:
+    _system_clock.offset_ms = offset_ms
+
+
+def exchange_offset_ms() -> float:
+    return _system_clock.offset_ms
+
+
+def now_ms() -> int:
+    """
+    Exchange-corrected epoch milliseconds.
+    """
+    return _clock.now_ms()
+
+
+def utc_now() -> datetime:
+    """
+    Exchange-corrected current time; use instead of datetime.now(timezone.utc).
+    """
+    return _clock.utc_now()
@@ -1,16 +1,21 @@
 import asyncio
 from decimal import Decimal
+from typing import Any, Callable, Sequence
 import structlog
 
+from core.analytics import PerformanceTracker
+from core.clock import Clock, get_clock
 from core.state_machine import StateMachine
 from core.enums import BotState
-from core.rules import entry_conditions
-from core.selector import select_best
+from core.rules import DEFAULT_ENTRY_RULES
+from core.rule_dsl import RuleSet
+from core.ranking import RankedCandidate, Ranker
 from core.risk import RiskManager
 from execution.executor import TradeExecutor
 from execution.sl_tp import calculate_take_profit, calculate_stop_loss
-from market.analyzer import analyze_symbols
+from market.analyzer import DirectMarketData
 from core.models import MarketSnapshot
+from core.serialization import snapshot_from_dict, snapshot_to_dict
 
 logger = structlog.get_logger()
 
@@ -27,6 +32,20 @@ class TradingEngine:
         trade_repo=None,
         event_repo=None,
         notifier=None,
+        checkpoint=None,
+        entry_rules: RuleSet | None = None,
+        ranker: Ranker | None = None,
+        top_k: int = 5,
+        market_data=None,
+        name: str = "default",
+        analytics: PerformanceTracker | None = None,
+        rule_columns: Callable[[Sequence[MarketSnapshot]], dict[str, Sequence[Any]]] | None = None,
+        rule_resolver: Callable[[str, MarketSnapshot], Any] | None = None,
+        clock: Clock | None = None,
+        freshness=None,
+        scheduler=None,
+        scan_during_trade: bool = True,
+        scan_market_data=None,
     ) -> None:
         self._symbols = symbols
         self._executor = executor
@@ -37,57 +56,199 @@ class TradingEngine:
         self._trade_repo = trade_repo
         self._event_repo = event_repo
         self._notifier = notifier
+        self._checkpoint = checkpoint
+        self._entry_rules = entry_rules or RuleSet.compile(DEFAULT_ENTRY_RULES)
+        self._ranker = ranker or Ranker()
+        self._top_k = top_k
+        # Anything with `async get_snapshots(symbols)`: direct fetches or a
+        # market.hub subscription shared with other engines
+        self._market_data = market_data or DirectMarketData()
+        # Source for scans; separate from exit checks so a hub subscription
+        # polled by the in-trade scanner does not consume their frames
+        self._scan_market_data = scan_market_data or self._market_data
+        self._name = name
+        self._log = logger.bind(strategy=name)
+        # (top candidates, monotonic time ranked), replaced as a whole so a
+        # reader never sees one scan's list with another's time
+        self._ranking: tuple[tuple[RankedCandidate, ...], float | None] = ((), None)
+        self._analytics = analytics or PerformanceTracker(name)
+        # Extra per-symbol rule fields, e.g. market.timeframes columns
+        self._rule_columns = rule_columns
+        # Lazily computed rule fields, e.g. IndicatorSet.resolve
+        self._rule_resolver = rule_resolver
+        # Pacing sleeps go through the clock so replays can run on virtual time
+        self._clock = clock or get_clock()
+        # Optional market.freshness.FreshnessMonitor; stale symbols are
+        # never selected and stale prices never close a trade
+        self._freshness = freshness
+        # Optional market.poll_scheduler.PollScheduler; only symbols it
+        # reports due are refetched, the rest keep their last snapshot
+        self._scheduler = scheduler
+        # Keep ranking candidates while a trade is open, so the next entry
+        # can be taken as soon as it closes instead of after a cold scan
+        self._scan_during_trade = scan_during_trade
+        self._scan_lock = asyncio.Lock()
 
         self._state_machine = StateMachine()
+        self._last_snapshots: dict[str, MarketSnapshot] = {}
 
     async def run(self) -> None:
-        logger.info("engine.started")
-        self._state_machine.transition(BotState.SCANNING)
+        self._log.info("engine.started")
+        if not self._restore_checkpoint():
+            await self._seed_from_summary()
 
-        while True:
-            try:
-                await self._tick()
-            except Exception as exc:
-                logger.exception("engine.error", error=str(exc))
-                await asyncio.sleep(5)
+        if self._executor.has_active_trade:
+            self._state_machine.transition(BotState.IN_TRADE)
+        else:
+            self._state_machine.transition(BotState.SCANNING)
+
+        scanner = (
+            asyncio.create_task(self._scan_in_trade()) if self._scan_during_trade else None
+        )
+        try:
+            while True:
+                try:
+                    await self._tick()
+                except Exception as exc:
+                    self._log.exception("engine.error", error=str(exc))
+                    await self._clock.sleep(5)
+        finally:
+            if scanner is not None:
+                scanner.cancel()
 
     async def _tick(self) -> None:
-        logger.info("engine.tick")
+        self._log.info("engine.tick")
         # 1️⃣ If trade active → monitor exit
         if self._executor.has_active_trade:
             await self._handle_active_trade()
-            await asyncio.sleep(1)
+            await self._clock.sleep(1)
             return
 
         # 2️⃣ Check risk
         allowed, reason = self._risk.can_trade()
 
         if not allowed:
-            logger.info("trade.blocked", reason=reason)
-            await asyncio.sleep(self._poll_interval)
+            self._log.info("trade.blocked", reason=reason)
+            await self._clock.sleep(self._poll_interval)
             return
 
-        # 3️⃣ Fetch market snapshots
-        snapshots = await analyze_symbols(self._symbols)
-
-        # 4️⃣ Apply entry rules
-        candidates: list[MarketSnapshot] = [
-            s for s in snapshots if entry_conditions(s)
-        ]
-
-        # 5️⃣ Select best candidate
-        selected = select_best(candidates)
+        # 3️⃣-5️⃣ Fetch, filter and rank the universe
+        candidates = await self._scan()
+        ranked, _ = self._ranking
+        selected = ranked[0].snapshot if ranked else None
 
-        logger.info("market.selected", selected=selected)
+        self._log.info(
+            "market.selected",
+            selected=selected.symbol if selected else None,
+            candidates=len(candidates),
+        )
         if not selected:
-            await asyncio.sleep(self._poll_interval)
+            await self._clock.sleep(self._scan_pause())
             return
 
         # 6️⃣ Execute trade
         await self._open_trade(selected)
 
+    async def _scan(self) -> list[MarketSnapshot]:
+        """
+        Refresh snapshots, apply the entry rules and rank the survivors
+        into `_ranking`.
+
+        Returns:
+            Every candidate that passed the rules
+        """
+        async with self._scan_lock:
+            return await self._scan_unlocked()
+
+    async def _scan_unlocked(self) -> list[MarketSnapshot]:
+        # 3️⃣ Fetch market snapshots
+        if self._scheduler is None:
+            snapshots = await self._scan_market_data.get_snapshots(self._symbols)
+            self._last_snapshots.update((s.symbol, s) for s in snapshots)
+        else:
+            due = self._scheduler.due()
+            fetched = await self._scan_market_data.get_snapshots(due) if due else []
+            self._last_snapshots.update((s.symbol, s) for s in fetched)
+            self._scheduler.update(fetched, requested=due)
+            snapshots = [
+                self._last_snapshots[symbol]
+                for symbol in self._symbols
+                if symbol in self._last_snapshots
+            ]
+
+        if self._freshness is not None:
+            snapshots, stale = self._freshness.filter(snapshots)
+            if self._scheduler is not None:
+                # Quiet symbols are refreshed less often than the max age
+                # on purpose; only report real lag and failures
+                stale = {s: r for s, r in stale.items() if r != "not refreshed"}
+            if stale:
+                self._log.info("market.stale", symbols=stale)
+
+        # 4️⃣ Apply entry rules
+        extra = self._rule_columns(snapshots) if self._rule_columns else None
+        result = self._entry_rules.evaluate(snapshots, extra, self._rule_resolver)
+        candidates: list[MarketSnapshot] = result.passed
+        self._log.debug("rules.rejected", failures=result.failures)
+
+        # 5️⃣ Rank candidates
+        self._ranking = (
+            tuple(self._ranker.top_k(candidates, k=self._top_k)),
+            self._clock.monotonic(),
+        )
+        return candidates
+
+    async def _scan_in_trade(self) -> None:
+        while True:
+            if self._executor.has_active_trade:
+                try:
+                    await self._scan()
+                    self._log.debug(
+                        "market.prescanned",
+                        ranked=[c.snapshot.symbol for c in self._ranking[0]],
+                    )
+                except Exception as exc:
+                    self._log.warning("market.prescan_failed", error=str(exc))
+            await self._clock.sleep(self._scan_pause())
+
+    async def _enter_from_ranking(self) -> bool:
+        """
+        Open the next trade from the ranking kept warm during the last one.
+
+        The ranked symbols are refetched and must still pass the entry
+        rules, so only the scan of the rest of the universe is skipped.
+        """
+        candidates, ranked_at = self._ranking
+        if not candidates or ranked_at is None:
+            return False
+        if self._clock.monotonic() - ranked_at > 2 * self._poll_interval:
+            return False
+
+        allowed, _ = self._risk.can_trade()
+        if not allowed:
+            return False
+
+        ranked = [c.snapshot.symbol for c in candidates]
+        snapshots = await self._scan_market_data.get_snapshots(ranked)
+        self._last_snapshots.update((s.symbol, s) for s in snapshots)
+        if self._freshness is not None:
+            snapshots, _ = self._freshness.filter(snapshots)
+
+        extra = self._rule_columns(snapshots) if self._rule_columns else None
+        passed = {
+            s.symbol: s
+            for s in self._entry_rules.evaluate(snapshots, extra, self._rule_resolver).passed
+        }
+        selected = next((passed[symbol] for symbol in ranked if symbol in passed), None)
+        if selected is None:
+            return False
+
+        self._log.info("market.selected", selected=selected.symbol, prescanned=True)
+        await self._open_trade(selected)
+        return True
+
     async def _open_trade(self, snapshot: MarketSnapshot) -> None:
-        logger.info(
+        self._log.info(
             "trade.opening",
             symbol=snapshot.symbol,
             price=str(snapshot.price),
@@ -104,8 +265,9 @@ class TradingEngine:
         )
 
         self._state_machine.transition(BotState.IN_TRADE)
+        await self._save_checkpoint()
 
-        logger.info(
+        self._log.info(
             "trade.opened",
             trade_id=trade.trade_id,
             symbol=trade.symbol,
@@ -127,36 +289,52 @@ class TradingEngine:
                 await self._notifier.send(trade_open_message(trade))
 
         except Exception as exc:
-            logger.warning("trade.open.side_effect_failed", error=str(exc))
+            self._log.warning("trade.open.side_effect_failed", error=str(exc))
 
     async def _handle_active_trade(self) -> None:
         trade = self._executor._active_trade
         assert trade is not None
 
-        # Fetch only price for the active symbol
-        snapshots = await analyze_symbols([trade.symbol])
-        if not snapshots:
-            return
+        # Exchange-side exits (live OCO) may already have closed it
+        closed_trade = await self._executor.poll_exchange_exit()
 
-        current_price = snapshots[0].price
+        if closed_trade is None:
+            # Fetch only price for the active symbol
+            snapshots = await self._market_data.get_snapshots([trade.symbol])
+            if not snapshots:
+                return
 
-        if not await self._executor.should_close_trade(current_price):
-            return
+            self._last_snapshots[trade.symbol] = snapshots[0]
+
+            if self._freshness is not None:
+                reason = self._freshness.stale_reason(trade.symbol)
+                if reason is not None:
+                    self._log.warning("trade.price_stale", symbol=trade.symbol, reason=reason)
+                    return
+            current_price = snapshots[0].price
 
-        closed_trade = await self._executor.close_trade(current_price)
+            if not await self._executor.should_close_trade(current_price):
+                return
+
+            closed_trade = await self._executor.close_trade(current_price)
 
         self._risk.record_trade_result(closed_trade.pnl or Decimal("0"))
+        day_summary = self._analytics.record(closed_trade)
+        await self._save_checkpoint()
 
-        logger.info(
+        self._log.info(
             "trade.closed",
             trade_id=closed_trade.trade_id,
             symbol=closed_trade.symbol,
             pnl=str(closed_trade.pnl),
+            equity=str(self._analytics.equity),
+            win_rate=round(self._analytics.win_rate, 4),
         )
         # ---- Persistence & Notifications (non-blocking) ----
         try:
             if self._trade_repo:
                 await self._trade_repo.save_trade(closed_trade)
+                await self._trade_repo.save_daily_summary(day_summary)
 
             if self._event_repo:
                 await self._event_repo.log_event(
@@ -169,10 +347,110 @@ class TradingEngine:
                 await self._notifier.send(trade_close_message(closed_trade))
 
         except Exception as exc:
-            logger.warning("trade.close.side_effect_failed", error=str(exc))
+            self._log.warning("trade.close.side_effect_failed", error=str(exc))
 
         self._state_machine.transition(BotState.COOLDOWN)
-        await asyncio.sleep(2)
+        if self._scan_during_trade:
+            if not await self._enter_from_ranking():
+                self._state_machine.transition(BotState.SCANNING)
+            return
+
+        await self._clock.sleep(2)
         self._state_machine.transition(BotState.SCANNING)
 
+    def _scan_pause(self) -> float:
+        if self._scheduler is None:
+            return self._poll_interval
+        return min(self._poll_interval, self._scheduler.seconds_until_due())
+
+    @property
+    def analytics(self) -> PerformanceTracker:
+        return self._analytics
+
+    async def _seed_from_summary(self) -> None:
+        # Without a checkpoint, today's losses would otherwise be forgotten
+        # and today's stored summary overwritten by the next trade
+        if self._trade_repo is None:
+            return
+
+        try:
+            summary = await self._trade_repo.get_daily_summary(
+                self._clock.utc_now().date(), self._name
+            )
+        except Exception as exc:
+            self._log.warning("risk.seed_failed", error=str(exc))
+            return
+
+        if summary is not None:
+            self._risk.seed_today(summary.pnl, summary.trades)
+            self._analytics.seed_day(summary)
+            self._log.info("risk.seeded", pnl=str(summary.pnl), trades=summary.trades)
+
+    def _restore_checkpoint(self) -> bool:
+        if self._checkpoint is None:
+            return False
+
+        state = self._checkpoint.load()
+        if state is None:
+            self._log.info("checkpoint.not_found")
+            return False
+
+        # Each component parses its part before assigning; if a later part
+        # fails, the ones already restored are put back as they were
+        previous = [
+            (self._executor, self._executor.export_state()),
+            (self._risk, self._risk.export_state()),
+            (self._analytics, self._analytics.export_state()),
+        ]
+        try:
+            saved_state = BotState(state["state"]) if "state" in state else None
+            snapshots = {
+                s["symbol"]: snapshot_from_dict(s) for s in state.get("snapshots", [])
+            }
+            self._executor.restore_state(state["executor"])
+            self._risk.restore_state(state["risk"])
+            if "analytics" in state:
+                self._analytics.restore_state(state["analytics"])
+        except (KeyError, ValueError, ArithmeticError) as exc:
+            for component, exported in previous:
+                component.restore_state(exported)
+            self._log.warning("checkpoint.restore_failed", error=str(exc))
+            return False
+
+        self._last_snapshots = snapshots
+
+        active = self._executor._active_trade
+        # The active trade is authoritative: a saved state that disagrees
+        # with it is reported and dropped, run() derives the state instead
+        if saved_state is not None:
+            if (saved_state == BotState.IN_TRADE) == (active is not None):
+                self._state_machine.transition(saved_state)
+            else:
+                self._log.warning(
+                    "checkpoint.state_mismatch",
+                    saved_state=saved_state.value,
+                    active_trade=active.trade_id if active else None,
+                )
+        self._log.info(
+            "checkpoint.restored",
+            active_trade=active.trade_id if active else None,
+            snapshots=len(self._last_snapshots),
+        )
+        return True
+
+    async def _save_checkpoint(self) -> None:
+        if self._checkpoint is None:
+            return
 
+        state = {
+            "state": self._state_machine.state.value,
+            "executor": self._executor.export_state(),
+            "risk": self._risk.export_state(),
+            "analytics": self._analytics.export_state(),
+            "snapshots": [snapshot_to_dict(s) for s in self._last_snapshots.values()],
+        }
+
+        try:
+            await self._checkpoint.save(state)
+        except OSError as exc:
+            self._log.warning("checkpoint.save_failed", error=str(exc))
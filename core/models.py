@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketSnapshot:
     symbol: str
     price: Decimal
@@ -28,3 +28,5 @@ class Trade:
     exit_price: Optional[Decimal] = None
     closed_at: Optional[datetime] = None
     pnl: Optional[Decimal] = None
+    # Quote actually spent on entry, fees included, where the wallet knows it
+    entry_cost: Optional[Decimal] = None
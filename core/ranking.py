@@ -0,0 +1,120 @@
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Callable, Literal, Sequence
+
+from core.models import MarketSnapshot
+
+NormalizationMethod = Literal["ZSCORE", "RANK"]
+
+
+def _trend(s: MarketSnapshot) -> float:
+    # Relative EMA gap, comparable across price levels
+    return float((s.ema_9 - s.ema_21) / s.ema_21) if s.ema_21 else 0.0
+
+
+def _vwap_premium(s: MarketSnapshot) -> float:
+    return float((s.price - s.vwap) / s.vwap) if s.vwap else 0.0
+
+
+FACTORS: dict[str, Callable[[MarketSnapshot], float]] = {
+    "trend": _trend,
+    "volume": lambda s: float(s.volume_ratio),
+    "vwap_premium": _vwap_premium,
+    "tight_spread": lambda s: -float(s.spread_pct),
+}
+
+DEFAULT_FACTOR_WEIGHTS: dict[str, float] = {
+    "trend": 1.0,
+    "volume": 1.0,
+}
+
+
+@dataclass(frozen=True)
+class RankedCandidate:
+    snapshot: MarketSnapshot
+    score: float
+
+
+def zscores(values: Sequence[float]) -> list[float]:
+    n = len(values)
+    if n == 0:
+        return []
+
+    mean = math.fsum(values) / n
+    var = math.fsum((v - mean) ** 2 for v in values) / n
+    std = math.sqrt(var)
+    if std == 0:
+        return [0.0] * n
+
+    return [(v - mean) / std for v in values]
+
+
+def ranks(values: Sequence[float]) -> list[float]:
+    """
+    Ranks scaled to [0, 1]; ties share their average rank.
+    """
+    n = len(values)
+    if n <= 1:
+        return [0.5] * n
+
+    order = sorted(range(n), key=values.__getitem__)
+    result = [0.0] * n
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        avg = (i + j) / 2 / (n - 1)
+        for k in range(i, j + 1):
+            result[order[k]] = avg
+        i = j + 1
+
+    return result
+
+
+class Ranker:
+    """
+    Weighted multi-factor ranking of candidates.
+
+    Each factor is extracted as a column over the whole universe, normalized
+    cross-sectionally, and combined with its weight. Only the top `k` are
+    ordered, via a heap.
+    """
+
+    def __init__(
+        self,
+        weights: dict[str, float] | None = None,
+        method: NormalizationMethod = "ZSCORE",
+    ) -> None:
+        weights = DEFAULT_FACTOR_WEIGHTS if weights is None else weights
+
+        unknown = set(weights) - set(FACTORS)
+        if unknown:
+            raise ValueError(f"Unknown ranking factors: {sorted(unknown)}")
+
+        self._weights = {name: w for name, w in weights.items() if w != 0}
+        self._normalize = zscores if method == "ZSCORE" else ranks
+
+    def scores(self, candidates: Sequence[MarketSnapshot]) -> list[float]:
+        total = [0.0] * len(candidates)
+
+        for name, weight in self._weights.items():
+            column = self._normalize([FACTORS[name](s) for s in candidates])
+            for i, value in enumerate(column):
+                total[i] += weight * value
+
+        return total
+
+    def top_k(
+        self,
+        candidates: Sequence[MarketSnapshot],
+        k: int = 1,
+    ) -> list[RankedCandidate]:
+        if not candidates or k <= 0:
+            return []
+
+        scored = zip(self.scores(candidates), range(len(candidates)))
+        best = heapq.nlargest(k, scored)
+
+        return [RankedCandidate(candidates[i], score) for score, i in best]
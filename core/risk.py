@@ -1,6 +1,7 @@
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
+from core.clock import Clock, get_clock
 from core.enums import BotState
 
 
@@ -12,7 +13,9 @@ class RiskManager:
         cooldown_minutes: int,
         trading_start_hour: int,
         trading_end_hour: int,
+        clock: Clock | None = None,
     ) -> None:
+        self._clock = clock or get_clock()
         self._max_daily_loss = max_daily_loss
         self._max_trades = max_trades_per_day
         self._cooldown = timedelta(minutes=cooldown_minutes)
@@ -22,10 +25,10 @@ class RiskManager:
         self._daily_pnl: Decimal = Decimal("0")
         self._trades_today: int = 0
         self._last_loss_time: datetime | None = None
-        self._current_day: datetime.date = datetime.now(timezone.utc).date()
+        self._current_day: datetime.date = self._clock.utc_now().date()
 
     def reset_if_new_day(self) -> None:
-        today = datetime.now(timezone.utc).date()
+        today = self._clock.utc_now().date()
         if today != self._current_day:
             self._current_day = today
             self._daily_pnl = Decimal("0")
@@ -37,12 +40,25 @@ class RiskManager:
         self._trades_today += 1
 
         if pnl < 0:
-            self._last_loss_time = datetime.now(timezone.utc)
+            self._last_loss_time = self._clock.utc_now()
+
+    def seed_today(self, pnl: Decimal, trades: int) -> None:
+        """
+        Start today's counters from a stored daily summary, e.g. after a
+        restart without a checkpoint.
+        """
+        self.reset_if_new_day()
+        self._daily_pnl = pnl
+        self._trades_today = trades
+
+    @property
+    def daily_pnl(self) -> Decimal:
+        return self._daily_pnl
 
     def can_trade(self) -> tuple[bool, str]:
         self.reset_if_new_day()
 
-        now = datetime.now(timezone.utc)
+        now = self._clock.utc_now()
 
         # Time window check
         if not (self._start_hour <= now.hour < self._end_hour):
@@ -65,3 +81,30 @@ class RiskManager:
 
     def should_stop_bot(self) -> bool:
         return self._daily_pnl <= -self._max_daily_loss
+
+    def export_state(self) -> dict:
+        return {
+            "daily_pnl": str(self._daily_pnl),
+            "trades_today": self._trades_today,
+            "last_loss_time": (
+                self._last_loss_time.isoformat() if self._last_loss_time else None
+            ),
+            "current_day": self._current_day.isoformat(),
+        }
+
+    def restore_state(self, state: dict) -> None:
+        daily_pnl = Decimal(state["daily_pnl"])
+        trades_today = int(state["trades_today"])
+        last_loss_time = (
+            datetime.fromisoformat(state["last_loss_time"])
+            if state.get("last_loss_time")
+            else None
+        )
+        current_day = date.fromisoformat(state["current_day"])
+
+        self._daily_pnl = daily_pnl
+        self._trades_today = trades_today
+        self._last_loss_time = last_loss_time
+        self._current_day = current_day
+        # Counters from a previous day must not leak into today
+        self.reset_if_new_day()
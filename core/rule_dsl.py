@@ -0,0 +1,261 @@
+"""
+Declarative entry rules.
+
+A rule is a single comparison written as text, e.g.::
+
+    spread_pct < 0.08
+    ema_9 >= ema_21 * 1.0003
+    price >= vwap * 0.9995
+
+The left side is a field name; the right side is a number, a field, or a
+field scaled by a number. A value of None (e.g. an indicator without
+enough history yet) fails the clause. A rule set is compiled once and then evaluated
+column-wise against the whole universe: each field is extracted once per
+scan and every clause runs over the symbols still alive, so the first
+failing clause per symbol is known without evaluating the rest.
+
+Fields without a precomputed column can be supplied by a resolver, which
+is only called for symbols still alive when a clause needs them. Given
+field costs, clauses are ordered cheapest first so expensive indicators
+run only on symbols that passed the cheap filters.
+"""
+
+import operator
+import re
+from dataclasses import dataclass, field, fields
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Iterable, Sequence
+
+from core.models import MarketSnapshot
+
+SNAPSHOT_FIELDS = frozenset(
+    f.name for f in fields(MarketSnapshot) if f.name not in ("symbol", "timestamp")
+)
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_NAME = r"[A-Za-z_][A-Za-z0-9_]*"
+_NUMBER = r"-?\d+(?:\.\d+)?"
+
+_RULE_RE = re.compile(rf"^\s*({_NAME})\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$")
+_RHS_NUMBER = re.compile(rf"^({_NUMBER})$")
+_RHS_FIELD = re.compile(rf"^({_NAME})(?:\s*\*\s*({_NUMBER}))?$")
+_RHS_SCALED = re.compile(rf"^({_NUMBER})\s*\*\s*({_NAME})$")
+
+
+@dataclass(frozen=True)
+class Clause:
+    text: str
+    left: str
+    op: Callable[[Any, Any], bool]
+    right_field: str | None
+    factor: Decimal
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        if self.right_field is None:
+            return (self.left,)
+        return (self.left, self.right_field)
+
+
+class _LazyColumn:
+    """
+    Column whose values are resolved on first access, per symbol.
+    """
+
+    __slots__ = ("_name", "_snapshots", "_resolver", "_values")
+
+    def __init__(
+        self,
+        name: str,
+        snapshots: Sequence[MarketSnapshot],
+        resolver: Callable[[str, MarketSnapshot], Any],
+    ) -> None:
+        self._name = name
+        self._snapshots = snapshots
+        self._resolver = resolver
+        self._values: dict[int, Any] = {}
+
+    def __getitem__(self, index: int) -> Any:
+        try:
+            return self._values[index]
+        except KeyError:
+            value = self._values[index] = self._resolver(self._name, self._snapshots[index])
+            return value
+
+
+@dataclass
+class RuleResult:
+    passed: list[MarketSnapshot]
+    # symbol -> text of the first clause it failed
+    failures: dict[str, str] = field(default_factory=dict)
+
+
+def parse_clause(text: str, allowed_fields: Iterable[str] = SNAPSHOT_FIELDS) -> Clause:
+    allowed = set(allowed_fields)
+
+    match = _RULE_RE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid rule: {text!r}")
+
+    left, op_text, rhs = match.groups()
+    right_field: str | None = None
+
+    try:
+        if m := _RHS_NUMBER.match(rhs):
+            factor = Decimal(m.group(1))
+        elif m := _RHS_FIELD.match(rhs):
+            right_field = m.group(1)
+            factor = Decimal(m.group(2)) if m.group(2) else Decimal("1")
+        elif m := _RHS_SCALED.match(rhs):
+            factor = Decimal(m.group(1))
+            right_field = m.group(2)
+        else:
+            raise ValueError(f"Invalid right-hand side in rule: {text!r}")
+    except InvalidOperation as exc:
+        raise ValueError(f"Invalid number in rule: {text!r}") from exc
+
+    for name in (left, right_field):
+        if name is not None and name not in allowed:
+            raise ValueError(f"Unknown field {name!r} in rule: {text!r}")
+
+    return Clause(
+        text=text.strip(),
+        left=left,
+        op=_OPERATORS[op_text],
+        right_field=right_field,
+        factor=factor,
+    )
+
+
+class RuleSet:
+    def __init__(self, clauses: Sequence[Clause]) -> None:
+        self._clauses = list(clauses)
+        self._fields = sorted({name for c in self._clauses for name in c.fields})
+
+    @classmethod
+    def compile(
+        cls,
+        rules: Iterable[str],
+        extra_fields: Iterable[str] = (),
+        costs: dict[str, int] | None = None,
+    ) -> "RuleSet":
+        """
+        Args:
+            rules: Rule texts
+            extra_fields: Field names allowed besides snapshot fields
+            costs: Relative cost per field (default 0); when given, clauses
+                run cheapest first, otherwise in the order written
+        """
+        allowed = SNAPSHOT_FIELDS | set(extra_fields)
+        clauses = [parse_clause(rule, allowed) for rule in rules]
+        if costs:
+            clauses.sort(key=lambda c: sum(costs.get(name, 0) for name in c.fields))
+        return cls(clauses)
+
+    @property
+    def clauses(self) -> list[Clause]:
+        return list(self._clauses)
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self._fields)
+
+    def evaluate(
+        self,
+        snapshots: Sequence[MarketSnapshot],
+        extra_columns: dict[str, Sequence[Any]] | None = None,
+        resolver: Callable[[str, MarketSnapshot], Any] | None = None,
+    ) -> RuleResult:
+        """
+        Evaluate every clause over the universe in one pass per clause.
+
+        Args:
+            snapshots: Snapshots to filter
+            extra_columns: Additional per-symbol values (e.g. indicators),
+                aligned with `snapshots`
+            resolver: resolver(field, snapshot) for fields that are neither
+                snapshot fields nor in `extra_columns`; called lazily
+
+        Returns:
+            Passing snapshots, in input order, and the first failed clause
+            for every rejected symbol
+        """
+        columns: dict[str, Sequence[Any]] = dict(extra_columns or {})
+        for name in self._fields:
+            if name in columns:
+                continue
+            if resolver is not None and name not in SNAPSHOT_FIELDS:
+                columns[name] = _LazyColumn(name, snapshots, resolver)
+            else:
+                columns[name] = [getattr(s, name) for s in snapshots]
+
+        alive = range(len(snapshots))
+        failures: dict[str, str] = {}
+
+        for clause in self._clauses:
+            if not alive:
+                break
+
+            left = columns[clause.left]
+            op = clause.op
+            factor = clause.factor
+
+            if clause.right_field is None:
+                mask = [left[i] is not None and op(left[i], factor) for i in alive]
+            else:
+                right = columns[clause.right_field]
+                mask = [
+                    left[i] is not None
+                    and right[i] is not None
+                    and op(left[i], right[i] * factor)
+                    for i in alive
+                ]
+
+            survivors = []
+            for i, ok in zip(alive, mask):
+                if ok:
+                    survivors.append(i)
+                else:
+                    failures[snapshots[i].symbol] = clause.text
+            alive = survivors
+
+        return RuleResult(
+            passed=[snapshots[i] for i in alive],
+            failures=failures,
+        )
+
+    def distance(self, snapshot: MarketSnapshot) -> float:
+        """
+        How far a snapshot is from passing: the sum over failing clauses of
+        the gap between both sides relative to the right side, 0 when every
+        clause passes. Clauses on fields a snapshot does not carry (or that
+        are None) are skipped, so this is a lower bound for such rules.
+        """
+        total = 0.0
+        for clause in self._clauses:
+            if any(name not in SNAPSHOT_FIELDS for name in clause.fields):
+                continue
+
+            left = getattr(snapshot, clause.left)
+            if clause.right_field is None:
+                right = clause.factor
+            else:
+                value = getattr(snapshot, clause.right_field)
+                right = None if value is None else value * clause.factor
+            if left is None or right is None or clause.op(left, right):
+                continue
+
+            scale = abs(float(right)) or 1.0
+            total += abs(float(left) - float(right)) / scale
+        return total
+
+    def __call__(self, snapshot: MarketSnapshot) -> bool:
+        return bool(self.evaluate([snapshot]).passed)
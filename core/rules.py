@@ -1,6 +1,14 @@
 from decimal import Decimal
 from core.models import MarketSnapshot
 
+# Rule-DSL equivalent of entry_conditions, see core.rule_dsl
+DEFAULT_ENTRY_RULES = [
+    "spread_pct < 0.08",
+    "ema_9 >= ema_21 * 1.0003",
+    "price >= vwap * 0.9995",
+    "volume_ratio >= 1.1",
+]
+
 
 def entry_conditions(snapshot: MarketSnapshot) -> bool:
     """
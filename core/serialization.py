@@ -0,0 +1,68 @@
+"""
+Plain-dict (de)serialisers for the domain models, shared by checkpoints,
+wallets and the executor.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from core.models import MarketSnapshot, Trade
+
+
+def trade_to_dict(trade: Trade) -> dict[str, Any]:
+    return {
+        "trade_id": trade.trade_id,
+        "symbol": trade.symbol,
+        "entry_price": str(trade.entry_price),
+        "quantity": str(trade.quantity),
+        "take_profit": str(trade.take_profit),
+        "stop_loss": str(trade.stop_loss),
+        "opened_at": trade.opened_at.isoformat(),
+        "exit_price": str(trade.exit_price) if trade.exit_price is not None else None,
+        "closed_at": trade.closed_at.isoformat() if trade.closed_at else None,
+        "pnl": str(trade.pnl) if trade.pnl is not None else None,
+        "entry_cost": str(trade.entry_cost) if trade.entry_cost is not None else None,
+    }
+
+
+def trade_from_dict(data: dict[str, Any]) -> Trade:
+    return Trade(
+        trade_id=data["trade_id"],
+        symbol=data["symbol"],
+        entry_price=Decimal(data["entry_price"]),
+        quantity=Decimal(data["quantity"]),
+        take_profit=Decimal(data["take_profit"]),
+        stop_loss=Decimal(data["stop_loss"]),
+        opened_at=datetime.fromisoformat(data["opened_at"]),
+        exit_price=Decimal(data["exit_price"]) if data.get("exit_price") else None,
+        closed_at=datetime.fromisoformat(data["closed_at"]) if data.get("closed_at") else None,
+        pnl=Decimal(data["pnl"]) if data.get("pnl") else None,
+        entry_cost=Decimal(data["entry_cost"]) if data.get("entry_cost") else None,
+    )
+
+
+def snapshot_to_dict(snapshot: MarketSnapshot) -> dict[str, Any]:
+    return {
+        "symbol": snapshot.symbol,
+        "price": str(snapshot.price),
+        "ema_9": str(snapshot.ema_9),
+        "ema_21": str(snapshot.ema_21),
+        "vwap": str(snapshot.vwap),
+        "volume_ratio": str(snapshot.volume_ratio),
+        "spread_pct": str(snapshot.spread_pct),
+        "timestamp": snapshot.timestamp.isoformat(),
+    }
+
+
+def snapshot_from_dict(data: dict[str, Any]) -> MarketSnapshot:
+    return MarketSnapshot(
+        symbol=data["symbol"],
+        price=Decimal(data["price"]),
+        ema_9=Decimal(data["ema_9"]),
+        ema_21=Decimal(data["ema_21"]),
+        vwap=Decimal(data["vwap"]),
+        volume_ratio=Decimal(data["volume_ratio"]),
+        spread_pct=Decimal(data["spread_pct"]),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+    )
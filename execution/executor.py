@@ -1,7 +1,9 @@
 from decimal import Decimal
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
+from core.clock import Clock, get_clock
 from core.models import Trade
+from core.serialization import trade_from_dict, trade_to_dict
 from wallet.interface import Wallet
 
 
@@ -11,7 +13,9 @@ class TradeExecutor:
         wallet: Wallet,
         trade_amount_usdt: Decimal,
         max_trade_duration_minutes: int = 20,
+        clock: Clock | None = None,
     ) -> None:
+        self._clock = clock or get_clock()
         self._wallet = wallet
         self._trade_amount = trade_amount_usdt
         self._max_duration = timedelta(minutes=max_trade_duration_minutes)
@@ -21,6 +25,26 @@ class TradeExecutor:
     def has_active_trade(self) -> bool:
         return self._active_trade is not None
 
+    @property
+    def wallet(self) -> Wallet:
+        return self._wallet
+
+    def export_state(self) -> dict:
+        return {
+            "active_trade": (
+                trade_to_dict(self._active_trade) if self._active_trade else None
+            ),
+            "wallet": self._wallet.export_state(),
+        }
+
+    def restore_state(self, state: dict) -> None:
+        # Parse before touching anything, so a bad checkpoint leaves no
+        # half-restored trade behind
+        active_trade = state.get("active_trade")
+        trade = trade_from_dict(active_trade) if active_trade else None
+        self._wallet.restore_state(state.get("wallet") or {})
+        self._active_trade = trade
+
     async def open_trade(
         self,
         symbol: str,
@@ -57,7 +81,7 @@ class TradeExecutor:
             return True
 
         # Time-based exit
-        if datetime.now(timezone.utc) - trade.opened_at >= self._max_duration:
+        if self._clock.utc_now() - trade.opened_at >= self._max_duration:
             return True
 
         return False
@@ -77,6 +101,15 @@ class TradeExecutor:
         self._active_trade = None
         return trade
 
+    async def poll_exchange_exit(self) -> Trade | None:
+        if self._active_trade is None:
+            return None
+
+        trade = await self._wallet.poll_closed(self._active_trade)
+        if trade is not None:
+            self._active_trade = None
+        return trade
+
     def _calculate_quantity(self, price: Decimal) -> Decimal:
         """
         Quantity = fixed USDT amount / price
@@ -0,0 +1,278 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+from market.orderbook import BookSide
+
+
+class FillResult:
+    __slots__ = (
+        "side", "requested", "filled", "avg_price", "fee", "levels", "maker", "latency_ms",
+    )
+
+    def __init__(
+        self,
+        side: str,
+        requested: float,
+        filled: float,
+        avg_price: float,
+        fee: float,
+        levels: int,
+        maker: bool,
+        latency_ms: float,
+    ) -> None:
+        self.side = side
+        self.requested = requested
+        self.filled = filled
+        self.avg_price = avg_price
+        self.fee = fee
+        self.levels = levels
+        self.maker = maker
+        self.latency_ms = latency_ms
+
+    @property
+    def partial(self) -> bool:
+        return self.filled < self.requested
+
+    @property
+    def remaining(self) -> float:
+        return self.requested - self.filled
+
+    def __repr__(self) -> str:
+        return (
+            f"FillResult(side={self.side!r}, requested={self.requested}, "
+            f"filled={self.filled}, avg_price={self.avg_price}, fee={self.fee}, "
+            f"levels={self.levels}, maker={self.maker})"
+        )
+
+
+def walk_levels(
+    sign: float,
+    keys: array,
+    qtys: array,
+    start: int,
+    end: int,
+    quantity: float,
+    limit_key: float | None = None,
+) -> tuple[float, float, int]:
+    """
+    Consume levels [start, end) of a signed-key book side.
+
+    Works directly on the level arrays so a fill allocates nothing per
+    level. Keys use the BookSide convention (bids negated, ascending).
+
+    Returns:
+        (filled quantity, quote cost, number of levels touched)
+    """
+    remaining = quantity
+    cost = 0.0
+    i = start
+
+    while i < end and remaining > 0:
+        key = keys[i]
+        if limit_key is not None and key > limit_key:
+            break
+        level_qty = qtys[i]
+        take = level_qty if level_qty < remaining else remaining
+        cost += take * sign * key
+        remaining -= take
+        i += 1
+
+    return quantity - remaining, cost, i - start
+
+
+def crossing_volume(keys: array, qtys: array, start: int, end: int, limit_key: float) -> float:
+    """
+    Quantity on levels [start, end) at or better than `limit_key`.
+    """
+    total = 0.0
+    i = start
+    while i < end and keys[i] <= limit_key:
+        total += qtys[i]
+        i += 1
+    return total
+
+
+class BookTape:
+    """
+    Time-ordered book snapshots stored in flat arrays for backtests.
+
+    Snapshot `n` owns levels [bid_offsets[n], bid_offsets[n + 1]) of the
+    bid arrays and likewise for asks; no per-snapshot objects are kept.
+    """
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.bid_offsets = array("q", [0])
+        self.ask_offsets = array("q", [0])
+        self.bid_keys = array("d")
+        self.bid_qtys = array("d")
+        self.ask_keys = array("d")
+        self.ask_qtys = array("d")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(
+        self,
+        timestamp_ms: int,
+        bids: Iterable[tuple[float, float]],
+        asks: Iterable[tuple[float, float]],
+    ) -> None:
+        if self.timestamps and timestamp_ms < self.timestamps[-1]:
+            raise ValueError("Book snapshots must be appended in time order")
+
+        for p, q in sorted(((-p, q) for p, q in bids if q > 0)):
+            self.bid_keys.append(p)
+            self.bid_qtys.append(q)
+        for p, q in sorted(((p, q) for p, q in asks if q > 0)):
+            self.ask_keys.append(p)
+            self.ask_qtys.append(q)
+
+        self.timestamps.append(timestamp_ms)
+        self.bid_offsets.append(len(self.bid_keys))
+        self.ask_offsets.append(len(self.ask_keys))
+
+    def index_at(self, timestamp_ms: float) -> int | None:
+        """
+        First snapshot at or after `timestamp_ms`.
+        """
+        i = bisect_left(self.timestamps, timestamp_ms)
+        return i if i < len(self.timestamps) else None
+
+    def side(self, index: int, side: str) -> tuple[float, array, array, int, int]:
+        """
+        Levels an order of `side` consumes in snapshot `index`.
+        """
+        if side == "BUY":
+            offsets = self.ask_offsets
+            return 1.0, self.ask_keys, self.ask_qtys, offsets[index], offsets[index + 1]
+        offsets = self.bid_offsets
+        return -1.0, self.bid_keys, self.bid_qtys, offsets[index], offsets[index + 1]
+
+
+class FillSimulator:
+    """
+    Simulates market and limit fills by walking order book levels.
+
+    Taker fills pay `taker_fee_rate`; resting limit orders that get crossed
+    later pay `maker_fee_rate`. Orders see the book `latency_ms` after they
+    are submitted.
+    """
+
+    def __init__(
+        self,
+        taker_fee_rate: float = 0.001,
+        maker_fee_rate: float = 0.001,
+        latency_ms: float = 0.0,
+    ) -> None:
+        self.taker_fee_rate = taker_fee_rate
+        self.maker_fee_rate = maker_fee_rate
+        self.latency_ms = latency_ms
+
+    def fill_book_side(
+        self,
+        side: str,
+        quantity: float,
+        book_side: BookSide,
+        limit_price: float | None = None,
+    ) -> FillResult:
+        """
+        Taker fill against a live BookSide.
+        """
+        sign, keys, qtys = book_side.arrays()
+        return self._taker(side, quantity, sign, keys, qtys, 0, len(keys), limit_price)
+
+    def fill_from_tape(
+        self,
+        tape: BookTape,
+        timestamp_ms: int,
+        side: str,
+        quantity: float,
+        limit_price: float | None = None,
+    ) -> FillResult:
+        """
+        Taker fill against the first snapshot the order can see after latency.
+        """
+        index = tape.index_at(timestamp_ms + self.latency_ms)
+        if index is None:
+            return FillResult(side, quantity, 0.0, 0.0, 0.0, 0, False, self.latency_ms)
+
+        sign, keys, qtys, start, end = tape.side(index, side)
+        return self._taker(side, quantity, sign, keys, qtys, start, end, limit_price)
+
+    def fill_resting_from_tape(
+        self,
+        tape: BookTape,
+        timestamp_ms: int,
+        side: str,
+        quantity: float,
+        limit_price: float,
+        max_wait_ms: int,
+    ) -> FillResult:
+        """
+        Fill of a limit order that rests until `max_wait_ms` after it
+        reaches the book.
+
+        If the order is marketable when it arrives, the crossing part fills
+        immediately as a taker at the book's prices. The rest fills at
+        `limit_price` as a maker, but only against crossing volume that was
+        not already there in the previous snapshot: a level that stays put
+        across snapshots is the same liquidity, not new flow.
+        """
+        index = tape.index_at(timestamp_ms + self.latency_ms)
+        if index is None:
+            return FillResult(side, quantity, 0.0, 0.0, 0.0, 0, False, self.latency_ms)
+
+        deadline = timestamp_ms + self.latency_ms + max_wait_ms
+        limit_key = (1.0 if side == "BUY" else -1.0) * limit_price
+        timestamps = tape.timestamps
+
+        sign, keys, qtys, start, end = tape.side(index, side)
+        taker_filled, taker_cost, levels = walk_levels(
+            sign, keys, qtys, start, end, quantity, limit_key
+        )
+        # Crossing volume already accounted for; only growth beyond it fills
+        consumed = crossing_volume(keys, qtys, start, end, limit_key)
+        remaining = quantity - taker_filled
+        maker_filled = 0.0
+        index += 1
+
+        while remaining > 0 and index < len(timestamps) and timestamps[index] <= deadline:
+            sign, keys, qtys, start, end = tape.side(index, side)
+            available = crossing_volume(keys, qtys, start, end, limit_key)
+            if available > consumed:
+                take = min(remaining, available - consumed)
+                maker_filled += take
+                remaining -= take
+            consumed = available
+            index += 1
+
+        filled = taker_filled + maker_filled
+        cost = taker_cost + maker_filled * limit_price
+        fee = taker_cost * self.taker_fee_rate + maker_filled * limit_price * self.maker_fee_rate
+        # Maker only if something filled and none of it crossed on arrival
+        return FillResult(
+            side, quantity, filled, cost / filled if filled else 0.0, fee,
+            levels, taker_filled == 0 and maker_filled > 0, self.latency_ms,
+        )
+
+    def _taker(
+        self,
+        side: str,
+        quantity: float,
+        sign: float,
+        keys: array,
+        qtys: array,
+        start: int,
+        end: int,
+        limit_price: float | None,
+    ) -> FillResult:
+        limit_key = sign * limit_price if limit_price is not None else None
+        filled, cost, levels = walk_levels(sign, keys, qtys, start, end, quantity, limit_key)
+
+        avg_price = cost / filled if filled > 0 else 0.0
+        return FillResult(
+            side, quantity, filled, avg_price, cost * self.taker_fee_rate,
+            levels, False, self.latency_ms,
+        )
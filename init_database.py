@@ -7,6 +7,8 @@ Supports both LOCAL (PostgreSQL) and SUPABASE databases.
 
 Usage:
     python init_database.py
+    python init_database.py --verify
+    python init_database.py --maintain   # create partitions, roll up old events
 """
 
 import asyncio
@@ -16,18 +18,26 @@ import structlog
 logger = structlog.get_logger()
 
 # SQL Schema
+#
+# trades and bot_events are range-partitioned by time (monthly and daily)
+# with BRIN indexes on the time columns: inserts always land in a small,
+# recent partition, and old bot_events partitions are rolled up into
+# bot_event_rollups and dropped whole instead of being deleted row by row.
 SCHEMA_SQL = """
--- Create trades table
+-- Create trades table, partitioned by month of opened_at
 CREATE TABLE IF NOT EXISTS trades (
-    trade_id UUID PRIMARY KEY,
+    trade_id UUID NOT NULL,
     symbol TEXT NOT NULL,
     entry_price NUMERIC NOT NULL,
     exit_price NUMERIC,
     quantity NUMERIC NOT NULL,
     pnl NUMERIC,
     opened_at TIMESTAMP NOT NULL,
-    closed_at TIMESTAMP
-);
+    closed_at TIMESTAMP,
+    PRIMARY KEY (trade_id, opened_at)
+) PARTITION BY RANGE (opened_at);
+
+CREATE TABLE IF NOT EXISTS trades_default PARTITION OF trades DEFAULT;
 
 -- Create decisions table (optional, for future use)
 CREATE TABLE IF NOT EXISTS decisions (
@@ -38,20 +48,209 @@ CREATE TABLE IF NOT EXISTS decisions (
     created_at TIMESTAMP NOT NULL
 );
 
--- Create bot_events table
+-- Create bot_events table, partitioned by day of created_at
 CREATE TABLE IF NOT EXISTS bot_events (
-    id UUID PRIMARY KEY,
+    id UUID NOT NULL,
     event_type TEXT NOT NULL,
     message TEXT,
-    created_at TIMESTAMP NOT NULL
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS bot_events_default PARTITION OF bot_events DEFAULT;
+
+-- Per-day event counts kept after old bot_events partitions are dropped
+CREATE TABLE IF NOT EXISTS bot_event_rollups (
+    day DATE NOT NULL,
+    event_type TEXT NOT NULL,
+    events BIGINT NOT NULL,
+    first_at TIMESTAMP NOT NULL,
+    last_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (day, event_type)
 );
 
--- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_trades_opened_at ON trades(opened_at DESC);
+-- Create daily_summaries table (one row per day and strategy, upserted
+-- as trades close)
+CREATE TABLE IF NOT EXISTS daily_summaries (
+    day DATE NOT NULL,
+    strategy TEXT NOT NULL,
+    trades INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    pnl NUMERIC NOT NULL,
+    gross_profit NUMERIC NOT NULL,
+    gross_loss NUMERIC NOT NULL,
+    max_drawdown NUMERIC NOT NULL,
+    per_symbol JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (day, strategy)
+);
+
+-- Create indexes for better query performance; BRIN for append-ordered
+-- time columns stays tiny no matter how many rows pile up
+CREATE INDEX IF NOT EXISTS idx_trades_opened_at_brin ON trades USING BRIN (opened_at);
+CREATE INDEX IF NOT EXISTS idx_trades_closed_at_brin ON trades USING BRIN (closed_at);
 CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
-CREATE INDEX IF NOT EXISTS idx_trades_closed_at ON trades(closed_at DESC);
-CREATE INDEX IF NOT EXISTS idx_events_created_at ON bot_events(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_events_created_at_brin ON bot_events USING BRIN (created_at);
 CREATE INDEX IF NOT EXISTS idx_events_type ON bot_events(event_type);
+
+-- Create partitions of `parent` from the current period to `ahead`
+-- periods out (or from `start_at`); returns how many were created
+CREATE OR REPLACE FUNCTION ensure_time_partitions(
+    parent TEXT,
+    step INTERVAL,
+    ahead INTEGER,
+    start_at TIMESTAMP DEFAULT NULL
+) RETURNS INTEGER AS $$
+DECLARE
+    unit TEXT := CASE WHEN step >= INTERVAL '1 month' THEN 'month' ELSE 'day' END;
+    fmt TEXT := CASE WHEN step >= INTERVAL '1 month' THEN 'YYYYMM' ELSE 'YYYYMMDD' END;
+    lower_bound TIMESTAMP := date_trunc(unit, COALESCE(start_at, now() AT TIME ZONE 'UTC'));
+    upper_bound TIMESTAMP;
+    part TEXT;
+    default_part TEXT := parent || '_default';
+    part_key TEXT := substring(pg_get_partkeydef(parent::regclass) FROM '\\((.+)\\)');
+    moved_rows BIGINT;
+    created INTEGER := 0;
+BEGIN
+    WHILE lower_bound <= date_trunc(unit, now() AT TIME ZONE 'UTC') + step * ahead LOOP
+        upper_bound := lower_bound + step;
+        part := format('%s_p%s', parent, to_char(lower_bound, fmt));
+        IF to_regclass(part) IS NULL THEN
+            -- Rows for this range already in the default partition would
+            -- make the CREATE fail; park them and move them in afterwards
+            EXECUTE format(
+                'CREATE TEMP TABLE partition_backlog AS '
+                || 'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) '
+                || 'SELECT * FROM moved',
+                default_part, part_key, lower_bound, part_key, upper_bound
+            );
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                part, parent, lower_bound, upper_bound
+            );
+            EXECUTE format('INSERT INTO %I SELECT * FROM partition_backlog', part);
+            GET DIAGNOSTICS moved_rows = ROW_COUNT;
+            DROP TABLE partition_backlog;
+            IF moved_rows > 0 THEN
+                RAISE NOTICE 'Moved % rows from % into %', moved_rows, default_part, part;
+            END IF;
+            created := created + 1;
+        END IF;
+        lower_bound := upper_bound;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Roll bot_events older than `retention` up into bot_event_rollups, then
+-- drop their partitions; returns how many partitions were dropped
+CREATE OR REPLACE FUNCTION rollup_old_events(retention INTERVAL) RETURNS INTEGER AS $$
+DECLARE
+    cutoff TIMESTAMP := date_trunc('day', now() AT TIME ZONE 'UTC' - retention);
+    rollup_sql TEXT := $q$
+        INSERT INTO bot_event_rollups (day, event_type, events, first_at, last_at)
+        SELECT created_at::date, event_type, count(*), min(created_at), max(created_at)
+        FROM %I
+        WHERE created_at < %L
+        GROUP BY 1, 2
+        ON CONFLICT (day, event_type) DO UPDATE SET
+            events = bot_event_rollups.events + EXCLUDED.events,
+            first_at = LEAST(bot_event_rollups.first_at, EXCLUDED.first_at),
+            last_at = GREATEST(bot_event_rollups.last_at, EXCLUDED.last_at)
+    $q$;
+    part RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname,
+               substring(pg_get_expr(c.relpartbound, c.oid) FROM 'TO \\(''([^'']+)''\\)')::timestamp
+                   AS upper_bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'bot_events'::regclass
+          AND c.relname <> 'bot_events_default'
+    LOOP
+        CONTINUE WHEN part.upper_bound > cutoff;
+        EXECUTE format(rollup_sql, part.relname, cutoff);
+        EXECUTE format('ALTER TABLE bot_events DETACH PARTITION %I', part.relname);
+        EXECUTE format('DROP TABLE %I', part.relname);
+        dropped := dropped + 1;
+    END LOOP;
+
+    -- Stragglers that landed in the default partition
+    EXECUTE format(rollup_sql, 'bot_events_default', cutoff);
+    DELETE FROM bot_events_default WHERE created_at < cutoff;
+
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_time_partitions('trades', INTERVAL '1 month', 2);
+SELECT ensure_time_partitions('bot_events', INTERVAL '1 day', 7);
+"""
+
+# Moves plain (pre-partitioning) trades/bot_events tables aside so
+# SCHEMA_SQL can create the partitioned ones; MIGRATE_FINISH_SQL copies
+# the rows back in
+MIGRATE_PREPARE_SQL = """
+DO $$
+DECLARE
+    tbl TEXT;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY['trades', 'bot_events'] LOOP
+        IF EXISTS (SELECT 1 FROM pg_class WHERE relname = tbl AND relkind = 'r') THEN
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, tbl || '_legacy');
+            EXECUTE format(
+                'ALTER TABLE %I RENAME CONSTRAINT %I TO %I',
+                tbl || '_legacy', tbl || '_pkey', tbl || '_legacy_pkey'
+            );
+            -- Old B-tree indexes go with the legacy table
+            IF tbl = 'trades' THEN
+                DROP INDEX IF EXISTS idx_trades_opened_at;
+                DROP INDEX IF EXISTS idx_trades_closed_at;
+                DROP INDEX IF EXISTS idx_trades_symbol;
+            ELSE
+                DROP INDEX IF EXISTS idx_events_created_at;
+                DROP INDEX IF EXISTS idx_events_type;
+            END IF;
+        END IF;
+    END LOOP;
+END;
+$$;
+"""
+
+MIGRATE_FINISH_SQL = """
+DO $$
+BEGIN
+    IF to_regclass('trades_legacy') IS NOT NULL THEN
+        INSERT INTO trades SELECT * FROM trades_legacy;
+        DROP TABLE trades_legacy;
+    END IF;
+    IF to_regclass('bot_events_legacy') IS NOT NULL THEN
+        INSERT INTO bot_events SELECT * FROM bot_events_legacy;
+        DROP TABLE bot_events_legacy;
+    END IF;
+END;
+$$;
+"""
+
+# What the Supabase SQL Editor gets: the same migration init_local_database
+# runs, in one transaction so a failure leaves existing tables untouched
+SUPABASE_SCHEMA_SQL = (
+    "BEGIN;\n" + MIGRATE_PREPARE_SQL + SCHEMA_SQL + MIGRATE_FINISH_SQL + "\nCOMMIT;\n"
+)
+
+# Hourly partition maintenance on Supabase (needs the pg_cron extension)
+SUPABASE_CRON_SQL = """
+SELECT cron.schedule(
+    'binance-bot-partitions',
+    '5 * * * *',
+    $$
+    SELECT ensure_time_partitions('trades', INTERVAL '1 month', 2);
+    SELECT ensure_time_partitions('bot_events', INTERVAL '1 day', 7);
+    SELECT rollup_old_events(INTERVAL '30 days');
+    $$
+);
 """
 
 # Supabase-specific RLS policies
@@ -60,15 +259,23 @@ SUPABASE_RLS_SQL = """
 ALTER TABLE trades ENABLE ROW LEVEL SECURITY;
 ALTER TABLE decisions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE bot_events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE daily_summaries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE bot_event_rollups ENABLE ROW LEVEL SECURITY;
 
 -- Drop existing policies if they exist
 DROP POLICY IF EXISTS "Allow service role full access to trades" ON trades;
 DROP POLICY IF EXISTS "Allow service role full access to decisions" ON decisions;
 DROP POLICY IF EXISTS "Allow service role full access to bot_events" ON bot_events;
+DROP POLICY IF EXISTS "Allow service role full access to daily_summaries" ON daily_summaries;
+DROP POLICY IF EXISTS "Allow service role full access to bot_event_rollups" ON bot_event_rollups;
 DROP POLICY IF EXISTS "Allow anon insert to trades" ON trades;
 DROP POLICY IF EXISTS "Allow anon select on trades" ON trades;
 DROP POLICY IF EXISTS "Allow anon insert to bot_events" ON bot_events;
 DROP POLICY IF EXISTS "Allow anon select on bot_events" ON bot_events;
+DROP POLICY IF EXISTS "Allow anon access to daily_summaries" ON daily_summaries;
+DROP POLICY IF EXISTS "Allow anon select on daily_summaries" ON daily_summaries;
+DROP POLICY IF EXISTS "Allow anon insert to daily_summaries" ON daily_summaries;
+DROP POLICY IF EXISTS "Allow anon update on daily_summaries" ON daily_summaries;
 
 -- Create policies for service role (full access)
 CREATE POLICY "Allow service role full access to trades"
@@ -89,6 +296,18 @@ TO service_role
 USING (true)
 WITH CHECK (true);
 
+CREATE POLICY "Allow service role full access to daily_summaries"
+ON daily_summaries FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+CREATE POLICY "Allow service role full access to bot_event_rollups"
+ON bot_event_rollups FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
 -- Create policies for anon key (limited access)
 CREATE POLICY "Allow anon insert to trades"
 ON trades FOR INSERT
@@ -109,6 +328,23 @@ CREATE POLICY "Allow anon select on bot_events"
 ON bot_events FOR SELECT
 TO anon
 USING (true);
+
+CREATE POLICY "Allow anon select on daily_summaries"
+ON daily_summaries FOR SELECT
+TO anon
+USING (true);
+
+CREATE POLICY "Allow anon insert to daily_summaries"
+ON daily_summaries FOR INSERT
+TO anon
+WITH CHECK (true);
+
+-- The summary row is upserted, which needs UPDATE; anon still cannot delete
+CREATE POLICY "Allow anon update on daily_summaries"
+ON daily_summaries FOR UPDATE
+TO anon
+USING (true)
+WITH CHECK (true);
 """
 
 
@@ -126,9 +362,13 @@ async def init_local_database():
         conn = await asyncpg.connect(settings.database_url)
 
         try:
-            # Execute schema
+            # Execute schema; pre-partitioning tables are migrated in one
+            # transaction so a failure leaves them untouched
             print("Creating tables...")
-            await conn.execute(SCHEMA_SQL)
+            async with conn.transaction():
+                await conn.execute(MIGRATE_PREPARE_SQL)
+                await conn.execute(SCHEMA_SQL)
+                await conn.execute(MIGRATE_FINISH_SQL)
             print("✅ Tables created successfully!")
 
             # Verify tables
@@ -137,7 +377,9 @@ async def init_local_database():
                 SELECT table_name
                 FROM information_schema.tables
                 WHERE table_schema = 'public'
-                AND table_name IN ('trades', 'bot_events', 'decisions')
+                AND table_name IN (
+                    'trades', 'bot_events', 'decisions', 'daily_summaries', 'bot_event_rollups'
+                )
                 ORDER BY table_name
             """)
 
@@ -207,9 +449,10 @@ async def init_supabase_database():
 
         print("\n3. Click 'New Query'")
 
-        print("\n4. Copy and paste the following SQL:\n")
+        print("\n4. Copy and paste the following SQL. It runs as one transaction and")
+        print("   migrates existing unpartitioned trades/bot_events tables in place:\n")
         print("-"*60)
-        print(SCHEMA_SQL)
+        print(SUPABASE_SCHEMA_SQL)
         print("-"*60)
 
         print("\n5. Click 'Run' to execute the SQL")
@@ -219,7 +462,12 @@ async def init_supabase_database():
         print(SUPABASE_RLS_SQL)
         print("-"*60)
 
-        print("\n7. Verify tables in 'Table Editor'")
+        print("\n7. (Optional) Schedule partition maintenance with pg_cron:\n")
+        print("-"*60)
+        print(SUPABASE_CRON_SQL)
+        print("-"*60)
+
+        print("\n8. Verify tables in 'Table Editor'")
 
         print("\n" + "="*60)
         print("\n💡 TIP: You can also copy the SQL from:")
@@ -230,7 +478,7 @@ async def init_supabase_database():
         # Offer to copy SQL to clipboard (if available)
         try:
             import pyperclip
-            pyperclip.copy(SCHEMA_SQL + "\n\n" + SUPABASE_RLS_SQL)
+            pyperclip.copy(SUPABASE_SCHEMA_SQL + "\n\n" + SUPABASE_RLS_SQL)
             print("✅ SQL copied to clipboard! Paste it in Supabase SQL Editor.\n")
         except ImportError:
             pass
@@ -259,10 +507,12 @@ async def verify_database():
             client = create_client(settings.supabase_url, settings.supabase_key)
 
             # Test querying each table
-            tables = ["trades", "bot_events", "decisions"]
+            tables = ["trades", "bot_events", "decisions", "daily_summaries", "bot_event_rollups"]
             for table_name in tables:
                 try:
-                    result = client.table(table_name).select("count", count="exact").limit(0).execute()
+                    result = (
+                        client.table(table_name).select("count", count="exact").limit(0).execute()
+                    )
                     print(f"✅ {table_name}: accessible")
                 except Exception as e:
                     print(f"❌ {table_name}: {str(e)[:50]}")
@@ -286,7 +536,9 @@ async def verify_database():
                     SELECT table_name
                     FROM information_schema.tables
                     WHERE table_schema = 'public'
-                    AND table_name IN ('trades', 'bot_events', 'decisions')
+                    AND table_name IN (
+                        'trades', 'bot_events', 'decisions', 'daily_summaries', 'bot_event_rollups'
+                    )
                 """)
 
                 print("Available tables:")
@@ -342,5 +594,12 @@ if __name__ == "__main__":
 
     if "--verify" in sys.argv:
         asyncio.run(verify_database())
+    elif "--maintain" in sys.argv:
+        from persistence.maintenance import PartitionMaintainer
+
+        maintainer = PartitionMaintainer(
+            settings.database_url, settings.event_retention_days
+        )
+        print(asyncio.run(maintainer.run_once()))
     else:
         asyncio.run(main())
@@ -1,29 +1,139 @@
 import asyncio
+import sys
 from decimal import Decimal
-from config.settings import settings
+from functools import partial
+from pathlib import Path
+from config.settings import Settings, StrategyConfig, get_settings
 from utils.logger import setup_logging
-from wallet.paper_wallet import PaperWallet
-from execution.executor import TradeExecutor
-from core.risk import RiskManager
-from core.engine import TradingEngine
-from persistence.db import Database
-from persistence.repository import TradeRepository, EventRepository
-from persistence.supabase_db import SupabaseDatabase
-from persistence.supabase_repository import SupabaseTradeRepository, SupabaseEventRepository
-from notifications.telegram import TelegramNotifier
 import structlog
 
 logger = structlog.get_logger()
 
+# Modules every run needs, in startup order
+CORE_MODULES = [
+    "execution.executor",
+    "core.risk",
+    "core.engine",
+    "persistence.checkpoint",
+]
 
-async def main() -> None:
-    wallet = PaperWallet(
+
+def backend_modules(settings: Settings) -> list[str]:
+    """
+    Modules pulled in by the configured integrations only.
+    """
+    if settings.database_type == "SUPABASE":
+        modules = ["persistence.supabase_db", "persistence.supabase_repository"]
+    else:
+        modules = ["persistence.db", "persistence.repository"]
+
+    if settings.trading_mode == "LIVE":
+        modules.append("wallet.binance_wallet")
+    else:
+        modules.append("wallet.paper_wallet")
+
+    if settings.telegram_bot_token:
+        modules.append("notifications.telegram")
+
+    return modules
+
+
+async def create_repositories(settings: Settings) -> tuple:
+    # Backends are imported here so the unused one (and its driver) never loads
+    if settings.database_type == "SUPABASE":
+        from persistence.supabase_db import SupabaseDatabase
+        from persistence.supabase_repository import (
+            SupabaseEventRepository,
+            SupabaseTradeRepository,
+        )
+
+        logger.info("database.using_supabase")
+        db = SupabaseDatabase(
+            url=settings.supabase_url,
+            key=settings.supabase_key,
+        )
+        await db.connect()
+        return SupabaseTradeRepository(db), SupabaseEventRepository(db)
+
+    from persistence.db import Database
+    from persistence.repository import EventRepository, TradeRepository
+
+    logger.info("database.using_local")
+    db = Database(settings.database_url)
+    await db.connect()
+    return TradeRepository(db), EventRepository(db)
+
+
+def create_notifier(settings: Settings):
+    if not settings.telegram_bot_token:
+        return None
+
+    from notifications.telegram import TelegramNotifier
+
+    return TelegramNotifier(
+        settings.telegram_bot_token,
+        settings.telegram_chat_id,
+    )
+
+
+async def create_wallet(settings: Settings, order_books=None):
+    if settings.trading_mode == "LIVE":
+        from wallet.binance_wallet import BinanceWallet
+
+        logger.info("wallet.using_live", base_url=settings.binance_api_url)
+        wallet = BinanceWallet(
+            api_key=settings.binance_api_key,
+            api_secret=settings.binance_api_secret,
+            base_url=settings.binance_api_url,
+            recv_window_ms=settings.binance_recv_window_ms,
+        )
+        await wallet.connect()
+        return wallet
+
+    from execution.fill_simulator import FillSimulator
+    from wallet.paper_wallet import PaperWallet
+
+    return PaperWallet(
         starting_balance=Decimal("100"),
+        order_books=order_books,
+        fill_simulator=FillSimulator(latency_ms=settings.paper_latency_ms),
     )
 
+
+async def build_engine(
+    settings: Settings,
+    strategy: StrategyConfig,
+    market_data,
+    order_books,
+    trade_repo,
+    event_repo,
+    notifier,
+    history=None,
+    indicators=None,
+    freshness=None,
+    background=None,
+    scan_market_data=None,
+):
+    from core.engine import TradingEngine
+    from core.ranking import Ranker
+    from core.rule_dsl import RuleSet
+    from core.rules import DEFAULT_ENTRY_RULES
+    from core.risk import RiskManager
+    from execution.executor import TradeExecutor
+    from market.indicator_registry import indicator_costs, indicator_fields
+    from market.timeframes import timeframe_columns, timeframe_fields
+    from persistence.checkpoint import StateCheckpoint
+
+    def pick(name: str):
+        value = getattr(strategy, name)
+        return getattr(settings, name) if value is None else value
+
+    # Each variant owns its wallet, executor, risk limits and checkpoint
+    wallet = await create_wallet(settings, order_books)
+
     executor = TradeExecutor(
         wallet=wallet,
-        trade_amount_usdt=Decimal(str(settings.trade_amount_usdt)),
+        trade_amount_usdt=Decimal(str(pick("trade_amount_usdt"))),
     )
 
     risk = RiskManager(
@@ -34,44 +144,278 @@ async def main() -> None:
         trading_end_hour=settings.trading_end_hour,
     )
 
-    # Initialize database based on configuration
-    if settings.database_type == "SUPABASE":
-        logger.info("database.using_supabase")
-        db = SupabaseDatabase(
-            url=settings.supabase_url,
-            key=settings.supabase_key,
-        )
-        await db.connect()
-        trade_repo = SupabaseTradeRepository(db)
-        event_repo = SupabaseEventRepository(db)
-    else:
-        logger.info("database.using_local")
-        db = Database(settings.database_url)
-        await db.connect()
-        trade_repo = TradeRepository(db)
-        event_repo = EventRepository(db)
+    checkpoint_path = settings.checkpoint_path
+    if strategy.name != "default":
+        checkpoint_path = str(Path(checkpoint_path).with_suffix(f".{strategy.name}.json"))
 
-    notifier = None
-    if settings.telegram_bot_token:
-        notifier = TelegramNotifier(
-            settings.telegram_bot_token,
-            settings.telegram_chat_id,
+    entry_rules = RuleSet.compile(
+        pick("entry_rules") or DEFAULT_ENTRY_RULES,
+        extra_fields=timeframe_fields(settings.timeframes) + indicator_fields(),
+        costs=indicator_costs(),
+    )
+
+    scheduler = None
+    if settings.adaptive_polling and len(settings.strategies) <= 1:
+        from market.poll_scheduler import PollScheduler
+
+        scheduler = PollScheduler(
+            settings.symbols,
+            entry_rules,
+            min_interval=settings.poll_min_interval_seconds,
+            max_interval=settings.poll_max_interval_seconds,
+            weight_per_minute=settings.api_weight_per_minute,
+            history=history,
         )
+        if background is not None:
+            background.append(scheduler.run())
 
-    engine = TradingEngine(
+    return TradingEngine(
         symbols=settings.symbols,
         executor=executor,
         risk_manager=risk,
-        take_profit_pct=Decimal(str(settings.take_profit_pct)),
-        stop_loss_pct=Decimal(str(settings.stop_loss_pct)),
+        take_profit_pct=Decimal(str(pick("take_profit_pct"))),
+        stop_loss_pct=Decimal(str(pick("stop_loss_pct"))),
         trade_repo=trade_repo,
         event_repo=event_repo,
         notifier=notifier,
+        checkpoint=StateCheckpoint(checkpoint_path),
+        entry_rules=entry_rules,
+        ranker=Ranker(pick("ranking_weights"), pick("ranking_method")),
+        market_data=market_data,
+        name=strategy.name,
+        rule_columns=(
+            partial(timeframe_columns, history)
+            if history is not None and settings.timeframes
+            else None
+        ),
+        rule_resolver=indicators.resolve if indicators is not None else None,
+        freshness=freshness,
+        scheduler=scheduler,
+        scan_during_trade=settings.scan_during_trade,
+        scan_market_data=scan_market_data,
+    )
+
+
+def used_rule_fields(
+    settings: Settings, strategies: list[StrategyConfig], candidates: list[str]
+) -> list[str]:
+    """
+    Which of the extra rule fields `candidates` any strategy's entry rules use.
+    """
+    from core.rule_dsl import RuleSet
+    from core.rules import DEFAULT_ENTRY_RULES
+    from market.indicator_registry import indicator_fields
+    from market.timeframes import timeframe_fields
+
+    used: dict[str, None] = {}
+    for strategy in strategies:
+        rules = RuleSet.compile(
+            strategy.entry_rules or settings.entry_rules or DEFAULT_ENTRY_RULES,
+            extra_fields=timeframe_fields(settings.timeframes) + indicator_fields(),
+        )
+        used.update((name, None) for name in rules.fields if name in candidates)
+    return list(used)
+
+
+def shared_indicators(settings: Settings, strategies: list[StrategyConfig]) -> list[str]:
+    """
+    Indicator fields any strategy's entry rules use; the scanner process
+    computes and publishes these for the trader.
+    """
+    from market.indicator_registry import indicator_fields
+
+    return used_rule_fields(settings, strategies, indicator_fields())
+
+
+async def main() -> None:
+    from market.analyzer import DirectMarketData
+    from market.clock_sync import ClockSync
+    from market.klines import KlineStore
+    from market.snapshot_cache import SnapshotCache
+
+    settings = get_settings()
+
+    strategies = settings.strategies or [StrategyConfig(name="default")]
+    if len(strategies) > 1 and settings.trading_mode == "LIVE":
+        raise RuntimeError("Multiple strategies share one account; use PAPER mode")
+
+    from market.endpoints import EndpointPool, set_default_pool
+    from market.fetcher import is_host_failure, rate_limit_delay
+
+    set_default_pool(EndpointPool(
+        settings.binance_hosts,
+        hedge=settings.hedge_requests,
+        is_host_failure=is_host_failure,
+        rate_limit_delay=rate_limit_delay,
+    ))
+
+    role = settings.market_state_role
+    if role == "TRADER":
+        from market.timeframes import timeframe_fields
+
+        # Only snapshots and indicators are published; the trader keeps no
+        # kline history, so these fields would never be defined
+        unshared = used_rule_fields(settings, strategies, timeframe_fields(settings.timeframes))
+        if unshared:
+            raise RuntimeError(
+                f"Timeframe rule fields are not available in the TRADER role: {unshared}"
+            )
+
+    # Long-running services started alongside the engines
+    background = []
+
+    # The scanner owns market data; a trader only reads shared memory
+    if role != "TRADER":
+        clock_sync = ClockSync(interval_seconds=settings.clock_sync_interval_seconds)
+        background.append(clock_sync.run())
+
+    order_books = None
+    if settings.use_order_book and role != "TRADER":
+        from market.orderbook import OrderBookManager
+
+        order_books = OrderBookManager(settings.symbols)
+        background.append(order_books.run())
+
+    # Exit checks and scans (or several engines) asking for the same symbol
+    # at once share a single fetch
+    cache = SnapshotCache(ttl_seconds=settings.snapshot_ttl_seconds)
+    # Rolling 1m history per symbol, kept as typed arrays
+    history = KlineStore(
+        capacity=settings.kline_history_size, timeframes=settings.timeframes
     )
+    if settings.timeframes and role != "TRADER":
+        from market.analyzer import backfill_history
+        from market.klines import INTERVAL_MS
+        from market.timeframes import MIN_BARS
+
+        longest = max(INTERVAL_MS[tf] for tf in settings.timeframes) // 60_000
+        needed = MIN_BARS * longest
+        if needed > settings.kline_history_size:
+            logger.warning(
+                "history.backfill_short",
+                needed=needed,
+                kline_history_size=settings.kline_history_size,
+            )
+        await backfill_history(
+            settings.symbols,
+            history,
+            limit=min(settings.kline_history_size, needed),
+        )
+
+    from market.freshness import FreshnessMonitor
+
+    freshness = FreshnessMonitor(max_age_seconds=settings.max_data_age_seconds)
+    background.append(freshness.run(settings.freshness_report_seconds))
+
+    # RSI, ATR, Bollinger etc. computed on demand when a rule needs them
+    from market.indicator_registry import IndicatorSet
 
-    await engine.run()
+    indicators = IndicatorSet(history)
+
+    shared_state = None
+    if role == "TRADER":
+        from market.shared_state import SharedMarketState
+
+        # Published by the SCANNER process, which also computes indicators
+        shared_state = SharedMarketState.attach(settings.market_state_name)
+        indicators = shared_state
+
+    hub = None
+    if len(strategies) > 1 and shared_state is None:
+        from market.hub import MarketDataHub
+
+        # Fetch and build snapshots once for every variant
+        hub = MarketDataHub(
+            settings.symbols,
+            order_books=order_books,
+            cache=cache,
+            history=history,
+            freshness=freshness,
+        )
+        background.append(hub.run())
+
+    from utils.profiling import RuntimeProfiler
+
+    profiler = RuntimeProfiler(settings.profile_dir, settings.profile_seconds)
+    profiler.install_signal_handlers()
+    if settings.admin_port is not None:
+        background.append(profiler.serve("127.0.0.1", settings.admin_port))
+
+    if role == "SCANNER":
+        from market.shared_state import MarketStatePublisher, SharedMarketState
+
+        state = SharedMarketState.create(
+            settings.market_state_name,
+            settings.symbols,
+            shared_indicators(settings, strategies),
+        )
+        publisher = MarketStatePublisher(
+            state,
+            DirectMarketData(order_books, cache, history, freshness),
+            order_books,
+            freshness,
+            indicators,
+        )
+        background.append(
+            publisher.run(settings.symbols, settings.market_state_interval_seconds)
+        )
+        try:
+            await asyncio.gather(*background)
+        finally:
+            state.close()
+        return
+
+    if settings.database_type == "LOCAL":
+        from persistence.maintenance import PartitionMaintainer
+
+        background.append(
+            PartitionMaintainer(settings.database_url, settings.event_retention_days).run()
+        )
+
+    # Initialize database based on configuration
+    trade_repo, event_repo = await create_repositories(settings)
+
+    notifier = create_notifier(settings)
+
+    def market_data():
+        if shared_state is not None:
+            from market.shared_state import SharedMarketData
+
+            return SharedMarketData(shared_state, freshness)
+        if hub is not None:
+            return hub.subscribe()
+        return DirectMarketData(order_books, cache, history, freshness)
+
+    engines = [
+        await build_engine(
+            settings,
+            strategy,
+            market_data(),
+            order_books,
+            trade_repo,
+            event_repo,
+            notifier,
+            history,
+            indicators,
+            freshness,
+            background,
+            # Scans get their own hub subscription, apart from exit checks
+            scan_market_data=market_data(),
+        )
+        for strategy in strategies
+    ]
+
+    await asyncio.gather(*(engine.run() for engine in engines), *background)
 
 
 if __name__ == "__main__":
-    setup_logging()
+    if "--import-time" in sys.argv:
+        from utils.importtime import measure_imports, print_import_report
+
+        print_import_report(
+            measure_imports(CORE_MODULES + backend_modules(get_settings()))
+        )
+        sys.exit(0)
+
+    setup_logging(async_mode=get_settings().log_async)
     asyncio.run(main())
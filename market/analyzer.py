@@ -1,30 +1,145 @@
 import asyncio
 from typing import Iterable
 
+from core import clock
 from market.fetcher import BinanceFetcher
+from market.freshness import FreshnessMonitor
+from market.klines import KlineArray, KlineStore
+from market.orderbook import OrderBookManager
 from market.snapshot import build_snapshot
+from market.snapshot_cache import SnapshotCache
 from core.models import MarketSnapshot
 
+# Most klines /api/v3/klines returns per request
+KLINES_PAGE_SIZE = 1000
 
-async def analyze_symbol(
+
+async def _load_inputs(
     fetcher: BinanceFetcher,
     symbol: str,
-) -> MarketSnapshot | None:
-    try:
+    order_books: OrderBookManager | None,
+    history: KlineStore | None = None,
+    freshness: FreshnessMonitor | None = None,
+) -> tuple[KlineArray, dict, int]:
+    """
+    Klines, top of book and the exchange time they describe: the depth
+    event time for a streamed book; REST responses carry none, so their
+    exchange-corrected receive time stands in.
+    """
+    book = order_books.book(symbol) if order_books else None
+    if book is not None:
+        # Top of book comes from the local depth stream, no REST call
+        klines, ticker = await fetcher.fetch_klines(symbol), book.as_ticker()
+    else:
         klines, ticker = await asyncio.gather(
             fetcher.fetch_klines(symbol),
             fetcher.fetch_ticker(symbol),
         )
-        return build_snapshot(symbol, klines, ticker)
-    except Exception:
+
+    received = clock.now_ms()
+    streamed = book is not None and book.event_time_ms is not None
+    if freshness is not None:
+        if streamed:
+            freshness.record(symbol, book.event_time_ms, received)
+        else:
+            # REST data carries no event time; the forming candle's open
+            # time is at most one interval behind a live market
+            freshness.record(symbol, int(klines[-1][0]), received, horizon_ms=60_000)
+    event_time_ms = book.event_time_ms if streamed else received
+
+    # REST rows are parsed once, into the typed history when there is one
+    if history is not None:
+        return history.update(symbol, klines), ticker, event_time_ms
+    return KlineArray.from_rest(klines), ticker, event_time_ms
+
+
+async def analyze_symbol(
+    fetcher: BinanceFetcher,
+    symbol: str,
+    order_books: OrderBookManager | None = None,
+    cache: SnapshotCache | None = None,
+    history: KlineStore | None = None,
+    freshness: FreshnessMonitor | None = None,
+) -> MarketSnapshot | None:
+    try:
+        if cache is not None:
+            return await cache.get(
+                symbol,
+                lambda: _load_inputs(fetcher, symbol, order_books, history, freshness),
+            )
+
+        klines, ticker, event_time_ms = await _load_inputs(
+            fetcher, symbol, order_books, history, freshness
+        )
+        return build_snapshot(symbol, klines, ticker, event_time_ms)
+    except Exception as exc:
+        if freshness is not None:
+            freshness.record_failure(symbol, exc)
         return None
 
 
 async def analyze_symbols(
     symbols: Iterable[str],
+    order_books: OrderBookManager | None = None,
+    cache: SnapshotCache | None = None,
+    history: KlineStore | None = None,
+    freshness: FreshnessMonitor | None = None,
 ) -> list[MarketSnapshot]:
     async with BinanceFetcher() as fetcher:
-        tasks = [analyze_symbol(fetcher, s) for s in symbols]
+        tasks = [
+            analyze_symbol(fetcher, s, order_books, cache, history, freshness)
+            for s in symbols
+        ]
         results = await asyncio.gather(*tasks)
 
     return [r for r in results if r is not None]
+
+
+async def backfill_history(symbols: Iterable[str], history: KlineStore, limit: int) -> None:
+    """
+    Seed `history` with the last `limit` 1m candles per symbol, so resampled
+    timeframes are usable right after startup. Limits above the exchange's
+    page size are fetched a page at a time, walking back from now.
+    """
+    async with BinanceFetcher() as fetcher:
+        async def load(symbol: str) -> None:
+            pages: list[list[list]] = []
+            remaining = limit
+            end_time = None
+            while remaining > 0:
+                page = await fetcher.fetch_klines(
+                    symbol, limit=min(remaining, KLINES_PAGE_SIZE), end_time=end_time
+                )
+                if not page:
+                    break
+                pages.append(page)
+                remaining -= len(page)
+                end_time = int(page[0][0]) - 1
+            # KlineArray.merge only appends, so oldest page first
+            history.update(symbol, [row for page in reversed(pages) for row in page])
+
+        await asyncio.gather(*(load(s) for s in symbols), return_exceptions=True)
+
+
+class DirectMarketData:
+    """
+    Market data source that fetches on every request; the default for a
+    single engine. See market.hub for the shared, fetch-once variant.
+    """
+
+    def __init__(
+        self,
+        order_books: OrderBookManager | None = None,
+        cache: SnapshotCache | None = None,
+        history: KlineStore | None = None,
+        freshness: FreshnessMonitor | None = None,
+    ) -> None:
+        self._order_books = order_books
+        self._cache = cache
+        self._history = history
+        self._freshness = freshness
+
+    async def get_snapshots(self, symbols: Iterable[str]) -> list[MarketSnapshot]:
+        return await analyze_symbols(
+            symbols, self._order_books, self._cache, self._history, self._freshness
+        )
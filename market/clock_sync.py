@@ -0,0 +1,103 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import structlog
+
+from core import clock
+from market.endpoints import default_pool
+from market.fetcher import BinanceFetcher
+from market.latency import LatencyTracker, latency_tracker
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class ClockSample:
+    offset_ms: float
+    rtt_ms: float
+    taken_at: float
+
+
+class ClockSync:
+    """
+    Estimates the offset between local time and Binance server time.
+
+    Each sample brackets `/api/v3/time` with local timestamps and assumes
+    the server stamped the midpoint. Only the fastest round trips are
+    trusted: samples whose RTT is well above the window's minimum carry
+    mostly queueing delay, so they are dropped before the median offset is
+    taken.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 60.0,
+        burst: int = 5,
+        window: int = 50,
+        rtt_slack_ms: float = 5.0,
+        latency: LatencyTracker | None = None,
+    ) -> None:
+        self._interval = interval_seconds
+        self._burst = burst
+        self._samples: deque[ClockSample] = deque(maxlen=window)
+        self._rtt_slack = rtt_slack_ms
+        self._latency = latency or latency_tracker
+        self._offset_ms = 0.0
+
+    @property
+    def offset_ms(self) -> float:
+        return self._offset_ms
+
+    @property
+    def rtt_ms(self) -> float | None:
+        if not self._samples:
+            return None
+        return min(s.rtt_ms for s in self._samples)
+
+    def add_sample(self, local_send_ms: float, server_ms: int, local_recv_ms: float) -> ClockSample:
+        rtt = local_recv_ms - local_send_ms
+        sample = ClockSample(
+            offset_ms=server_ms - (local_send_ms + local_recv_ms) / 2,
+            rtt_ms=rtt,
+            taken_at=local_recv_ms,
+        )
+        self._samples.append(sample)
+        self._offset_ms = self._estimate()
+        clock.set_exchange_offset(self._offset_ms)
+        return sample
+
+    def _estimate(self) -> float:
+        min_rtt = min(s.rtt_ms for s in self._samples)
+        cutoff = min_rtt * 1.5 + self._rtt_slack
+        trusted = [s.offset_ms for s in self._samples if s.rtt_ms <= cutoff]
+        return statistics.median(trusted)
+
+    async def sample(self, fetcher: BinanceFetcher) -> None:
+        for _ in range(self._burst):
+            send = time.time() * 1000
+            server = await fetcher.fetch_server_time()
+            recv = time.time() * 1000
+            self.add_sample(send, server, recv)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with BinanceFetcher(latency=self._latency) as fetcher:
+                    await self.sample(fetcher)
+
+                logger.info(
+                    "clock.synced",
+                    offset_ms=round(self._offset_ms, 2),
+                    rtt_ms=round(self.rtt_ms or 0.0, 2),
+                    latency=self._latency.stats(),
+                    hosts=default_pool().metrics(),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("clock.sync_failed", error=str(exc))
+
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,270 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from market.latency import percentile
+
+T = TypeVar("T")
+
+BINANCE_HOSTS = [
+    "https://api.binance.com",
+    "https://api1.binance.com",
+    "https://api2.binance.com",
+    "https://api3.binance.com",
+    "https://api4.binance.com",
+]
+
+
+class RateLimitedError(Exception):
+    """
+    Raised without sending while the pool is backing off after a rate limit.
+    """
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"Rate limited, backing off for another {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; after
+    `reset_timeout` seconds a single probe request is let through and
+    closes the circuit again if it succeeds.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self._reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+
+        # HALF_OPEN: exactly one probe at a time
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        # A probe was abandoned without an outcome
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= self._threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class HostStats:
+    def __init__(self, url: str, breaker: CircuitBreaker, window: int = 200) -> None:
+        self.url = url
+        self.breaker = breaker
+        self.samples: deque[float] = deque(maxlen=window)
+        self.ewma_ms: float | None = None
+        self.requests = 0
+        self.errors = 0
+        self.hedges_won = 0
+
+    def record(self, rtt_ms: float) -> None:
+        self.requests += 1
+        self.samples.append(rtt_ms)
+        self.ewma_ms = rtt_ms if self.ewma_ms is None else 0.8 * self.ewma_ms + 0.2 * rtt_ms
+
+    def record_error(self) -> None:
+        self.requests += 1
+        self.errors += 1
+
+
+class EndpointPool:
+    """
+    Routes requests over several API hosts.
+
+    The fastest healthy host (by EWMA latency) gets the request; if it has
+    not answered within its own p95, a hedged duplicate goes to the next
+    healthy host and the first success wins. Hosts that keep failing are
+    ejected by their circuit breaker until a probe succeeds.
+
+    Request weight limits are per IP, not per host, so a rate limit is
+    neither failed over nor held against the host: the whole pool stops
+    sending until the exchange's Retry-After has passed.
+    """
+
+    def __init__(
+        self,
+        hosts: list[str] | None = None,
+        hedge: bool = False,
+        min_hedge_delay_ms: float = 20.0,
+        max_hedge_delay_ms: float = 1000.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_host_failure: Callable[[BaseException], bool] = lambda exc: True,
+        rate_limit_delay: Callable[[BaseException], float | None] = lambda exc: None,
+    ) -> None:
+        self._hosts = [
+            HostStats(url.rstrip("/"), CircuitBreaker(failure_threshold, reset_timeout))
+            for url in (hosts or BINANCE_HOSTS)
+        ]
+        self._hedge = hedge
+        self._min_delay = min_hedge_delay_ms
+        self._max_delay = max_hedge_delay_ms
+        self._is_host_failure = is_host_failure
+        self._rate_limit_delay = rate_limit_delay
+        self._backoff_until = 0.0
+        self.rate_limited = 0
+
+    def _candidates(self) -> list[HostStats]:
+        # Unmeasured hosts sort first so every host gets sampled
+        return sorted(self._hosts, key=lambda h: h.ewma_ms or 0.0)
+
+    def _next_host(self, exclude: HostStats | None = None) -> HostStats | None:
+        for host in self._candidates():
+            if host is not exclude and host.breaker.allow():
+                return host
+        return None
+
+    def hedge_delay(self, host: HostStats) -> float:
+        if len(host.samples) < 10:
+            return self._max_delay / 1000
+        p95 = percentile(sorted(host.samples), 95)
+        return min(max(p95, self._min_delay), self._max_delay) / 1000
+
+    def backoff_remaining(self) -> float:
+        return max(self._backoff_until - time.monotonic(), 0.0)
+
+    async def request(self, send: Callable[[str], Awaitable[T]]) -> T:
+        remaining = self.backoff_remaining()
+        if remaining > 0:
+            raise RateLimitedError(remaining)
+
+        primary = self._next_host()
+        if primary is None:
+            # Every circuit is open: still try the historically fastest host
+            primary = self._candidates()[0]
+
+        first = asyncio.create_task(self._attempt(primary, send))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(primary))
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+
+        if done and not first.exception():
+            return first.result()
+        if done and not self._is_host_failure(first.exception()):
+            # Request-level error (bad params etc.), another host won't help
+            return first.result()
+
+        secondary = self._next_host(exclude=primary) if self._hedge or done else None
+        if secondary is None:
+            return await first
+
+        second = asyncio.create_task(self._attempt(secondary, send))
+        pending = {second} if done else {first, second}
+        last_exc: BaseException | None = first.exception() if done else None
+
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    if task.exception() is None:
+                        if task is second and not done:
+                            secondary.hedges_won += 1
+                        return task.result()
+                    last_exc = task.exception()
+                    if not self._is_host_failure(last_exc):
+                        # The other attempt would be rate limited or
+                        # rejected the same way
+                        raise last_exc
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert last_exc is not None
+        raise last_exc
+
+    async def _attempt(self, host: HostStats, send: Callable[[str], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await send(host.url)
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about the host's health
+            host.breaker.release()
+            raise
+        except Exception as exc:
+            delay = self._rate_limit_delay(exc)
+            if delay is not None:
+                self.rate_limited += 1
+                self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+                host.breaker.release()
+            elif self._is_host_failure(exc):
+                host.record_error()
+                host.breaker.record_failure()
+            else:
+                host.record((time.perf_counter() - start) * 1000)
+                host.breaker.record_success()
+            raise
+
+        host.record((time.perf_counter() - start) * 1000)
+        host.breaker.record_success()
+        return result
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for host in self._hosts:
+            values = sorted(host.samples)
+            result[host.url] = {
+                "state": host.breaker.state,
+                "requests": host.requests,
+                "errors": host.errors,
+                "error_rate": round(host.errors / host.requests, 4) if host.requests else 0.0,
+                "ewma_ms": round(host.ewma_ms or 0.0, 2),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "hedges_won": host.hedges_won,
+            }
+        return result
+
+
+_default_pool: EndpointPool | None = None
+
+
+def default_pool() -> EndpointPool:
+    """
+    Pool shared by every BinanceFetcher that is not given one explicitly.
+    """
+    global _default_pool
+    if _default_pool is None:
+        from market.fetcher import is_host_failure, rate_limit_delay
+
+        _default_pool = EndpointPool(
+            is_host_failure=is_host_failure, rate_limit_delay=rate_limit_delay
+        )
+    return _default_pool
+
+
+def set_default_pool(pool: EndpointPool) -> None:
+    global _default_pool
+    _default_pool = pool
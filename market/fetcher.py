@@ -1,15 +1,52 @@
 import aiohttp
 import asyncio
+import time
 from typing import Any
 
+from market.endpoints import EndpointPool, default_pool
+from market.latency import LatencyTracker, latency_tracker
 
-BINANCE_BASE_URL = "https://api.binance.com"
+
+# Backoff after a 418/429 that came without a Retry-After header
+DEFAULT_RETRY_AFTER = 60.0
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    """
+    Whether an error says something about the host rather than the request.
+    Only 5xx responses and connection errors count; 4xx responses (bad
+    symbol, bad params) are the caller's problem, and rate limits apply to
+    our IP on every host, see rate_limit_delay.
+    """
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return True
+
+
+def rate_limit_delay(exc: BaseException) -> float | None:
+    """
+    Seconds to stop sending for after a rate limit (429) or IP ban (418),
+    from Retry-After where the exchange sent one; None for other errors.
+    """
+    if not isinstance(exc, aiohttp.ClientResponseError) or exc.status not in (418, 429):
+        return None
+    try:
+        return float((exc.headers or {}).get("Retry-After", DEFAULT_RETRY_AFTER))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
 
 
 class BinanceFetcher:
-    def __init__(self, timeout_seconds: int = 5) -> None:
+    def __init__(
+        self,
+        timeout_seconds: int = 5,
+        latency: LatencyTracker | None = None,
+        pool: EndpointPool | None = None,
+    ) -> None:
         self._timeout = aiohttp.ClientTimeout(total=timeout_seconds)
         self._session: aiohttp.ClientSession | None = None
+        self._latency = latency or latency_tracker
+        self._pool = pool or default_pool()
 
     async def __aenter__(self) -> "BinanceFetcher":
         self._session = aiohttp.ClientSession(timeout=self._timeout)
@@ -22,20 +59,41 @@ class BinanceFetcher:
     async def _get(self, path: str, params: dict[str, Any]) -> Any:
         assert self._session is not None
 
-        async with self._session.get(
-            f"{BINANCE_BASE_URL}{path}",
-            params=params,
-        ) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        session = self._session
+
+        async def send(base_url: str) -> Any:
+            async with session.get(f"{base_url}{path}", params=params) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        start = time.perf_counter()
+        try:
+            data = await self._pool.request(send)
+        except Exception:
+            self._latency.record_error(path)
+            raise
+
+        self._latency.record(path, (time.perf_counter() - start) * 1000)
+        return data
 
     async def fetch_klines(
-        self, symbol: str, interval: str = "1m", limit: int = 21
+        self,
+        symbol: str,
+        interval: str = "1m",
+        limit: int = 21,
+        end_time: int | None = None,
     ) -> list[list[Any]]:
-        return await self._get(
-            "/api/v3/klines",
-            {"symbol": symbol, "interval": interval, "limit": limit},
-        )
+        params: dict[str, Any] = {"symbol": symbol, "interval": interval, "limit": limit}
+        if end_time is not None:
+            params["endTime"] = end_time
+        return await self._get("/api/v3/klines", params)
 
     async def fetch_ticker(self, symbol: str) -> dict[str, Any]:
         return await self._get("/api/v3/ticker/bookTicker", {"symbol": symbol})
+
+    async def fetch_depth(self, symbol: str, limit: int = 1000) -> dict[str, Any]:
+        return await self._get("/api/v3/depth", {"symbol": symbol, "limit": limit})
+
+    async def fetch_server_time(self) -> int:
+        data = await self._get("/api/v3/time", {})
+        return int(data["serverTime"])
@@ -0,0 +1,156 @@
+import asyncio
+from collections import deque
+from typing import Any, Iterable
+
+import structlog
+
+from core import clock
+from core.models import MarketSnapshot
+from market.latency import percentile
+
+logger = structlog.get_logger()
+
+
+class SymbolFreshness:
+    __slots__ = ("event_ms", "received_ms", "horizon_ms", "outcomes", "last_error")
+
+    def __init__(self, window: int) -> None:
+        self.event_ms: int | None = None
+        self.received_ms: int | None = None
+        # How far behind receipt the event time may legitimately be
+        self.horizon_ms = 0
+        # True per successful fetch, False per failure
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.last_error: str | None = None
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class FreshnessMonitor:
+    """
+    Per-symbol data age and fetch failure rates.
+
+    Each successful load records the exchange event time of the data (the
+    depth event time for a streamed book, the forming candle's open time
+    for REST klines) and the exchange-corrected receive time. A symbol is
+    stale when it has not been refreshed within `max_age_seconds`, or its
+    event time lags receipt by more than that beyond the source's normal
+    horizon (e.g. a candle that has not rolled over).
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = 10.0,
+        window: int = 50,
+        max_failure_rate: float = 0.5,
+    ) -> None:
+        self._max_age_ms = max_age_seconds * 1000
+        self._window = window
+        self._max_failure_rate = max_failure_rate
+        self._symbols: dict[str, SymbolFreshness] = {}
+
+    def _entry(self, symbol: str) -> SymbolFreshness:
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            entry = self._symbols[symbol] = SymbolFreshness(self._window)
+        return entry
+
+    def entry(self, symbol: str) -> SymbolFreshness | None:
+        return self._symbols.get(symbol)
+
+    def record(
+        self,
+        symbol: str,
+        event_ms: int,
+        received_ms: int | None = None,
+        horizon_ms: int = 0,
+    ) -> None:
+        entry = self._entry(symbol)
+        entry.event_ms = event_ms
+        entry.received_ms = received_ms if received_ms is not None else clock.now_ms()
+        entry.horizon_ms = horizon_ms
+        entry.outcomes.append(True)
+
+    def record_failure(self, symbol: str, error: BaseException | str) -> None:
+        entry = self._entry(symbol)
+        entry.outcomes.append(False)
+        entry.last_error = str(error) or type(error).__name__
+
+    def age_ms(self, symbol: str, now_ms: int | None = None) -> int | None:
+        """
+        Milliseconds since the data's exchange event time.
+        """
+        entry = self._symbols.get(symbol)
+        if entry is None or entry.event_ms is None:
+            return None
+        return (now_ms if now_ms is not None else clock.now_ms()) - entry.event_ms
+
+    def stale_reason(self, symbol: str, now_ms: int | None = None) -> str | None:
+        entry = self._symbols.get(symbol)
+        if entry is None or entry.received_ms is None or entry.event_ms is None:
+            return "no data"
+
+        now = now_ms if now_ms is not None else clock.now_ms()
+        if now - entry.received_ms > self._max_age_ms:
+            return "not refreshed"
+        if entry.received_ms - entry.event_ms > entry.horizon_ms + self._max_age_ms:
+            return "exchange data lagging"
+        if entry.failure_rate > self._max_failure_rate:
+            return "failing"
+        return None
+
+    def filter(
+        self, snapshots: Iterable[MarketSnapshot]
+    ) -> tuple[list[MarketSnapshot], dict[str, str]]:
+        """
+        Split snapshots into fresh ones and a symbol -> reason map of the rest.
+        """
+        now = clock.now_ms()
+        fresh: list[MarketSnapshot] = []
+        stale: dict[str, str] = {}
+        for snapshot in snapshots:
+            reason = self.stale_reason(snapshot.symbol, now)
+            if reason is None:
+                fresh.append(snapshot)
+            else:
+                stale[snapshot.symbol] = reason
+        return fresh, stale
+
+    def metrics(self) -> dict[str, Any]:
+        now = clock.now_ms()
+        ages = sorted(
+            now - e.received_ms for e in self._symbols.values() if e.received_ms is not None
+        )
+        lags = sorted(
+            max(e.received_ms - e.event_ms - e.horizon_ms, 0)
+            for e in self._symbols.values()
+            if e.received_ms is not None and e.event_ms is not None
+        )
+        stale = {
+            symbol: reason
+            for symbol in self._symbols
+            if (reason := self.stale_reason(symbol, now)) is not None
+        }
+        failing = {
+            symbol: round(e.failure_rate, 3)
+            for symbol, e in self._symbols.items()
+            if e.failure_rate > 0
+        }
+        return {
+            "symbols": len(self._symbols),
+            "age_p50_ms": round(percentile(ages, 50)),
+            "age_p95_ms": round(percentile(ages, 95)),
+            "age_max_ms": ages[-1] if ages else 0,
+            "exchange_lag_p95_ms": round(percentile(lags, 95)),
+            "stale": stale,
+            "failure_rates": dict(sorted(failing.items(), key=lambda kv: -kv[1])[:10]),
+        }
+
+    async def run(self, interval_seconds: float = 60.0) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            logger.info("market.freshness", **self.metrics())
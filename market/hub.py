@@ -0,0 +1,123 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+import structlog
+
+from core.clock import utc_now
+from core.models import MarketSnapshot
+from market.analyzer import analyze_symbols
+from market.freshness import FreshnessMonitor
+from market.klines import KlineStore
+from market.orderbook import OrderBookManager
+from market.snapshot_cache import SnapshotCache
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class MarketFrame:
+    seq: int
+    fetched_at: datetime
+    snapshots: tuple[MarketSnapshot, ...]
+    by_symbol: Mapping[str, MarketSnapshot] = field(repr=False)
+
+    def select(self, symbols: Iterable[str]) -> list[MarketSnapshot]:
+        return [self.by_symbol[s] for s in symbols if s in self.by_symbol]
+
+
+class MarketDataHub:
+    """
+    Fetches the union universe once per interval and fans the resulting
+    immutable frame out to every subscribed engine.
+
+    Subscribers always get the latest frame; a slow consumer skips frames
+    rather than queueing them.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        poll_interval_seconds: float = 2.0,
+        order_books: OrderBookManager | None = None,
+        cache: SnapshotCache | None = None,
+        history: KlineStore | None = None,
+        freshness: FreshnessMonitor | None = None,
+    ) -> None:
+        self._symbols = list(dict.fromkeys(symbols))
+        self._poll_interval = poll_interval_seconds
+        self._order_books = order_books
+        self._cache = cache
+        self._history = history
+        self._freshness = freshness
+        self._latest: MarketFrame | None = None
+        self._changed = asyncio.Condition()
+        self._subscribers = 0
+
+    @property
+    def latest(self) -> MarketFrame | None:
+        return self._latest
+
+    def subscribe(self) -> "HubSubscription":
+        self._subscribers += 1
+        return HubSubscription(self)
+
+    async def wait_for(self, after_seq: int) -> MarketFrame:
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self._latest is not None and self._latest.seq > after_seq
+            )
+            assert self._latest is not None
+            return self._latest
+
+    async def publish(self, snapshots: Iterable[MarketSnapshot]) -> MarketFrame:
+        snapshots = tuple(snapshots)
+        seq = self._latest.seq + 1 if self._latest else 1
+        frame = MarketFrame(
+            seq=seq,
+            fetched_at=utc_now(),
+            snapshots=snapshots,
+            by_symbol=MappingProxyType({s.symbol: s for s in snapshots}),
+        )
+
+        async with self._changed:
+            self._latest = frame
+            self._changed.notify_all()
+        return frame
+
+    async def run(self) -> None:
+        logger.info("hub.started", symbols=len(self._symbols), subscribers=self._subscribers)
+
+        while True:
+            try:
+                snapshots = await analyze_symbols(
+                    self._symbols,
+                    self._order_books,
+                    self._cache,
+                    self._history,
+                    self._freshness,
+                )
+                await self.publish(snapshots)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("hub.error", error=str(exc))
+
+            await asyncio.sleep(self._poll_interval)
+
+
+class HubSubscription:
+    """
+    One engine's view of a MarketDataHub; drop-in for DirectMarketData.
+    """
+
+    def __init__(self, hub: MarketDataHub) -> None:
+        self._hub = hub
+        self._seen = 0
+
+    async def get_snapshots(self, symbols: Iterable[str]) -> list[MarketSnapshot]:
+        frame = await self._hub.wait_for(self._seen)
+        self._seen = frame.seq
+        return frame.select(symbols)
@@ -0,0 +1,184 @@
+"""
+Indicator registry with lazy, memoized evaluation.
+
+Indicators are declared with the indicators they depend on and a rough
+cost. Nothing is computed up front: a value is built the first time a
+rule asks for it, along with whatever it depends on, and memoized per
+symbol until that symbol's forming candle changes. Combined with
+RuleSet's cost ordering, an RSI or ATR filter only runs for symbols that
+survived the cheap spread and trend checks.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+from core.models import MarketSnapshot
+from market.indicators import atr, bollinger, rolling_high, rolling_low, rsi
+from market.klines import KlineArray, KlineStore
+
+# 1m candles fed to the indicators; more than the longest period so the
+# Wilder smoothing has time to settle once history has built up
+SERIES_WINDOW = 50
+
+
+@dataclass(frozen=True)
+class Indicator:
+    name: str
+    deps: tuple[str, ...]
+    # fn(klines, *dependency_values) -> value, or None if not enough data
+    fn: Callable[..., Any]
+    cost: int
+
+
+INDICATORS: dict[str, Indicator] = {}
+
+
+def indicator(name: str, deps: tuple[str, ...] = (), cost: int = 1):
+    """
+    Register an indicator. Dependencies must already be registered, which
+    keeps the graph acyclic by construction.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        for dep in deps:
+            if dep not in INDICATORS:
+                raise ValueError(f"Indicator {name!r} depends on unknown {dep!r}")
+        INDICATORS[name] = Indicator(name, deps, fn, cost)
+        return fn
+
+    return decorator
+
+
+def total_cost(name: str) -> int:
+    # Upper bound: shared dependencies are counted once per path
+    ind = INDICATORS[name]
+    return ind.cost + sum(total_cost(dep) for dep in ind.deps)
+
+
+def indicator_fields() -> list[str]:
+    # Names starting with "_" are intermediate series, not rule fields
+    return [name for name in INDICATORS if not name.startswith("_")]
+
+
+def indicator_costs() -> dict[str, int]:
+    return {name: total_cost(name) for name in indicator_fields()}
+
+
+# ---- Series ----
+
+@indicator("_closes")
+def _closes(klines: KlineArray) -> list[Decimal]:
+    return klines.decimals("close", SERIES_WINDOW)
+
+
+@indicator("_highs")
+def _highs(klines: KlineArray) -> list[Decimal]:
+    return klines.decimals("high", SERIES_WINDOW)
+
+
+@indicator("_lows")
+def _lows(klines: KlineArray) -> list[Decimal]:
+    return klines.decimals("low", SERIES_WINDOW)
+
+
+# ---- Indicators ----
+
+@indicator("rsi_14", deps=("_closes",), cost=4)
+def _rsi_14(klines: KlineArray, closes: list[Decimal]) -> Decimal | None:
+    return rsi(closes, 14)
+
+
+@indicator("atr_14", deps=("_highs", "_lows", "_closes"), cost=4)
+def _atr_14(klines, highs, lows, closes) -> Decimal | None:
+    return atr(highs, lows, closes, 14)
+
+
+@indicator("atr_pct_14", deps=("atr_14", "_closes"))
+def _atr_pct_14(klines, atr_value: Decimal, closes: list[Decimal]) -> Decimal | None:
+    # ATR as a percentage of price, comparable across symbols
+    return atr_value / closes[-1] * 100 if closes[-1] else None
+
+
+@indicator("_bollinger_20", deps=("_closes",), cost=2)
+def _bollinger_20(klines, closes):
+    return bollinger(closes, 20)
+
+
+@indicator("bb_upper_20", deps=("_bollinger_20",))
+def _bb_upper_20(klines, bands) -> Decimal:
+    return bands[1]
+
+
+@indicator("bb_lower_20", deps=("_bollinger_20",))
+def _bb_lower_20(klines, bands) -> Decimal:
+    return bands[2]
+
+
+@indicator("bb_width_20", deps=("_bollinger_20",))
+def _bb_width_20(klines, bands) -> Decimal | None:
+    mid, upper, lower = bands
+    return (upper - lower) / mid * 100 if mid else None
+
+
+@indicator("high_20", deps=("_highs",))
+def _high_20(klines, highs) -> Decimal | None:
+    return rolling_high(highs, 20)
+
+
+@indicator("low_20", deps=("_lows",))
+def _low_20(klines, lows) -> Decimal | None:
+    return rolling_low(lows, 20)
+
+
+def _candle_key(klines: KlineArray) -> tuple:
+    # Open time plus OHLCV of the forming candle
+    return (
+        klines.open_time[-1],
+        klines.open[-1],
+        klines.high[-1],
+        klines.low[-1],
+        klines.close[-1],
+        klines.volume[-1],
+    )
+
+
+class IndicatorSet:
+    """
+    Lazily evaluated indicators over a KlineStore, memoized per symbol
+    per candle. One instance can be shared by every engine.
+    """
+
+    def __init__(self, history: KlineStore) -> None:
+        self._history = history
+        # symbol -> (candle key, computed values)
+        self._memo: dict[str, tuple[tuple, dict[str, Any]]] = {}
+        self.computed = 0
+
+    def value(self, symbol: str, name: str) -> Any:
+        klines = self._history.get(symbol)
+        if not klines:
+            return None
+
+        key = _candle_key(klines)
+        cached = self._memo.get(symbol)
+        if cached is None or cached[0] != key:
+            cached = self._memo[symbol] = (key, {})
+
+        return self._compute(name, klines, cached[1])
+
+    def _compute(self, name: str, klines: KlineArray, memo: dict[str, Any]) -> Any:
+        if name in memo:
+            return memo[name]
+
+        ind = INDICATORS[name]
+        args = [self._compute(dep, klines, memo) for dep in ind.deps]
+        value = None if any(a is None for a in args) else ind.fn(klines, *args)
+        self.computed += 1
+
+        memo[name] = value
+        return value
+
+    def resolve(self, name: str, snapshot: MarketSnapshot) -> Any:
+        # RuleSet.evaluate resolver signature
+        return self.value(snapshot.symbol, name)
@@ -19,3 +19,76 @@ def vwap(prices: list[Decimal], volumes: list[Decimal]) -> Decimal:
         return prices[-1]
 
     return sum(p * v for p, v in zip(prices, volumes)) / total_volume
+
+
+def rsi(closes: list[Decimal], period: int = 14) -> Decimal | None:
+    """
+    Wilder's RSI over the whole series; None until period + 1 closes.
+    """
+    if len(closes) <= period:
+        return None
+
+    gains = losses = Decimal("0")
+    for prev, cur in zip(closes[:period], closes[1:period + 1]):
+        change = cur - prev
+        if change > 0:
+            gains += change
+        else:
+            losses -= change
+    avg_gain = gains / period
+    avg_loss = losses / period
+
+    for prev, cur in zip(closes[period:], closes[period + 1:]):
+        change = cur - prev
+        avg_gain = (avg_gain * (period - 1) + max(change, Decimal("0"))) / period
+        avg_loss = (avg_loss * (period - 1) + max(-change, Decimal("0"))) / period
+
+    if avg_loss == 0:
+        return Decimal("100")
+    return Decimal("100") - Decimal("100") / (1 + avg_gain / avg_loss)
+
+
+def atr(
+    highs: list[Decimal],
+    lows: list[Decimal],
+    closes: list[Decimal],
+    period: int = 14,
+) -> Decimal | None:
+    """
+    Wilder's average true range; None until period + 1 candles.
+    """
+    if len(closes) <= period:
+        return None
+
+    true_ranges = [
+        max(h - low, abs(h - prev_close), abs(low - prev_close))
+        for h, low, prev_close in zip(highs[1:], lows[1:], closes)
+    ]
+
+    value = sum(true_ranges[:period]) / period
+    for tr in true_ranges[period:]:
+        value = (value * (period - 1) + tr) / period
+    return value
+
+
+def bollinger(
+    closes: list[Decimal], period: int = 20, width: Decimal = Decimal("2")
+) -> tuple[Decimal, Decimal, Decimal] | None:
+    """
+    (middle, upper, lower) bands over the last `period` closes.
+    """
+    if len(closes) < period:
+        return None
+
+    window = closes[-period:]
+    mean = sum(window) / period
+    std = (sum((c - mean) ** 2 for c in window) / period).sqrt()
+    return mean, mean + width * std, mean - width * std
+
+
+def rolling_high(values: list[Decimal], period: int) -> Decimal | None:
+    return max(values[-period:]) if len(values) >= period else None
+
+
+def rolling_low(values: list[Decimal], period: int) -> Decimal | None:
+    return min(values[-period:]) if len(values) >= period else None
@@ -0,0 +1,222 @@
+from array import array
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+# REST kline columns kept, in /api/v3/klines order; "ignore" is dropped
+COLUMNS = (
+    ("open_time", "q"),
+    ("open", "d"),
+    ("high", "d"),
+    ("low", "d"),
+    ("close", "d"),
+    ("volume", "d"),
+    ("close_time", "q"),
+    ("quote_volume", "d"),
+    ("trades", "q"),
+    ("taker_base_volume", "d"),
+    ("taker_quote_volume", "d"),
+)
+
+# Intervals that can be built from 1m candles; all divide a UTC day, so
+# epoch-aligned buckets match Binance's own bar boundaries
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "2h": 2 * 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "6h": 6 * 60 * 60_000,
+    "8h": 8 * 60 * 60_000,
+    "12h": 12 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+
+class KlineArray:
+    """
+    Struct-of-arrays kline container with fixed dtypes.
+
+    One typed array per column costs about 88 bytes per candle versus well
+    over a kilobyte for a REST row of 12 strings. Indexing returns a row
+    tuple in REST column order, so code written against `klines[i][4]`
+    keeps working.
+    """
+
+    __slots__ = ("capacity",) + tuple(name for name, _ in COLUMNS)
+
+    def __init__(self, capacity: int | None = None) -> None:
+        self.capacity = capacity
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    @classmethod
+    def from_rest(cls, rows: Iterable[Sequence[Any]], capacity: int | None = None) -> "KlineArray":
+        klines = cls(capacity)
+        klines.merge(rows)
+        return klines
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def __getitem__(self, index: int) -> tuple:
+        if isinstance(index, slice):
+            raise TypeError("KlineArray does not support slicing rows; use tail()")
+        return tuple(getattr(self, name)[index] for name, _ in COLUMNS)
+
+    def __iter__(self) -> Iterator[tuple]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def merge(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Merge REST rows: a row for the last open time replaces it (the
+        forming candle), newer rows are appended, older ones are ignored.
+        """
+        for row in rows:
+            open_time = int(row[0])
+            if self.open_time and open_time < self.open_time[-1]:
+                continue
+            if self.open_time and open_time == self.open_time[-1]:
+                for col, (name, typecode) in enumerate(COLUMNS):
+                    getattr(self, name)[-1] = int(row[col]) if typecode == "q" else float(row[col])
+                continue
+            for col, (name, typecode) in enumerate(COLUMNS):
+                getattr(self, name).append(int(row[col]) if typecode == "q" else float(row[col]))
+
+        if self.capacity is not None and len(self) > self.capacity:
+            excess = len(self) - self.capacity
+            for name, _ in COLUMNS:
+                del getattr(self, name)[:excess]
+
+    def tail(self, n: int) -> "KlineArray":
+        result = KlineArray()
+        for name, _ in COLUMNS:
+            getattr(result, name).extend(getattr(self, name)[-n:])
+        return result
+
+    def decimals(self, column: str, n: int | None = None) -> list[Decimal]:
+        """
+        Column values as Decimals via their shortest repr, so "0.1" stays
+        Decimal("0.1") rather than its binary expansion.
+        """
+        values = getattr(self, column)
+        if n is not None:
+            values = values[-n:]
+        return [Decimal(repr(v)) for v in values]
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).itemsize * len(self) for name, _ in COLUMNS)
+
+
+def _combine(a: tuple, b: tuple) -> tuple:
+    # a then b, both already in KlineArray row form
+    return (
+        a[0], a[1], max(a[2], b[2]), min(a[3], b[3]), b[4], a[5] + b[5],
+        b[6], a[7] + b[7], a[8] + b[8], a[9] + b[9], a[10] + b[10],
+    )
+
+
+class Resampler:
+    """
+    Builds higher-timeframe bars incrementally from 1m candles.
+
+    Completed 1m candles of the current bucket are folded into `_sealed`
+    once; the forming 1m candle is kept apart because Binance keeps
+    revising it, so each update costs O(1) regardless of the interval.
+    """
+
+    __slots__ = ("interval", "interval_ms", "bars", "_sealed", "_forming")
+
+    def __init__(self, interval: str, capacity: int | None = None) -> None:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval {interval!r}")
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.bars = KlineArray(capacity)
+        self._sealed: tuple | None = None
+        self._forming: tuple | None = None
+
+    def _bucket(self, open_time: int) -> int:
+        return open_time - open_time % self.interval_ms
+
+    def update(self, row: tuple) -> None:
+        open_time = row[0]
+        forming = self._forming
+
+        if forming is not None and open_time < forming[0]:
+            return
+
+        bucket = self._bucket(open_time)
+        if forming is not None and open_time > forming[0]:
+            if self._bucket(forming[0]) == bucket:
+                self._sealed = forming if self._sealed is None else _combine(self._sealed, forming)
+            else:
+                self._sealed = None
+        self._forming = row
+
+        bar = row if self._sealed is None else _combine(self._sealed, row)
+        self.bars.merge([(bucket, *bar[1:6], bucket + self.interval_ms - 1, *bar[7:])])
+
+
+class KlineStore:
+    """
+    Rolling per-symbol kline history in KlineArray form, plus resampled
+    bars for each of `timeframes`.
+    """
+
+    def __init__(self, capacity: int = 1440, timeframes: Iterable[str] = ()) -> None:
+        self._capacity = capacity
+        self._timeframes = [tf for tf in timeframes if tf != "1m"]
+        for tf in self._timeframes:
+            if tf not in INTERVAL_MS:
+                raise ValueError(f"Unsupported timeframe {tf!r}")
+        self._klines: dict[str, KlineArray] = {}
+        self._resamplers: dict[str, list[Resampler]] = {}
+
+    @property
+    def timeframes(self) -> list[str]:
+        return list(self._timeframes)
+
+    def update(self, symbol: str, rows: Iterable[Sequence[Any]]) -> KlineArray:
+        klines = self._klines.get(symbol)
+        if klines is None:
+            klines = self._klines[symbol] = KlineArray(self._capacity)
+            self._resamplers[symbol] = [
+                Resampler(tf, self._capacity) for tf in self._timeframes
+            ]
+
+        last_open = klines.open_time[-1] if klines else None
+        klines.merge(rows)
+
+        resamplers = self._resamplers[symbol]
+        if resamplers and klines:
+            # Only the revised forming candle and newer ones are fed through
+            start = len(klines)
+            while start > 0 and (last_open is None or klines.open_time[start - 1] >= last_open):
+                start -= 1
+            for i in range(start, len(klines)):
+                row = klines[i]
+                for resampler in resamplers:
+                    resampler.update(row)
+
+        return klines
+
+    def get(self, symbol: str, interval: str = "1m") -> KlineArray | None:
+        if interval == "1m":
+            return self._klines.get(symbol)
+        for resampler in self._resamplers.get(symbol, ()):
+            if resampler.interval == interval:
+                return resampler.bars
+        return None
+
+    def symbols(self) -> list[str]:
+        return list(self._klines)
+
+    def nbytes(self) -> int:
+        total = sum(k.nbytes() for k in self._klines.values())
+        for resamplers in self._resamplers.values():
+            total += sum(r.bars.nbytes() for r in resamplers)
+        return total
@@ -0,0 +1,58 @@
+from collections import deque
+from typing import Any
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class LatencyTracker:
+    """
+    Rolling round-trip time samples and error counts per endpoint.
+    """
+
+    def __init__(self, window: int = 500) -> None:
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._requests: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(self, endpoint: str, rtt_ms: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self._window)
+        samples.append(rtt_ms)
+        self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+
+    def record_error(self, endpoint: str) -> None:
+        self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+        self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+
+    def quantile(self, endpoint: str, pct: float) -> float | None:
+        samples = self._samples.get(endpoint)
+        if not samples:
+            return None
+        return percentile(sorted(samples), pct)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for endpoint, requests in self._requests.items():
+            values = sorted(self._samples.get(endpoint, ()))
+            result[endpoint] = {
+                "requests": requests,
+                "errors": self._errors.get(endpoint, 0),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2) if values else 0.0,
+            }
+        return result
+
+
+# Shared by every BinanceFetcher unless one is given explicitly
+latency_tracker = LatencyTracker()
@@ -0,0 +1,353 @@
+import asyncio
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterable
+
+import structlog
+
+if TYPE_CHECKING:
+    from market.fetcher import BinanceFetcher
+
+logger = structlog.get_logger()
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
+
+
+class BookSide:
+    """
+    One side of a book as two parallel sorted float arrays.
+
+    Keys are ascending; bids store negated prices so the best level is
+    always index 0 for both sides.
+    """
+
+    __slots__ = ("_sign", "_keys", "_qtys")
+
+    def __init__(self, is_bid: bool) -> None:
+        self._sign = -1.0 if is_bid else 1.0
+        self._keys = array("d")
+        self._qtys = array("d")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        del self._keys[:]
+        del self._qtys[:]
+
+    def load(self, levels: Iterable[tuple[float, float]]) -> None:
+        self.clear()
+        rows = sorted((self._sign * p, q) for p, q in levels if q > 0)
+        self._keys.extend(k for k, _ in rows)
+        self._qtys.extend(q for _, q in rows)
+
+    def update(self, price: float, qty: float) -> None:
+        key = self._sign * price
+        keys = self._keys
+        i = bisect_left(keys, key)
+        found = i < len(keys) and keys[i] == key
+
+        if qty == 0:
+            if found:
+                del keys[i]
+                del self._qtys[i]
+        elif found:
+            self._qtys[i] = qty
+        else:
+            keys.insert(i, key)
+            self._qtys.insert(i, qty)
+
+    def best(self) -> tuple[float, float] | None:
+        if not self._keys:
+            return None
+        return self._sign * self._keys[0], self._qtys[0]
+
+    def arrays(self) -> tuple[float, array, array]:
+        """
+        Sign and raw level arrays, for allocation-free walkers.
+        """
+        return self._sign, self._keys, self._qtys
+
+    def level(self, i: int) -> tuple[float, float]:
+        return self._sign * self._keys[i], self._qtys[i]
+
+    def walk(self, quantity: float) -> tuple[float, float]:
+        """
+        Consume `quantity` from the best level outwards.
+
+        Returns:
+            (filled quantity, quote cost of the fill)
+        """
+        remaining = quantity
+        cost = 0.0
+        sign = self._sign
+        keys = self._keys
+        qtys = self._qtys
+
+        for i in range(len(keys)):
+            take = qtys[i] if qtys[i] < remaining else remaining
+            cost += take * sign * keys[i]
+            remaining -= take
+            if remaining <= 0:
+                break
+
+        return quantity - remaining, cost
+
+    def depth_within(self, limit_price: float) -> float:
+        """
+        Total quantity at prices no worse than `limit_price`.
+        """
+        end = bisect_right(self._keys, self._sign * limit_price)
+        return sum(self._qtys[:end])
+
+
+class OrderBook:
+    """
+    Local order book for one symbol, kept in sync from a REST snapshot plus
+    diff-depth events.
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = 0
+        # Exchange time of the last applied depth event
+        self.event_time_ms: int | None = None
+        self._bridged = False
+
+    @property
+    def ready(self) -> bool:
+        return self.last_update_id > 0 and len(self.bids) > 0 and len(self.asks) > 0
+
+    def reset(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+        self.event_time_ms = None
+        self._bridged = False
+
+    def load_snapshot(self, snapshot: dict[str, Any]) -> None:
+        self.bids.load((float(p), float(q)) for p, q in snapshot["bids"])
+        self.asks.load((float(p), float(q)) for p, q in snapshot["asks"])
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self._bridged = False
+
+    def apply_diff(self, event: dict[str, Any]) -> bool:
+        """
+        Apply a `depthUpdate` event.
+
+        Returns:
+            False on a sequence gap; the book must then be resynced
+        """
+        first_id = event["U"]
+        final_id = event["u"]
+
+        # Already contained in the snapshot
+        if final_id <= self.last_update_id:
+            return True
+
+        if self._bridged:
+            if first_id != self.last_update_id + 1:
+                return False
+        elif not (first_id <= self.last_update_id + 1 <= final_id):
+            return False
+
+        for price, qty in event["b"]:
+            self.bids.update(float(price), float(qty))
+        for price, qty in event["a"]:
+            self.asks.update(float(price), float(qty))
+
+        self.last_update_id = final_id
+        self.event_time_ms = event.get("E", self.event_time_ms)
+        self._bridged = True
+        return True
+
+    def spread_pct(self) -> float | None:
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (ask[0] - bid[0]) / bid[0] * 100
+
+    def depth_at(self, side: str, pct: float) -> float:
+        """
+        Quantity available within `pct` percent of the touch.
+
+        Args:
+            side: "BUY" consumes asks, "SELL" consumes bids
+            pct: Distance from the best price in percent
+        """
+        book_side = self.asks if side == "BUY" else self.bids
+        best = book_side.best()
+        if best is None:
+            return 0.0
+        factor = 1 + pct / 100 if side == "BUY" else 1 - pct / 100
+        return book_side.depth_within(best[0] * factor)
+
+    def expected_fill_price(self, side: str, quantity: float) -> float | None:
+        """
+        Average price of a market order for `quantity`, or None when the
+        book cannot fill it.
+        """
+        book_side = self.asks if side == "BUY" else self.bids
+        filled, cost = book_side.walk(quantity)
+        if filled <= 0 or filled < quantity * (1 - 1e-9):
+            return None
+        return cost / filled
+
+    def as_ticker(self) -> dict[str, str]:
+        """
+        Top of book in the `/api/v3/ticker/bookTicker` shape.
+        """
+        bid = self.bids.best()
+        ask = self.asks.best()
+        assert bid is not None and ask is not None
+        return {
+            "symbol": self.symbol,
+            "bidPrice": repr(bid[0]),
+            "bidQty": repr(bid[1]),
+            "askPrice": repr(ask[0]),
+            "askQty": repr(ask[1]),
+        }
+
+
+class OrderBookManager:
+    """
+    Maintains one OrderBook per symbol from the combined diff-depth stream.
+
+    Events arriving while a book is (re)loading its REST snapshot are
+    buffered and replayed; a sequence gap triggers a resync of that symbol
+    only.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        depth_limit: int = 1000,
+        stream_url: str = BINANCE_STREAM_URL,
+        max_buffered_events: int = 1000,
+    ) -> None:
+        self._books = {s: OrderBook(s) for s in symbols}
+        self._depth_limit = depth_limit
+        self._stream_url = stream_url
+        self._buffers: dict[str, deque] = {
+            s: deque(maxlen=max_buffered_events) for s in symbols
+        }
+        self._resyncing: dict[str, asyncio.Task] = {}
+        self._fetcher: "BinanceFetcher | None" = None
+
+    def book(self, symbol: str) -> OrderBook | None:
+        """
+        Book for `symbol`, only while it is in sync.
+        """
+        book = self._books.get(symbol)
+        if book is None or not book.ready or symbol in self._resyncing:
+            return None
+        return book
+
+    def expected_fill_price(self, symbol: str, side: str, quantity: Decimal) -> Decimal | None:
+        book = self.book(symbol)
+        if book is None:
+            return None
+        price = book.expected_fill_price(side, float(quantity))
+        return Decimal(repr(price)) if price is not None else None
+
+    async def run(self) -> None:
+        # Network stack is only needed by the stream, not by book queries
+        import aiohttp
+
+        from market.fetcher import BinanceFetcher
+
+        streams = "/".join(f"{s.lower()}@depth@100ms" for s in self._books)
+        url = f"{self._stream_url}?streams={streams}"
+
+        while True:
+            try:
+                async with BinanceFetcher() as fetcher, aiohttp.ClientSession() as session:
+                    self._fetcher = fetcher
+                    async with session.ws_connect(url, heartbeat=30) as ws:
+                        logger.info("orderbook.connected", symbols=len(self._books))
+                        for symbol in self._books:
+                            self._schedule_resync(symbol)
+
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            self._on_event(json.loads(msg.data)["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("orderbook.stream_failed", error=str(exc))
+            finally:
+                self._fetcher = None
+                for task in self._resyncing.values():
+                    task.cancel()
+                self._resyncing.clear()
+                for book in self._books.values():
+                    book.reset()
+                for buffer in self._buffers.values():
+                    buffer.clear()
+
+            await asyncio.sleep(1)
+
+    def _on_event(self, event: dict[str, Any]) -> None:
+        symbol = event.get("s")
+        book = self._books.get(symbol)
+        if book is None:
+            return
+
+        if symbol in self._resyncing:
+            self._buffers[symbol].append(event)
+            return
+
+        if not book.ready:
+            self._buffers[symbol].append(event)
+            self._schedule_resync(symbol)
+            return
+
+        if not book.apply_diff(event):
+            logger.warning("orderbook.sequence_gap", symbol=symbol, last=book.last_update_id)
+            book.reset()
+            self._buffers[symbol].append(event)
+            self._schedule_resync(symbol)
+
+    def _schedule_resync(self, symbol: str) -> None:
+        if symbol in self._resyncing:
+            return
+        self._resyncing[symbol] = asyncio.create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str) -> None:
+        book = self._books[symbol]
+        buffer = self._buffers[symbol]
+
+        try:
+            while self._fetcher is not None:
+                snapshot = await self._fetcher.fetch_depth(symbol, self._depth_limit)
+                book.load_snapshot(snapshot)
+
+                # Replay what arrived while the snapshot was in flight
+                ok = True
+                while buffer:
+                    if not book.apply_diff(buffer[0]):
+                        ok = False
+                        break
+                    buffer.popleft()
+
+                if ok:
+                    logger.info("orderbook.synced", symbol=symbol, last=book.last_update_id)
+                    return
+
+                # Snapshot older than the buffered events, fetch again
+                book.reset()
+                await asyncio.sleep(0.5)
+        except Exception as exc:
+            logger.warning("orderbook.resync_failed", symbol=symbol, error=str(exc))
+            book.reset()
+            # Back off before the next event triggers another attempt
+            await asyncio.sleep(1)
+        finally:
+            self._resyncing.pop(symbol, None)
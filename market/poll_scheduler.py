@@ -0,0 +1,196 @@
+"""
+Per-symbol polling cadence.
+
+Instead of refetching the whole universe every tick, each symbol gets its
+own refresh interval between `min_interval` and `max_interval`:
+
+    closeness   how far the last snapshot is from passing the entry rules
+                (RuleSet.distance); a symbol about to pass is polled fastest
+    volatility  standard deviation of recent 1m returns; fast-moving symbols
+                can cross a threshold sooner
+    candle      symbols near a signal are also polled right after the 1m
+                candle closes, when volume and EMA inputs jump
+
+Due symbols wait in a heap ordered by due time and are released against a
+token bucket of API request weight, so a burst of due symbols is spread
+out instead of exceeding the exchange limit.
+"""
+
+import heapq
+import math
+from typing import Iterable
+
+import structlog
+
+from core.clock import Clock, get_clock
+from core.models import MarketSnapshot
+from core.rule_dsl import RuleSet
+
+logger = structlog.get_logger()
+
+# Request weight of one symbol refresh: klines (limit < 100) plus a
+# single-symbol book ticker, 2 each
+REFRESH_WEIGHT = 4
+
+# Rule distance at or beyond which a symbol counts as far from a signal
+FAR_DISTANCE = 0.05
+
+# 1m return volatility at which the interval is no longer shortened
+QUIET_VOLATILITY = 0.001
+
+# Returns used for the volatility estimate
+VOLATILITY_WINDOW = 20
+
+# Poll this long after the 1m candle closes, once the new bar exists
+CANDLE_CLOSE_DELAY = 0.5
+
+
+def return_volatility(closes: Iterable[float]) -> float | None:
+    """
+    Standard deviation of simple returns, or None with too little history.
+    """
+    closes = list(closes)
+    returns = [b / a - 1 for a, b in zip(closes, closes[1:]) if a]
+    if len(returns) < 2:
+        return None
+    mean = sum(returns) / len(returns)
+    return math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        rules: RuleSet,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        weight_per_minute: float = 1200.0,
+        history=None,
+        clock: Clock | None = None,
+    ) -> None:
+        self._rules = rules
+        self._min = min_interval
+        self._max = max(max_interval, min_interval)
+        # Optional market.klines.KlineStore for the volatility estimate
+        self._history = history
+        self._clock = clock or get_clock()
+
+        # Token bucket: one minute of weight at most, refilled continuously
+        self._capacity = max(weight_per_minute, REFRESH_WEIGHT)
+        self._rate = self._capacity / 60
+        self._tokens = self._capacity
+        self._refilled = self._clock.monotonic()
+
+        # (due, seq, symbol); `_due` holds the live due time per symbol so
+        # superseded heap entries can be skipped
+        self._heap: list[tuple[float, int, str]] = []
+        self._due: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._seq = 0
+        self.deferred = 0
+
+        now = self._refilled
+        for symbol in symbols:
+            self._push(symbol, now)
+
+    def _push(self, symbol: str, due: float) -> None:
+        self._seq += 1
+        self._due[symbol] = due
+        heapq.heappush(self._heap, (due, self._seq, symbol))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    def due(self) -> list[str]:
+        """
+        Pop the symbols due now that fit in the weight budget.
+
+        Due symbols over budget stay queued, in due order, for a later call.
+        """
+        now = self._clock.monotonic()
+        self._refill(now)
+
+        symbols: list[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, symbol = self._heap[0]
+            if self._due.get(symbol) != due:
+                heapq.heappop(self._heap)
+                continue
+            if self._tokens < REFRESH_WEIGHT:
+                self.deferred += 1
+                break
+            heapq.heappop(self._heap)
+            del self._due[symbol]
+            self._tokens -= REFRESH_WEIGHT
+            symbols.append(symbol)
+        return symbols
+
+    def seconds_until_due(self) -> float:
+        """
+        Time until the next symbol is due and affordable.
+        """
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return self._max
+
+        now = self._clock.monotonic()
+        self._refill(now)
+        wait_budget = max(REFRESH_WEIGHT - self._tokens, 0) / self._rate
+        return max(self._heap[0][0] - now, wait_budget, 0.0)
+
+    def interval_for(self, snapshot: MarketSnapshot) -> float:
+        distance = self._rules.distance(snapshot)
+        closeness = min(distance / FAR_DISTANCE, 1.0)
+
+        volatility = self._volatility(snapshot.symbol)
+        calm = 1.0 if volatility is None else min(QUIET_VOLATILITY / max(volatility, 1e-12), 1.0)
+
+        interval = self._min + (self._max - self._min) * closeness * calm
+        if distance < FAR_DISTANCE:
+            # Near a signal: do not sleep through the candle close
+            close_in = self._clock.ms_until_candle_close() / 1000 + CANDLE_CLOSE_DELAY
+            interval = min(interval, max(close_in, self._min))
+        return interval
+
+    def _volatility(self, symbol: str) -> float | None:
+        if self._history is None:
+            return None
+        klines = self._history.get(symbol)
+        if klines is None:
+            return None
+        return return_volatility(klines.close[-(VOLATILITY_WINDOW + 1):])
+
+    def update(self, snapshots: Iterable[MarketSnapshot], requested: Iterable[str] = ()) -> None:
+        """
+        Reschedule refreshed symbols by their new interval; requested
+        symbols that came back without a snapshot retry at `min_interval`.
+        """
+        now = self._clock.monotonic()
+        returned: set[str] = set()
+        for snapshot in snapshots:
+            returned.add(snapshot.symbol)
+            interval = self._intervals[snapshot.symbol] = self.interval_for(snapshot)
+            self._push(snapshot.symbol, now + interval)
+
+        for symbol in requested:
+            if symbol not in returned and symbol not in self._due:
+                self._push(symbol, now + self._min)
+
+    def metrics(self) -> dict[str, float | int]:
+        intervals = sorted(self._intervals.values())
+        return {
+            "symbols": len(self._due),
+            "interval_min_s": round(intervals[0], 2) if intervals else 0.0,
+            "interval_median_s": round(intervals[len(intervals) // 2], 2) if intervals else 0.0,
+            "weight_per_minute": round(
+                sum(REFRESH_WEIGHT * 60 / i for i in intervals if i > 0), 1
+            ),
+            "deferred": self.deferred,
+        }
+
+    async def run(self, interval_seconds: float = 60.0) -> None:
+        while True:
+            await self._clock.sleep(interval_seconds)
+            logger.info("market.poll_schedule", **self.metrics())
@@ -0,0 +1,366 @@
+"""
+Market state shared between processes.
+
+A scanner process fetches and analyzes the universe and publishes the
+latest values per symbol into a fixed-layout shared memory segment; a
+trader process runs the engines on top of it. Exit checks in the trader
+then read a price out of shared memory instead of waiting behind (or
+competing with) the scan, and nothing is pickled between the two.
+
+Layout, all little-endian and 8-byte aligned:
+
+    header   magic, version, symbol count, field count
+    fields   field names, 32 bytes each
+    symbols  symbol names, 32 bytes each
+    records  per symbol: a uint64 sequence number, then one float64 per field
+
+Each record is guarded by a seqlock. The single writer makes the sequence
+odd, stores the fields and makes it even again; readers retry while it is
+odd or changed under them. Missing values are stored as NaN.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import struct
+from array import array
+from datetime import datetime, timezone
+from decimal import Decimal
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterable, Sequence
+
+import structlog
+
+from core.models import MarketSnapshot
+from market.freshness import FreshnessMonitor
+from market.orderbook import OrderBookManager
+
+logger = structlog.get_logger()
+
+MAGIC = b"MKTSTATE"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIII")
+_HEADER_SIZE = 32
+_NAME_SIZE = 32
+
+# Snapshot fields, in MarketSnapshot order
+SNAPSHOT_FIELDS = ("price", "ema_9", "ema_21", "vwap", "volume_ratio", "spread_pct")
+
+BASE_FIELDS = SNAPSHOT_FIELDS + (
+    "timestamp_ms",
+    # Top of the local order book, NaN without one
+    "bid", "bid_qty", "ask", "ask_qty",
+    # Freshness inputs, see market.freshness
+    "event_ms", "received_ms", "horizon_ms",
+)
+
+# Read attempts before a record being rewritten continuously is skipped
+READ_RETRIES = 100
+
+_NAN = float("nan")
+
+
+def _encode_name(name: str) -> bytes:
+    data = name.encode()
+    if len(data) >= _NAME_SIZE:
+        raise ValueError(f"Name too long for shared market state: {name!r}")
+    return data.ljust(_NAME_SIZE, b"\0")
+
+
+def _decode_name(data: bytes) -> str:
+    return data.rstrip(b"\0").decode()
+
+
+def _to_float(value: Any) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _to_decimal(value: float) -> Decimal | None:
+    # repr() is the shortest string that round-trips, so exchange prices
+    # such as 0.00001234 come back exactly
+    return None if math.isnan(value) else Decimal(repr(value))
+
+
+class SharedMarketState:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+
+        magic, version, n_symbols, n_fields = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name} is not a version {VERSION} market state segment")
+
+        offset = _HEADER_SIZE
+        self.fields = [
+            _decode_name(bytes(shm.buf[offset + i * _NAME_SIZE:offset + (i + 1) * _NAME_SIZE]))
+            for i in range(n_fields)
+        ]
+        offset += n_fields * _NAME_SIZE
+        self.symbols = [
+            _decode_name(bytes(shm.buf[offset + i * _NAME_SIZE:offset + (i + 1) * _NAME_SIZE]))
+            for i in range(n_symbols)
+        ]
+        offset += n_symbols * _NAME_SIZE
+
+        self._stride = 1 + n_fields
+        self._index = {symbol: i * self._stride for i, symbol in enumerate(self.symbols)}
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self.indicators = self.fields[len(BASE_FIELDS):]
+
+        records = shm.buf[offset:offset + n_symbols * self._stride * 8]
+        self._seqs = records.cast("Q")
+        self._values = records.cast("d")
+
+    @staticmethod
+    def size(n_symbols: int, n_fields: int) -> int:
+        return (
+            _HEADER_SIZE
+            + (n_fields + n_symbols) * _NAME_SIZE
+            + n_symbols * (1 + n_fields) * 8
+        )
+
+    @classmethod
+    def create(
+        cls, name: str, symbols: Iterable[str], indicators: Iterable[str] = ()
+    ) -> "SharedMarketState":
+        """
+        Create the segment; one left behind by a crashed scanner is replaced.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        fields = list(BASE_FIELDS) + [i for i in dict.fromkeys(indicators) if i not in BASE_FIELDS]
+        size = cls.size(len(symbols), len(fields))
+
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        buf = shm.buf
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, len(symbols), len(fields))
+        offset = _HEADER_SIZE
+        for name_ in fields + symbols:
+            buf[offset:offset + _NAME_SIZE] = _encode_name(name_)
+            offset += _NAME_SIZE
+
+        state = cls(shm, owner=True)
+        nan_record = array("d", [_NAN] * len(fields))
+        for base in state._index.values():
+            state._seqs[base] = 0
+            state._values[base + 1:base + state._stride] = nan_record
+        return state
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMarketState":
+        shm = shared_memory.SharedMemory(name=name)
+        # Before 3.13 attaching registers the segment with this process's
+        # resource tracker, which would unlink it when the reader exits.
+        # multiprocessing children share their parent's tracker instead.
+        if multiprocessing.parent_process() is None:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return cls(shm, owner=False)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def close(self) -> None:
+        self._seqs.release()
+        self._values.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    # ---- Writer side ----
+
+    def write(self, symbol: str, values: Sequence[float]) -> None:
+        """
+        Store a full record, in `fields` order. Single writer only.
+        """
+        base = self._index[symbol]
+        seqs = self._seqs
+        seqs[base] += 1
+        self._values[base + 1:base + self._stride] = array("d", values)
+        seqs[base] += 1
+
+    # ---- Reader side ----
+
+    def read(self, symbol: str) -> list[float] | None:
+        """
+        Consistent copy of a symbol's record, or None if it was never
+        written (or could not be read between writes).
+        """
+        base = self._index.get(symbol)
+        if base is None:
+            return None
+
+        seqs = self._seqs
+        for _ in range(READ_RETRIES):
+            before = seqs[base]
+            if before & 1:
+                continue
+            values = self._values[base + 1:base + self._stride].tolist()
+            if seqs[base] == before:
+                return values if before else None
+        return None
+
+    def value(self, symbol: str, name: str) -> float | None:
+        """
+        One field without copying the record, e.g. the price for an exit
+        check. Fields the segment does not carry read as None.
+        """
+        base = self._index.get(symbol)
+        if base is None:
+            return None
+
+        field = self._field_index.get(name)
+        if field is None:
+            return None
+        index = base + 1 + field
+        seqs = self._seqs
+        for _ in range(READ_RETRIES):
+            before = seqs[base]
+            if before & 1:
+                continue
+            value = self._values[index]
+            if seqs[base] == before:
+                return None if before == 0 or math.isnan(value) else value
+        return None
+
+    def version(self, symbol: str) -> int:
+        """
+        Number of completed writes for a symbol.
+        """
+        base = self._index.get(symbol)
+        return 0 if base is None else self._seqs[base] // 2
+
+    def resolve(self, name: str, snapshot: MarketSnapshot) -> Any:
+        # RuleSet.evaluate resolver signature; indicators are published by
+        # the scanner, see MarketStatePublisher
+        value = self.value(snapshot.symbol, name)
+        return None if value is None else Decimal(repr(value))
+
+
+class MarketStatePublisher:
+    """
+    Scanner side: wraps a market data source and writes every snapshot it
+    returns, plus book tops and published indicators, into the segment.
+    """
+
+    def __init__(
+        self,
+        state: SharedMarketState,
+        market_data: Any,
+        order_books: OrderBookManager | None = None,
+        freshness: FreshnessMonitor | None = None,
+        indicators=None,
+    ) -> None:
+        self._state = state
+        self._market_data = market_data
+        self._order_books = order_books
+        self._freshness = freshness
+        # Optional market.indicator_registry.IndicatorSet, computed here so
+        # the trader never has to
+        self._indicators = indicators if state.indicators else None
+        self.published = 0
+
+    async def get_snapshots(self, symbols: Iterable[str]) -> list[MarketSnapshot]:
+        snapshots = await self._market_data.get_snapshots(symbols)
+        self.publish(snapshots)
+        return snapshots
+
+    def publish(self, snapshots: Iterable[MarketSnapshot]) -> None:
+        for snapshot in snapshots:
+            if snapshot.symbol in self._state:
+                self._state.write(snapshot.symbol, self._record(snapshot))
+                self.published += 1
+
+    def _record(self, snapshot: MarketSnapshot) -> list[float]:
+        symbol = snapshot.symbol
+        values = [float(getattr(snapshot, name)) for name in SNAPSHOT_FIELDS]
+        values.append(snapshot.timestamp.timestamp() * 1000)
+
+        book = self._order_books.book(symbol) if self._order_books else None
+        bid = book.bids.best() if book is not None else None
+        ask = book.asks.best() if book is not None else None
+        values.extend(bid or (_NAN, _NAN))
+        values.extend(ask or (_NAN, _NAN))
+
+        entry = self._freshness.entry(symbol) if self._freshness else None
+        if entry is not None:
+            values.extend((
+                _to_float(entry.event_ms), _to_float(entry.received_ms), float(entry.horizon_ms)
+            ))
+        else:
+            values.extend((_NAN, _NAN, _NAN))
+
+        for name in self._state.indicators:
+            values.append(
+                _to_float(self._indicators.value(symbol, name)) if self._indicators else _NAN
+            )
+        return values
+
+    async def run(self, symbols: Iterable[str], interval_seconds: float = 2.0) -> None:
+        symbols = list(symbols)
+        logger.info("market_state.publishing", symbols=len(symbols), fields=len(self._state.fields))
+
+        while True:
+            try:
+                await self.get_snapshots(symbols)
+            except Exception as exc:
+                logger.exception("market_state.publish_failed", error=str(exc))
+            await asyncio.sleep(interval_seconds)
+
+
+class SharedMarketData:
+    """
+    Trader side: drop-in for DirectMarketData that reads the published
+    state, so engines never fetch or compute market data themselves.
+    """
+
+    def __init__(
+        self,
+        state: SharedMarketState,
+        freshness: FreshnessMonitor | None = None,
+    ) -> None:
+        self._state = state
+        # Fed from the scanner's event and receive times, so staleness
+        # still reflects the exchange data rather than the segment
+        self._freshness = freshness
+        self._index = {name: i for i, name in enumerate(state.fields)}
+
+    def _snapshot(self, symbol: str, values: list[float]) -> MarketSnapshot | None:
+        decimals = [_to_decimal(values[i]) for i in range(len(SNAPSHOT_FIELDS))]
+        if any(d is None for d in decimals):
+            return None
+        timestamp_ms = values[self._index["timestamp_ms"]]
+        return MarketSnapshot(
+            symbol,
+            *decimals,
+            timestamp=datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc),
+        )
+
+    async def get_snapshots(self, symbols: Iterable[str]) -> list[MarketSnapshot]:
+        snapshots: list[MarketSnapshot] = []
+        for symbol in symbols:
+            values = self._state.read(symbol)
+            if values is None:
+                continue
+            snapshot = self._snapshot(symbol, values)
+            if snapshot is None:
+                continue
+
+            if self._freshness is not None:
+                event_ms = values[self._index["event_ms"]]
+                received_ms = values[self._index["received_ms"]]
+                if not math.isnan(event_ms) and not math.isnan(received_ms):
+                    self._freshness.record(
+                        symbol,
+                        int(event_ms),
+                        int(received_ms),
+                        int(values[self._index["horizon_ms"]]),
+                    )
+            snapshots.append(snapshot)
+        return snapshots
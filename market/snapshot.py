@@ -1,17 +1,22 @@
-from decimal import Decimal
 from datetime import datetime, timezone
+from decimal import Decimal
 
 from core.models import MarketSnapshot
 from market.indicators import ema, vwap
+from market.klines import KlineArray
+
+# Candles the indicators look at, matching BinanceFetcher.fetch_klines
+KLINE_WINDOW = 21
 
 
 def build_snapshot(
-    symbol: str,
-    klines: list[list],
-    ticker: dict,
+    symbol: str, klines: KlineArray, ticker: dict, event_time_ms: int
 ) -> MarketSnapshot:
-    closes = [Decimal(k[4]) for k in klines]
-    volumes = [Decimal(k[5]) for k in klines]
+    """
+    Snapshot stamped with `event_time_ms`, the exchange time of the data.
+    """
+    closes = klines.decimals("close", KLINE_WINDOW)
+    volumes = klines.decimals("volume", KLINE_WINDOW)
 
     ema_9 = ema(closes[-9:], 9)
     ema_21 = ema(closes, 21)
@@ -33,5 +38,5 @@ def build_snapshot(
         vwap=vwap_value,
         volume_ratio=volume_ratio,
         spread_pct=spread_pct,
-        timestamp=datetime.now(timezone.utc),
+        timestamp=datetime.fromtimestamp(event_time_ms / 1000, timezone.utc),
     )
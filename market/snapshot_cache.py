@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from core.clock import Clock, get_clock
+from core.models import MarketSnapshot
+from market.klines import KlineArray
+from market.snapshot import KLINE_WINDOW, build_snapshot
+
+# Loads (klines, ticker, exchange event time in ms) for one symbol
+Loader = Callable[[], Awaitable[tuple[KlineArray, dict, int]]]
+
+
+def candle_key(klines: KlineArray) -> tuple:
+    # Window start plus the full OHLCV of the forming candle
+    return klines.open_time[-min(len(klines), KLINE_WINDOW)], klines[-1][:6]
+
+
+def ticker_key(ticker: dict[str, Any]) -> tuple:
+    return ticker["bidPrice"], ticker["askPrice"]
+
+
+@dataclass
+class _Entry:
+    snapshot: MarketSnapshot
+    candle: tuple
+    ticker: tuple
+    fetched_at: float
+
+
+class SnapshotCache:
+    """
+    Per-symbol snapshot cache with a freshness TTL and single-flight loads.
+
+    Concurrent callers for the same symbol share one in-flight fetch. When
+    a refetch returns the same candle and top of book as last time, the
+    previous snapshot is reused instead of rebuilding the indicators.
+    """
+
+    def __init__(self, ttl_seconds: float = 1.0, clock: Clock | None = None) -> None:
+        self._ttl = ttl_seconds
+        self._clock = clock or get_clock()
+        self._entries: dict[str, _Entry] = {}
+        self._inflight: dict[str, asyncio.Future[MarketSnapshot]] = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.rebuilds_skipped = 0
+
+    def peek(self, symbol: str) -> MarketSnapshot | None:
+        entry = self._entries.get(symbol)
+        return entry.snapshot if entry else None
+
+    async def get(self, symbol: str, loader: Loader) -> MarketSnapshot:
+        entry = self._entries.get(symbol)
+        if entry is not None and self._clock.monotonic() - entry.fetched_at < self._ttl:
+            self.hits += 1
+            return entry.snapshot
+
+        pending = self._inflight.get(symbol)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            # The load runs as its own task so cancelling the caller that
+            # started it does not fail everyone coalesced onto it
+            pending = asyncio.ensure_future(self._load(symbol, loader))
+            self._inflight[symbol] = pending
+            pending.add_done_callback(lambda task: self._loaded(symbol, task))
+
+        # shield: one waiter being cancelled must not cancel the fetch
+        return await asyncio.shield(pending)
+
+    def _loaded(self, symbol: str, task: asyncio.Future[MarketSnapshot]) -> None:
+        if self._inflight.get(symbol) is task:
+            del self._inflight[symbol]
+        # Mark retrieved so a failure nobody awaited is not logged by asyncio
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, symbol: str, loader: Loader) -> MarketSnapshot:
+        klines, ticker, event_time_ms = await loader()
+        candle = candle_key(klines)
+        top = ticker_key(ticker)
+
+        previous = self._entries.get(symbol)
+        if previous is not None and previous.candle == candle and previous.ticker == top:
+            self.rebuilds_skipped += 1
+            snapshot = replace(
+                previous.snapshot,
+                timestamp=datetime.fromtimestamp(event_time_ms / 1000, timezone.utc),
+            )
+        else:
+            snapshot = build_snapshot(symbol, klines, ticker, event_time_ms)
+
+        self._entries[symbol] = _Entry(
+            snapshot=snapshot,
+            candle=candle,
+            ticker=top,
+            fetched_at=self._clock.monotonic(),
+        )
+        return snapshot
@@ -0,0 +1,58 @@
+"""
+Higher-timeframe values for entry rules.
+
+Bars come from KlineStore's resamplers, so a 5m or 15m filter costs no
+extra REST calls. Each timeframe adds the rule fields ``close_<tf>``,
+``ema_9_<tf>``, ``ema_21_<tf>`` and ``volume_<tf>``, e.g.::
+
+    ema_9_15m >= ema_21_15m
+    price >= close_5m * 0.998
+
+Symbols without enough bars yet get None, which fails any rule using it.
+"""
+
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+from core.models import MarketSnapshot
+from market.indicators import ema
+from market.klines import KlineStore
+
+TIMEFRAME_FIELDS = ("close", "ema_9", "ema_21", "volume")
+
+# Bars needed before the fields of a timeframe are defined
+MIN_BARS = 21
+
+
+def timeframe_fields(timeframes: Iterable[str]) -> list[str]:
+    return [f"{name}_{tf}" for tf in timeframes for name in TIMEFRAME_FIELDS]
+
+
+def timeframe_columns(
+    history: KlineStore,
+    snapshots: Sequence[MarketSnapshot],
+    timeframes: Iterable[str] | None = None,
+) -> dict[str, list[Decimal | None]]:
+    """
+    Rule columns for every timeframe, aligned with `snapshots`.
+    """
+    timeframes = list(history.timeframes if timeframes is None else timeframes)
+    columns: dict[str, list[Decimal | None]] = {
+        name: [] for name in timeframe_fields(timeframes)
+    }
+
+    for snapshot in snapshots:
+        for tf in timeframes:
+            bars = history.get(snapshot.symbol, tf)
+            if bars is None or len(bars) < MIN_BARS:
+                for name in TIMEFRAME_FIELDS:
+                    columns[f"{name}_{tf}"].append(None)
+                continue
+
+            closes = bars.decimals("close", MIN_BARS)
+            columns[f"close_{tf}"].append(closes[-1])
+            columns[f"ema_9_{tf}"].append(ema(closes[-9:], 9))
+            columns[f"ema_21_{tf}"].append(ema(closes, 21))
+            columns[f"volume_{tf}"].append(bars.decimals("volume", 1)[0])
+
+    return columns
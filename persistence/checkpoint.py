@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+CHECKPOINT_VERSION = 1
+
+
+class StateCheckpoint:
+    """
+    Compact JSON checkpoint of the engine state.
+
+    Writes go to a temporary file in the same directory which is then
+    renamed over the previous checkpoint, so a crash mid-write never
+    leaves a truncated file behind.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._lock = asyncio.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> dict[str, Any] | None:
+        """
+        Read the last checkpoint.
+
+        Returns:
+            Checkpoint payload, or None if missing, unreadable or from
+            an incompatible version
+        """
+        try:
+            with self._path.open("rb") as fh:
+                data = json.loads(fh.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("checkpoint.load_failed", path=str(self._path), error=str(exc))
+            return None
+
+        if data.get("version") != CHECKPOINT_VERSION:
+            logger.warning("checkpoint.version_mismatch", version=data.get("version"))
+            return None
+
+        return data
+
+    def write(self, state: dict[str, Any]) -> None:
+        """
+        Atomically replace the checkpoint with `state`.
+
+        Args:
+            state: JSON-serializable engine state
+        """
+        payload = json.dumps(
+            {"version": CHECKPOINT_VERSION, **state},
+            separators=(",", ":"),
+        ).encode()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+
+        with tmp_path.open("wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        os.replace(tmp_path, self._path)
+
+    async def save(self, state: dict[str, Any]) -> None:
+        # fsync can take milliseconds, keep it off the event loop
+        async with self._lock:
+            await asyncio.to_thread(self.write, state)
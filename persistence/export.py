@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Export trade and decision history to partitioned columnar files.
+
+    exports/
+        trades/month=2024-05/part-20240601T000000.parquet
+        bot_events/day=2024-05-31/part-20240601T000000.parquet
+        _export_state.json
+
+LOCAL databases are streamed with binary COPY and decoded chunk by chunk;
+Supabase is paged through the REST API. Either way rows are written out in
+row groups of `batch_rows` as they arrive, so memory stays flat however
+large the tables are.
+
+Each table is exported in order of its time column (trades by closed_at,
+since a trade is only stored once it closes). The last timestamp written
+is recorded in _export_state.json as each partition file is finished, and
+the next run resumes after it. Rows newer than `settle_seconds` are left
+for the next run so late inserts with an older timestamp are not skipped.
+
+Parquet needs pyarrow; without it, gzipped CSV is written in the same
+layout.
+
+Usage:
+    python -m persistence.export --out exports
+    python -m persistence.export --tables trades --format csv --full
+"""
+
+import argparse
+import asyncio
+import csv
+import gzip
+import importlib.util
+import json
+import os
+import struct
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import structlog
+
+logger = structlog.get_logger()
+
+STATE_FILE = "_export_state.json"
+
+# Exported up to here on the first run or with --full
+EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    name: str
+    # (column, Postgres type) in export order
+    columns: tuple[tuple[str, str], ...]
+    key: str
+    time_column: str
+    # "month" or "day"
+    partition: str
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+
+TABLES = {
+    "trades": ExportTable(
+        "trades",
+        (
+            ("trade_id", "uuid"),
+            ("symbol", "text"),
+            ("entry_price", "numeric"),
+            ("exit_price", "numeric"),
+            ("quantity", "numeric"),
+            ("pnl", "numeric"),
+            ("opened_at", "timestamp"),
+            ("closed_at", "timestamp"),
+        ),
+        key="trade_id",
+        time_column="closed_at",
+        partition="month",
+    ),
+    "decisions": ExportTable(
+        "decisions",
+        (
+            ("id", "uuid"),
+            ("symbol", "text"),
+            ("decision", "text"),
+            ("reason", "text"),
+            ("created_at", "timestamp"),
+        ),
+        key="id",
+        time_column="created_at",
+        partition="day",
+    ),
+    "bot_events": ExportTable(
+        "bot_events",
+        (
+            ("id", "uuid"),
+            ("event_type", "text"),
+            ("message", "text"),
+            ("created_at", "timestamp"),
+        ),
+        key="id",
+        time_column="created_at",
+        partition="day",
+    ),
+}
+
+
+# ---- Binary COPY decoding ----
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_PG_EPOCH = datetime(2000, 1, 1)
+
+_NUMERIC_NEG = 0x4000
+_NUMERIC_NAN = 0xC000
+
+
+def _decode_numeric(data: bytes) -> Decimal:
+    ndigits, weight, sign, dscale = struct.unpack_from("!hhHh", data)
+    if sign == _NUMERIC_NAN:
+        return Decimal("NaN")
+    digits = struct.unpack_from(f"!{ndigits}H", data, 8)
+
+    # Base-10000 digits, the first one worth 10000**weight, shown with
+    # `dscale` decimal places (any digits dropped or added are zeros)
+    value = int("".join(f"{d:04d}" for d in digits) or "0")
+    exponent = (weight - ndigits + 1) * 4
+    if exponent < -dscale:
+        value //= 10 ** (-dscale - exponent)
+    else:
+        value *= 10 ** (exponent + dscale)
+    # Built from a string so the context precision never rounds it
+    return Decimal(f"{'-' if sign == _NUMERIC_NEG else ''}{value}E-{dscale}")
+
+
+def _decode_timestamp(data: bytes) -> datetime:
+    (micros,) = struct.unpack("!q", data)
+    return _PG_EPOCH + timedelta(microseconds=micros)
+
+
+_DECODERS: dict[str, Callable[[bytes], Any]] = {
+    "uuid": lambda data: str(uuid.UUID(bytes=data)),
+    "text": lambda data: data.decode(),
+    "numeric": _decode_numeric,
+    "timestamp": _decode_timestamp,
+    "int4": lambda data: struct.unpack("!i", data)[0],
+    "int8": lambda data: struct.unpack("!q", data)[0],
+}
+
+
+class CopyBinaryDecoder:
+    """
+    Incremental decoder for COPY ... (FORMAT binary) output.
+
+    Chunks may split tuples anywhere; only the unparsed tail is buffered.
+    """
+
+    def __init__(self, types: Iterable[str]) -> None:
+        self._decoders = [_DECODERS[t] for t in types]
+        self._buffer = bytearray()
+        self._header_done = False
+        self.finished = False
+
+    def feed(self, chunk: bytes) -> list[tuple]:
+        self._buffer += chunk
+        buf = self._buffer
+        pos = 0
+
+        if not self._header_done:
+            if len(buf) < 19:
+                return []
+            if bytes(buf[:11]) != _COPY_SIGNATURE:
+                raise ValueError("Not a binary COPY stream")
+            (extension,) = struct.unpack_from("!i", buf, 15)
+            if len(buf) < 19 + extension:
+                return []
+            pos = 19 + extension
+            self._header_done = True
+
+        rows: list[tuple] = []
+        while len(buf) - pos >= 2:
+            (count,) = struct.unpack_from("!h", buf, pos)
+            if count == -1:
+                self.finished = True
+                pos += 2
+                break
+
+            # Walk the fields first; decode only once the tuple is complete
+            cursor = pos + 2
+            spans: list[tuple[int, int] | None] = []
+            for _ in range(count):
+                if len(buf) - cursor < 4:
+                    break
+                (size,) = struct.unpack_from("!i", buf, cursor)
+                cursor += 4
+                if size == -1:
+                    spans.append(None)
+                    continue
+                if len(buf) - cursor < size:
+                    break
+                spans.append((cursor, cursor + size))
+                cursor += size
+            if len(spans) < count:
+                break
+
+            rows.append(tuple(
+                None if span is None else decode(bytes(buf[span[0]:span[1]]))
+                for decode, span in zip(self._decoders, spans)
+            ))
+            pos = cursor
+
+        del buf[:pos]
+        return rows
+
+
+# ---- Writers ----
+
+def partition_key(value: datetime, partition: str) -> str:
+    return value.strftime("%Y-%m" if partition == "month" else "%Y-%m-%d")
+
+
+class _PartFile(ABC):
+    """
+    One part file of one partition, written under a temporary name and
+    renamed into place on close so a crashed run leaves no partial parts.
+    """
+
+    suffix = ""
+
+    def __init__(self, path: Path, table: ExportTable) -> None:
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.table = table
+        self.rows = 0
+
+    @abstractmethod
+    def write(self, rows: list[tuple]) -> None:
+        ...
+
+    @abstractmethod
+    def _finish(self) -> None:
+        ...
+
+    def close(self) -> None:
+        self._finish()
+        os.replace(self.tmp, self.path)
+
+
+class _ParquetPart(_PartFile):
+    suffix = ".parquet"
+
+    def __init__(self, path: Path, table: ExportTable) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, table)
+        types = {
+            "uuid": pa.string(),
+            "text": pa.string(),
+            # Decimal scales vary per row; doubles are what research reads
+            "numeric": pa.float64(),
+            "timestamp": pa.timestamp("us"),
+            "int4": pa.int32(),
+            "int8": pa.int64(),
+        }
+        self._pa = pa
+        self._schema = pa.schema([(name, types[t]) for name, t in table.columns])
+        self._numeric = [t == "numeric" for _, t in table.columns]
+        self._writer = pq.ParquetWriter(self.tmp, self._schema, compression="zstd")
+
+    def write(self, rows: list[tuple]) -> None:
+        columns = [
+            [
+                (float(v) if numeric and v is not None else v)
+                for v in (row[i] for row in rows)
+            ]
+            for i, numeric in enumerate(self._numeric)
+        ]
+        self._writer.write_table(
+            self._pa.Table.from_arrays(
+                [self._pa.array(c, type=f.type) for c, f in zip(columns, self._schema)],
+                schema=self._schema,
+            )
+        )
+        self.rows += len(rows)
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+class _CsvPart(_PartFile):
+    suffix = ".csv.gz"
+
+    def __init__(self, path: Path, table: ExportTable) -> None:
+        super().__init__(path, table)
+        self._fh = gzip.open(self.tmp, "wt", newline="")
+        self._csv = csv.writer(self._fh)
+        self._csv.writerow(table.column_names)
+
+    def write(self, rows: list[tuple]) -> None:
+        self._csv.writerows(
+            [v.isoformat() if isinstance(v, datetime) else v for v in row] for row in rows
+        )
+        self.rows += len(rows)
+
+    def _finish(self) -> None:
+        self._fh.close()
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class TableExporter:
+    """
+    Splits a time-ordered row stream into partition part files, buffering
+    at most `batch_rows` rows, and advances the watermark as parts close.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        table: ExportTable,
+        run_id: str,
+        part_type: type[_PartFile],
+        batch_rows: int,
+        on_watermark: Callable[[datetime], None],
+    ) -> None:
+        self._out = out_dir / table.name
+        self._table = table
+        self._run_id = run_id
+        self._part_type = part_type
+        self._batch_rows = batch_rows
+        self._on_watermark = on_watermark
+        self._time_index = table.column_names.index(table.time_column)
+
+        self._key: str | None = None
+        self._part: _PartFile | None = None
+        self._pending: list[tuple] = []
+        self._last: datetime | None = None
+        self.rows = 0
+        self.files = 0
+
+    def write(self, rows: Iterable[tuple]) -> None:
+        for row in rows:
+            key = partition_key(row[self._time_index], self._table.partition)
+            if key != self._key:
+                self._close_part()
+                self._key = key
+            self._pending.append(row)
+            self._last = row[self._time_index]
+            if len(self._pending) >= self._batch_rows:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if self._part is None:
+            directory = self._out / f"{self._table.partition}={self._key}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"part-{self._run_id}{self._part_type.suffix}"
+            self._part = self._part_type(path, self._table)
+        self._part.write(self._pending)
+        self.rows += len(self._pending)
+        self._pending = []
+
+    def _close_part(self) -> None:
+        self._flush()
+        if self._part is None:
+            return
+        self._part.close()
+        self._part = None
+        self.files += 1
+        # Rows arrive in time order, so everything up to here is on disk
+        if self._last is not None:
+            self._on_watermark(self._last)
+
+    def close(self) -> None:
+        self._close_part()
+
+
+# ---- Sources ----
+
+async def copy_local(
+    dsn: str,
+    table: ExportTable,
+    since: datetime,
+    until: datetime,
+    sink: Callable[[list[tuple]], None],
+) -> None:
+    import asyncpg
+
+    decoder = CopyBinaryDecoder(t for _, t in table.columns)
+
+    async def receive(chunk: bytes) -> None:
+        rows = decoder.feed(chunk)
+        if rows:
+            sink(rows)
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.copy_from_query(
+            f"SELECT {', '.join(table.column_names)} FROM {table.name} "
+            f"WHERE {table.time_column} > $1 AND {table.time_column} < $2 "
+            f"ORDER BY {table.time_column}, {table.key}",
+            since,
+            until,
+            output=receive,
+            format="binary",
+        )
+    finally:
+        await conn.close()
+
+
+def _from_json(value: Any, pg_type: str) -> Any:
+    if value is None:
+        return None
+    if pg_type == "numeric":
+        return Decimal(str(value))
+    if pg_type == "timestamp":
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    return value
+
+
+async def page_supabase(
+    client: Any,
+    table: ExportTable,
+    since: datetime,
+    until: datetime,
+    sink: Callable[[list[tuple]], None],
+    page_size: int = 1000,
+) -> None:
+    # Offset paging is stable here: the window is closed at both ends and
+    # ordered by a unique key
+    offset = 0
+    while True:
+        result = (
+            client.table(table.name)
+            .select(",".join(table.column_names))
+            .gt(table.time_column, since.isoformat())
+            .lt(table.time_column, until.isoformat())
+            .order(table.time_column)
+            .order(table.key)
+            .range(offset, offset + page_size - 1)
+            .execute()
+        )
+        if result.data:
+            sink([
+                tuple(_from_json(item.get(name), t) for name, t in table.columns)
+                for item in result.data
+            ])
+        if len(result.data) < page_size:
+            return
+        offset += page_size
+
+
+# ---- Driver ----
+
+def load_state(out_dir: Path) -> dict[str, str]:
+    try:
+        return json.loads((out_dir / STATE_FILE).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(out_dir: Path, state: dict[str, str]) -> None:
+    path = out_dir / STATE_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+async def export(
+    out_dir: Path,
+    tables: Iterable[str],
+    fmt: str = "auto",
+    batch_rows: int = 50_000,
+    settle_seconds: float = 60.0,
+    full: bool = False,
+) -> dict[str, dict[str, Any]]:
+    from config.settings import get_settings
+    from core.clock import utc_now
+
+    settings = get_settings()
+
+    if fmt == "auto":
+        fmt = "parquet" if parquet_available() else "csv"
+        if fmt == "csv":
+            logger.warning("export.pyarrow_missing", fallback="csv.gz")
+    part_type: type[_PartFile] = _ParquetPart if fmt == "parquet" else _CsvPart
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state = {} if full else load_state(out_dir)
+    until = utc_now().replace(tzinfo=None) - timedelta(seconds=settle_seconds)
+    run_id = until.strftime("%Y%m%dT%H%M%S")
+
+    client = None
+    if settings.database_type == "SUPABASE":
+        from supabase import create_client
+
+        client = create_client(settings.supabase_url, settings.supabase_key)
+
+    report: dict[str, dict[str, Any]] = {}
+    for name in tables:
+        table = TABLES[name]
+        since = datetime.fromisoformat(state[name]) if name in state else EPOCH
+
+        def advance(watermark: datetime, name: str = name) -> None:
+            state[name] = watermark.isoformat()
+            save_state(out_dir, state)
+
+        exporter = TableExporter(out_dir, table, run_id, part_type, batch_rows, advance)
+        if client is not None:
+            await page_supabase(client, table, since, until, exporter.write)
+        else:
+            await copy_local(settings.database_url, table, since, until, exporter.write)
+        exporter.close()
+
+        report[name] = {
+            "since": since.isoformat(),
+            "until": state.get(name),
+            "rows": exporter.rows,
+            "files": exporter.files,
+        }
+        logger.info("export.table_done", table=name, **report[name])
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export history to partitioned columnar files")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument(
+        "--tables", type=lambda s: s.split(","), default=list(TABLES),
+        help="Comma separated subset of " + ",".join(TABLES),
+    )
+    parser.add_argument("--format", choices=["auto", "parquet", "csv"], default="auto")
+    parser.add_argument("--batch-rows", type=int, default=50_000, help="Rows per row group")
+    parser.add_argument(
+        "--settle-seconds", type=float, default=60.0,
+        help="Leave rows younger than this for the next run",
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Ignore the saved state and export everything (use a fresh --out)",
+    )
+    args = parser.parse_args()
+
+    unknown = set(args.tables) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(export(
+        Path(args.out), args.tables, args.format, args.batch_rows, args.settle_seconds, args.full,
+    ))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import timedelta
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class PartitionMaintainer:
+    """
+    Keeps the time-partitioned tables from init_database.py healthy: creates
+    upcoming trades/bot_events partitions ahead of time and rolls bot_events
+    older than the retention window up into bot_event_rollups before
+    dropping their partitions.
+
+    ensure_time_partitions moves rows the default partitions already hold
+    for a new range into it. Rows left in a default partition fall outside
+    every partition created so far (e.g. far-future timestamps) and are
+    reported with a warning.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        event_retention_days: int = 30,
+        interval_seconds: float = 3600.0,
+    ) -> None:
+        self._dsn = dsn
+        self._retention = timedelta(days=event_retention_days)
+        self._interval = interval_seconds
+
+    async def run_once(self) -> dict[str, int]:
+        import asyncpg
+
+        conn = await asyncpg.connect(self._dsn)
+        try:
+            trades = await conn.fetchval(
+                "SELECT ensure_time_partitions('trades', INTERVAL '1 month', 2)"
+            )
+            events = await conn.fetchval(
+                "SELECT ensure_time_partitions('bot_events', INTERVAL '1 day', 7)"
+            )
+            dropped = await conn.fetchval("SELECT rollup_old_events($1)", self._retention)
+            default_rows = {
+                table: await conn.fetchval(f"SELECT count(*) FROM {table}_default")
+                for table in ("trades", "bot_events")
+            }
+        finally:
+            await conn.close()
+
+        if any(default_rows.values()):
+            logger.warning("db.default_partition_rows", **default_rows)
+
+        return {
+            "trade_partitions_created": trades,
+            "event_partitions_created": events,
+            "event_partitions_dropped": dropped,
+            "trades_default_rows": default_rows["trades"],
+            "events_default_rows": default_rows["bot_events"],
+        }
+
+    async def run(self) -> None:
+        while True:
+            try:
+                logger.info("db.maintenance", **await self.run_once())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("db.maintenance_failed", error=str(exc))
+
+            await asyncio.sleep(self._interval)
@@ -1,5 +1,7 @@
+import json
 from uuid import uuid4
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from core.analytics import DailySummary
 from core.models import Trade
 from persistence.db import Database
 
@@ -30,6 +32,62 @@ class TradeRepository:
         finally:
             await self._db._pool.release(conn)
 
+    async def save_daily_summary(self, summary: DailySummary) -> None:
+        conn = await self._db.acquire()
+        try:
+            await conn.execute(
+                """
+                INSERT INTO daily_summaries (
+                    day, strategy, trades, wins, pnl, gross_profit,
+                    gross_loss, max_drawdown, per_symbol, updated_at
+                ) VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9::jsonb,$10)
+                ON CONFLICT (day, strategy) DO UPDATE SET
+                    trades = EXCLUDED.trades,
+                    wins = EXCLUDED.wins,
+                    pnl = EXCLUDED.pnl,
+                    gross_profit = EXCLUDED.gross_profit,
+                    gross_loss = EXCLUDED.gross_loss,
+                    max_drawdown = EXCLUDED.max_drawdown,
+                    per_symbol = EXCLUDED.per_symbol,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                summary.day,
+                summary.strategy,
+                summary.trades,
+                summary.wins,
+                summary.pnl,
+                summary.gross_profit,
+                summary.gross_loss,
+                summary.max_drawdown,
+                json.dumps({s: str(v) for s, v in summary.per_symbol.items()}),
+                datetime.now(timezone.utc),
+            )
+        finally:
+            await self._db._pool.release(conn)
+
+    async def get_daily_summary(self, day: date, strategy: str) -> DailySummary | None:
+        conn = await self._db.acquire()
+        try:
+            row = await conn.fetchrow(
+                """
+                SELECT day, strategy, trades, wins, pnl, gross_profit,
+                       gross_loss, max_drawdown, per_symbol::text AS per_symbol
+                FROM daily_summaries
+                WHERE day = $1 AND strategy = $2
+                """,
+                day,
+                strategy,
+            )
+        finally:
+            await self._db._pool.release(conn)
+
+        if row is None:
+            return None
+        return DailySummary.from_dict({
+            **{k: str(v) for k, v in dict(row).items()},
+            "per_symbol": json.loads(row["per_symbol"]),
+        })
+
 
 class EventRepository:
     def __init__(self, db: Database) -> None:
@@ -1,14 +1,19 @@
+-- Create trades table, partitioned by month of opened_at
 CREATE TABLE IF NOT EXISTS trades (
-    trade_id UUID PRIMARY KEY,
+    trade_id UUID NOT NULL,
     symbol TEXT NOT NULL,
     entry_price NUMERIC NOT NULL,
     exit_price NUMERIC,
     quantity NUMERIC NOT NULL,
     pnl NUMERIC,
     opened_at TIMESTAMP NOT NULL,
-    closed_at TIMESTAMP
-);
+    closed_at TIMESTAMP,
+    PRIMARY KEY (trade_id, opened_at)
+) PARTITION BY RANGE (opened_at);
+
+CREATE TABLE IF NOT EXISTS trades_default PARTITION OF trades DEFAULT;
 
+-- Create decisions table (optional, for future use)
 CREATE TABLE IF NOT EXISTS decisions (
     id UUID PRIMARY KEY,
     symbol TEXT,
@@ -17,9 +22,142 @@ CREATE TABLE IF NOT EXISTS decisions (
     created_at TIMESTAMP NOT NULL
 );
 
+-- Create bot_events table, partitioned by day of created_at
 CREATE TABLE IF NOT EXISTS bot_events (
-    id UUID PRIMARY KEY,
+    id UUID NOT NULL,
     event_type TEXT NOT NULL,
     message TEXT,
-    created_at TIMESTAMP NOT NULL
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS bot_events_default PARTITION OF bot_events DEFAULT;
+
+-- Per-day event counts kept after old bot_events partitions are dropped
+CREATE TABLE IF NOT EXISTS bot_event_rollups (
+    day DATE NOT NULL,
+    event_type TEXT NOT NULL,
+    events BIGINT NOT NULL,
+    first_at TIMESTAMP NOT NULL,
+    last_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (day, event_type)
 );
+
+-- Create daily_summaries table (one row per day and strategy, upserted
+-- as trades close)
+CREATE TABLE IF NOT EXISTS daily_summaries (
+    day DATE NOT NULL,
+    strategy TEXT NOT NULL,
+    trades INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    pnl NUMERIC NOT NULL,
+    gross_profit NUMERIC NOT NULL,
+    gross_loss NUMERIC NOT NULL,
+    max_drawdown NUMERIC NOT NULL,
+    per_symbol JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (day, strategy)
+);
+
+-- Create indexes for better query performance; BRIN for append-ordered
+-- time columns stays tiny no matter how many rows pile up
+CREATE INDEX IF NOT EXISTS idx_trades_opened_at_brin ON trades USING BRIN (opened_at);
+CREATE INDEX IF NOT EXISTS idx_trades_closed_at_brin ON trades USING BRIN (closed_at);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
+CREATE INDEX IF NOT EXISTS idx_events_created_at_brin ON bot_events USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_events_type ON bot_events(event_type);
+
+-- Create partitions of `parent` from the current period to `ahead`
+-- periods out (or from `start_at`); returns how many were created
+CREATE OR REPLACE FUNCTION ensure_time_partitions(
+    parent TEXT,
+    step INTERVAL,
+    ahead INTEGER,
+    start_at TIMESTAMP DEFAULT NULL
+) RETURNS INTEGER AS $$
+DECLARE
+    unit TEXT := CASE WHEN step >= INTERVAL '1 month' THEN 'month' ELSE 'day' END;
+    fmt TEXT := CASE WHEN step >= INTERVAL '1 month' THEN 'YYYYMM' ELSE 'YYYYMMDD' END;
+    lower_bound TIMESTAMP := date_trunc(unit, COALESCE(start_at, now() AT TIME ZONE 'UTC'));
+    upper_bound TIMESTAMP;
+    part TEXT;
+    default_part TEXT := parent || '_default';
+    part_key TEXT := substring(pg_get_partkeydef(parent::regclass) FROM '\((.+)\)');
+    moved_rows BIGINT;
+    created INTEGER := 0;
+BEGIN
+    WHILE lower_bound <= date_trunc(unit, now() AT TIME ZONE 'UTC') + step * ahead LOOP
+        upper_bound := lower_bound + step;
+        part := format('%s_p%s', parent, to_char(lower_bound, fmt));
+        IF to_regclass(part) IS NULL THEN
+            -- Rows for this range already in the default partition would
+            -- make the CREATE fail; park them and move them in afterwards
+            EXECUTE format(
+                'CREATE TEMP TABLE partition_backlog AS '
+                || 'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) '
+                || 'SELECT * FROM moved',
+                default_part, part_key, lower_bound, part_key, upper_bound
+            );
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                part, parent, lower_bound, upper_bound
+            );
+            EXECUTE format('INSERT INTO %I SELECT * FROM partition_backlog', part);
+            GET DIAGNOSTICS moved_rows = ROW_COUNT;
+            DROP TABLE partition_backlog;
+            IF moved_rows > 0 THEN
+                RAISE NOTICE 'Moved % rows from % into %', moved_rows, default_part, part;
+            END IF;
+            created := created + 1;
+        END IF;
+        lower_bound := upper_bound;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Roll bot_events older than `retention` up into bot_event_rollups, then
+-- drop their partitions; returns how many partitions were dropped
+CREATE OR REPLACE FUNCTION rollup_old_events(retention INTERVAL) RETURNS INTEGER AS $$
+DECLARE
+    cutoff TIMESTAMP := date_trunc('day', now() AT TIME ZONE 'UTC' - retention);
+    rollup_sql TEXT := $q$
+        INSERT INTO bot_event_rollups (day, event_type, events, first_at, last_at)
+        SELECT created_at::date, event_type, count(*), min(created_at), max(created_at)
+        FROM %I
+        WHERE created_at < %L
+        GROUP BY 1, 2
+        ON CONFLICT (day, event_type) DO UPDATE SET
+            events = bot_event_rollups.events + EXCLUDED.events,
+            first_at = LEAST(bot_event_rollups.first_at, EXCLUDED.first_at),
+            last_at = GREATEST(bot_event_rollups.last_at, EXCLUDED.last_at)
+    $q$;
+    part RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname,
+               substring(pg_get_expr(c.relpartbound, c.oid) FROM 'TO \(''([^'']+)''\)')::timestamp
+                   AS upper_bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'bot_events'::regclass
+          AND c.relname <> 'bot_events_default'
+    LOOP
+        CONTINUE WHEN part.upper_bound > cutoff;
+        EXECUTE format(rollup_sql, part.relname, cutoff);
+        EXECUTE format('ALTER TABLE bot_events DETACH PARTITION %I', part.relname);
+        EXECUTE format('DROP TABLE %I', part.relname);
+        dropped := dropped + 1;
+    END LOOP;
+
+    -- Stragglers that landed in the default partition
+    EXECUTE format(rollup_sql, 'bot_events_default', cutoff);
+    DELETE FROM bot_events_default WHERE created_at < cutoff;
+
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_time_partitions('trades', INTERVAL '1 month', 2);
+SELECT ensure_time_partitions('bot_events', INTERVAL '1 day', 7);
@@ -1,8 +1,9 @@
 from uuid import uuid4
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from decimal import Decimal
 import structlog
 
+from core.analytics import DailySummary
 from core.models import Trade
 from persistence.supabase_db import SupabaseDatabase
 
@@ -123,6 +124,65 @@ class SupabaseTradeRepository:
             logger.error("supabase.trades.get_recent_failed", error=str(exc))
             raise
 
+    async def save_daily_summary(self, summary: DailySummary) -> None:
+        """
+        Upsert the materialized summary row for one day and strategy.
+
+        Args:
+            summary: Current aggregates for the day
+        """
+        client = self._db.get_client()
+
+        try:
+            data = {
+                **summary.to_dict(),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+            client.table("daily_summaries").upsert(
+                data, on_conflict="day,strategy"
+            ).execute()
+
+        except Exception as exc:
+            logger.error(
+                "supabase.daily_summary.save_failed",
+                day=summary.day.isoformat(),
+                error=str(exc),
+            )
+            raise
+
+    async def get_daily_summary(self, day: date, strategy: str) -> DailySummary | None:
+        """
+        Get the summary row for one day and strategy.
+
+        Args:
+            day: UTC trading day
+            strategy: Strategy name
+
+        Returns:
+            DailySummary or None if nothing closed that day
+        """
+        client = self._db.get_client()
+
+        try:
+            result = (
+                client.table("daily_summaries")
+                .select("*")
+                .eq("day", day.isoformat())
+                .eq("strategy", strategy)
+                .execute()
+            )
+
+            if not result.data:
+                return None
+            return DailySummary.from_dict(
+                {k: str(v) if k != "per_symbol" else v for k, v in result.data[0].items()}
+            )
+
+        except Exception as exc:
+            logger.error("supabase.daily_summary.get_failed", error=str(exc))
+            raise
+
 
 class SupabaseEventRepository:
     """
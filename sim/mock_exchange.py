@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Binance spot order endpoints.
+
+Implements enough of the signed REST API for BinanceWallet to run end to
+end: MARKET orders, OCO order lists, order/account queries and exchange
+info. Prices are set through POST /mock/price, which also triggers any OCO
+leg the new price crosses.
+
+Usage:
+    python -m sim.mock_exchange --port 8900 --api-key test --api-secret test
+"""
+
+import argparse
+import hashlib
+import hmac
+import itertools
+import time
+from decimal import Decimal
+from typing import Any
+
+from aiohttp import web
+
+COMMISSION_RATE = Decimal("0.001")
+
+# Decimal order fields; like Binance, exponent notation is refused
+DECIMAL_PARAMS = ("quantity", "abovePrice", "belowPrice", "belowStopPrice")
+
+
+def _error(status: int, code: int, msg: str) -> web.Response:
+    return web.json_response({"code": code, "msg": msg}, status=status)
+
+
+class MockExchange:
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        prices: dict[str, Decimal] | None = None,
+        tick_size: str = "0.01",
+        step_size: str = "0.00001",
+    ) -> None:
+        self._api_key = api_key
+        self._secret = api_secret.encode()
+        self._tick_size = tick_size
+        self._step_size = step_size
+        self.prices: dict[str, Decimal] = dict(prices or {})
+        self.balances: dict[str, Decimal] = {"USDT": Decimal("1000")}
+        self.orders: dict[int, dict[str, Any]] = {}
+        self.order_lists: dict[int, dict[str, Any]] = {}
+        self.trades: dict[int, list[dict[str, Any]]] = {}
+        self._ids = itertools.count(1)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v3/time", self._time)
+        app.router.add_get("/api/v3/exchangeInfo", self._exchange_info)
+        app.router.add_get("/api/v3/account", self._signed(self._account))
+        app.router.add_post("/api/v3/order", self._signed(self._new_order))
+        app.router.add_get("/api/v3/order", self._signed(self._get_order))
+        app.router.add_get("/api/v3/myTrades", self._signed(self._my_trades))
+        app.router.add_post("/api/v3/orderList/oco", self._signed(self._new_oco))
+        app.router.add_get("/api/v3/orderList", self._signed(self._get_order_list))
+        app.router.add_delete("/api/v3/orderList", self._signed(self._cancel_order_list))
+        app.router.add_post("/mock/price", self._set_price)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, str]:
+        """
+        Serve in the current event loop.
+
+        Returns:
+            The runner (call `cleanup()` to stop) and the base URL
+        """
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://{host}:{bound_port}"
+
+    def set_price(self, symbol: str, price: Decimal) -> None:
+        self.prices[symbol] = price
+        self._trigger_oco(symbol, price)
+
+    # ---- Handlers ----
+
+    async def _time(self, request: web.Request) -> web.Response:
+        return web.json_response({"serverTime": int(time.time() * 1000)})
+
+    async def _exchange_info(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        return web.json_response({
+            "symbols": [{
+                "symbol": symbol,
+                "baseAsset": symbol.removesuffix("USDT"),
+                "quoteAsset": "USDT",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": self._tick_size},
+                    {"filterType": "LOT_SIZE", "stepSize": self._step_size},
+                ],
+            }],
+        })
+
+    async def _account(self, params: dict[str, str]) -> web.Response:
+        return web.json_response({
+            "balances": [
+                {"asset": asset, "free": str(amount), "locked": "0"}
+                for asset, amount in self.balances.items()
+            ],
+        })
+
+    async def _new_order(self, params: dict[str, str]) -> web.Response:
+        symbol = params["symbol"]
+        if params.get("type") != "MARKET":
+            return _error(400, -1116, "Only MARKET orders are mocked")
+        if symbol not in self.prices:
+            return _error(400, -1121, "Invalid symbol.")
+
+        order = self._fill_market(symbol, params["side"], Decimal(params["quantity"]))
+        order["clientOrderId"] = params.get("newClientOrderId", "")
+        return web.json_response({**order, "fills": self.trades[order["orderId"]]})
+
+    async def _get_order(self, params: dict[str, str]) -> web.Response:
+        order = self.orders.get(int(params["orderId"]))
+        if order is None:
+            return _error(400, -2013, "Order does not exist.")
+        return web.json_response(order)
+
+    async def _my_trades(self, params: dict[str, str]) -> web.Response:
+        return web.json_response(self.trades.get(int(params["orderId"]), []))
+
+    async def _new_oco(self, params: dict[str, str]) -> web.Response:
+        symbol = params["symbol"]
+        quantity = Decimal(params["quantity"])
+        list_id = next(self._ids)
+
+        legs = []
+        for prefix, order_type in (("above", params["aboveType"]), ("below", params["belowType"])):
+            order_id = next(self._ids)
+            self.orders[order_id] = {
+                "symbol": symbol,
+                "orderId": order_id,
+                "orderListId": list_id,
+                "side": params["side"],
+                "type": order_type,
+                "price": params[f"{prefix}Price"],
+                "stopPrice": params.get(f"{prefix}StopPrice", "0"),
+                "origQty": str(quantity),
+                "executedQty": "0",
+                "cummulativeQuoteQty": "0",
+                "status": "NEW",
+                "updateTime": int(time.time() * 1000),
+            }
+            legs.append({"symbol": symbol, "orderId": order_id})
+
+        self.order_lists[list_id] = {
+            "orderListId": list_id,
+            "symbol": symbol,
+            "listClientOrderId": params.get("listClientOrderId", ""),
+            "listStatusType": "EXEC_STARTED",
+            "listOrderStatus": "EXECUTING",
+            "transactionTime": int(time.time() * 1000),
+            "orders": legs,
+        }
+        return web.json_response(self.order_lists[list_id])
+
+    async def _get_order_list(self, params: dict[str, str]) -> web.Response:
+        order_list = self.order_lists.get(int(params["orderListId"]))
+        if order_list is None:
+            return _error(400, -2018, "Order list does not exist.")
+        return web.json_response(order_list)
+
+    async def _cancel_order_list(self, params: dict[str, str]) -> web.Response:
+        order_list = self.order_lists.get(int(params["orderListId"]))
+        if order_list is None or order_list["listOrderStatus"] == "ALL_DONE":
+            return _error(400, -2011, "Unknown order sent.")
+
+        for leg in order_list["orders"]:
+            self.orders[leg["orderId"]]["status"] = "CANCELED"
+        order_list["listOrderStatus"] = "ALL_DONE"
+        order_list["listStatusType"] = "ALL_DONE"
+        return web.json_response(order_list)
+
+    async def _set_price(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.set_price(body["symbol"], Decimal(str(body["price"])))
+        return web.json_response({"ok": True})
+
+    # ---- Matching ----
+
+    def _fill_market(self, symbol: str, side: str, quantity: Decimal) -> dict[str, Any]:
+        price = self.prices[symbol]
+        order_id = next(self._ids)
+        quote = price * quantity
+        base_asset = symbol.removesuffix("USDT")
+
+        if side == "BUY":
+            commission, commission_asset = quantity * COMMISSION_RATE, base_asset
+            self.balances["USDT"] = self.balances.get("USDT", Decimal("0")) - quote
+            held = self.balances.get(base_asset, Decimal("0"))
+            self.balances[base_asset] = held + quantity - commission
+        else:
+            commission, commission_asset = quote * COMMISSION_RATE, "USDT"
+            self.balances[base_asset] = self.balances.get(base_asset, Decimal("0")) - quantity
+            self.balances["USDT"] = self.balances.get("USDT", Decimal("0")) + quote - commission
+
+        now = int(time.time() * 1000)
+        self.orders[order_id] = {
+            "symbol": symbol,
+            "orderId": order_id,
+            "side": side,
+            "type": "MARKET",
+            "origQty": str(quantity),
+            "executedQty": str(quantity),
+            "cummulativeQuoteQty": str(quote),
+            "status": "FILLED",
+            "transactTime": now,
+            "updateTime": now,
+        }
+        self.trades[order_id] = [{
+            "price": str(price),
+            "qty": str(quantity),
+            "commission": str(commission),
+            "commissionAsset": commission_asset,
+        }]
+        return dict(self.orders[order_id])
+
+    def _trigger_oco(self, symbol: str, price: Decimal) -> None:
+        for order_list in self.order_lists.values():
+            if order_list["symbol"] != symbol or order_list["listOrderStatus"] == "ALL_DONE":
+                continue
+
+            above, below = (self.orders[leg["orderId"]] for leg in order_list["orders"])
+            if price >= Decimal(above["price"]):
+                filled, other, fill_price = above, below, Decimal(above["price"])
+            elif price <= Decimal(below["stopPrice"]):
+                filled, other, fill_price = below, above, Decimal(below["price"])
+            else:
+                continue
+
+            quantity = Decimal(filled["origQty"])
+            quote = fill_price * quantity
+            commission = quote * COMMISSION_RATE
+            base_asset = symbol.removesuffix("USDT")
+            self.balances[base_asset] = self.balances.get(base_asset, Decimal("0")) - quantity
+            self.balances["USDT"] = self.balances.get("USDT", Decimal("0")) + quote - commission
+
+            filled.update(
+                status="FILLED",
+                executedQty=str(quantity),
+                cummulativeQuoteQty=str(quote),
+                updateTime=int(time.time() * 1000),
+            )
+            other["status"] = "EXPIRED"
+            self.trades[filled["orderId"]] = [{
+                "price": str(fill_price),
+                "qty": str(quantity),
+                "commission": str(commission),
+                "commissionAsset": "USDT",
+            }]
+            order_list["listOrderStatus"] = "ALL_DONE"
+            order_list["listStatusType"] = "ALL_DONE"
+
+    # ---- Auth ----
+
+    def _signed(self, handler: Any) -> Any:
+        async def wrapper(request: web.Request) -> web.Response:
+            if request.headers.get("X-MBX-APIKEY") != self._api_key:
+                return _error(401, -2015, "Invalid API-key, IP, or permissions for action.")
+
+            query = request.query_string
+            payload, _, signature = query.rpartition("&signature=")
+            expected = hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(signature, expected):
+                return _error(400, -1022, "Signature for this request is not valid.")
+
+            params = dict(request.query)
+            recv_window = int(params.get("recvWindow", 5000))
+            if abs(time.time() * 1000 - int(params["timestamp"])) > recv_window:
+                return _error(
+                    400, -1021, "Timestamp for this request is outside of the recvWindow."
+                )
+            for name in DECIMAL_PARAMS:
+                if "e" in params.get(name, "").lower():
+                    return _error(400, -1100, f"Illegal characters found in parameter '{name}'.")
+
+            return await handler(params)
+
+        return wrapper
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Binance order endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--api-key", default="test")
+    parser.add_argument("--api-secret", default="test")
+    parser.add_argument(
+        "--price", action="append", default=[], metavar="SYMBOL=PRICE",
+        help="Initial price, repeatable (e.g. BTCUSDT=60000)",
+    )
+    args = parser.parse_args()
+
+    prices = {s: Decimal(p) for s, p in (item.split("=", 1) for item in args.price)}
+    exchange = MockExchange(args.api_key, args.api_secret, prices)
+    web.run_app(exchange.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
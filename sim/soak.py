@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Scale and soak harness.
+
+Runs a paper-trading TradingEngine against sim.synthetic_exchange while
+the symbol universe grows step by step, and reports per sample:
+
+    scan p50/p95/max   time to fetch and build snapshots for the universe
+    lag p95/max        event-loop lag (overshoot of a 100ms sleep)
+    rss                resident memory, and growth since before the first step
+    fds                open file descriptors
+
+Percentiles cover the samples since the previous report, so a week-long
+step keeps no more than one window of timings; maxima cover the step.
+
+The exchange runs in a subprocess by default so its CPU does not count
+against the engine's loop.
+
+Usage:
+    python -m sim.soak --sizes 100,500,1000,2000 --step-seconds 60
+    python -m sim.soak --sizes 500 --step-seconds 604800 --sample-seconds 600   # a week
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Iterable
+
+import aiohttp
+import structlog
+
+from core.engine import TradingEngine
+from core.risk import RiskManager
+from execution.executor import TradeExecutor
+from market.analyzer import DirectMarketData
+from market.endpoints import EndpointPool, set_default_pool
+from market.fetcher import is_host_failure, rate_limit_delay
+from market.latency import percentile
+from sim.synthetic_exchange import SyntheticExchange, symbol_universe
+from wallet.paper_wallet import PaperWallet
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # Peak rather than current RSS, but available everywhere
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def open_fds() -> int | None:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+class TimedMarketData:
+    """
+    Market data wrapper recording how long each universe scan takes.
+    Single-symbol fetches for an open trade's exit checks are not scans.
+    """
+
+    def __init__(self, inner: Any) -> None:
+        self._inner = inner
+        # Scan times since the last drain(), plus step-wide totals
+        self.scans_ms: list[float] = []
+        self.scans = 0
+        self.scan_max_ms = 0.0
+        self.symbols_requested = 0
+        self.symbols_returned = 0
+
+    async def get_snapshots(self, symbols: Iterable[str]) -> list:
+        symbols = list(symbols)
+        start = time.perf_counter()
+        snapshots = await self._inner.get_snapshots(symbols)
+        if len(symbols) > 1:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.scans_ms.append(elapsed_ms)
+            self.scans += 1
+            self.scan_max_ms = max(self.scan_max_ms, elapsed_ms)
+            self.symbols_requested += len(symbols)
+            self.symbols_returned += len(snapshots)
+        return snapshots
+
+    def drain(self) -> list[float]:
+        scans, self.scans_ms = self.scans_ms, []
+        return scans
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.1) -> None:
+        self._interval = interval
+        # Lags since the last drain(), plus the step-wide maximum
+        self.lags_ms: list[float] = []
+        self.lag_max_ms = 0.0
+
+    async def run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            lag_ms = (time.perf_counter() - start - self._interval) * 1000
+            self.lags_ms.append(lag_ms)
+            self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+
+    def drain(self) -> list[float]:
+        lags, self.lags_ms = self.lags_ms, []
+        return lags
+
+
+def build_engine(symbols: list[str], market_data: Any, poll_interval: int) -> TradingEngine:
+    wallet = PaperWallet(starting_balance=Decimal("1000000"))
+    # Limits out of the way so the engine keeps scanning
+    risk = RiskManager(
+        max_daily_loss=Decimal("1000000"),
+        max_trades_per_day=10**9,
+        cooldown_minutes=0,
+        trading_start_hour=0,
+        trading_end_hour=24,
+    )
+    return TradingEngine(
+        symbols=symbols,
+        executor=TradeExecutor(wallet, trade_amount_usdt=Decimal("40")),
+        risk_manager=risk,
+        take_profit_pct=Decimal("0.009"),
+        stop_loss_pct=Decimal("0.0065"),
+        poll_interval_seconds=poll_interval,
+        market_data=market_data,
+        name="soak",
+    )
+
+
+async def run_step(
+    size: int,
+    duration: float,
+    sample_every: float,
+    poll_interval: int,
+    baseline_rss: float,
+) -> dict[str, Any]:
+    market_data = TimedMarketData(DirectMarketData())
+    lag = LoopLagMonitor()
+    engine = build_engine(symbol_universe(size), market_data, poll_interval)
+
+    tasks = [asyncio.create_task(engine.run()), asyncio.create_task(lag.run())]
+    started = time.monotonic()
+    row: dict[str, Any] | None = None
+    try:
+        while (elapsed := time.monotonic() - started) < duration:
+            await asyncio.sleep(min(sample_every, duration - elapsed))
+            row = _sample(size, market_data, lag, baseline_rss, time.monotonic() - started)
+            print(_format(row), flush=True)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if row is None:
+        row = _sample(size, market_data, lag, baseline_rss, time.monotonic() - started)
+    # The step's last window, with step-wide counts and maxima
+    return row
+
+
+def _sample(
+    size: int,
+    market_data: TimedMarketData,
+    lag: LoopLagMonitor,
+    baseline_rss: float,
+    elapsed: float,
+) -> dict[str, Any]:
+    scans = sorted(market_data.drain())
+    lags = sorted(lag.drain())
+    rss = rss_mb()
+    return {
+        "symbols": size,
+        "elapsed_s": round(elapsed, 1),
+        "scans": market_data.scans,
+        "scan_p50_ms": round(percentile(scans, 50), 1),
+        "scan_p95_ms": round(percentile(scans, 95), 1),
+        "scan_max_ms": round(market_data.scan_max_ms, 1),
+        # Share of symbols that came back with a snapshot
+        "snapshot_ratio": (
+            round(market_data.symbols_returned / market_data.symbols_requested, 3)
+            if market_data.symbols_requested
+            else 0.0
+        ),
+        "lag_p95_ms": round(percentile(lags, 95), 1),
+        "lag_max_ms": round(lag.lag_max_ms, 1),
+        "rss_mb": round(rss, 1),
+        "rss_growth_mb": round(rss - baseline_rss, 1),
+        "fds": open_fds(),
+    }
+
+
+def _format(row: dict[str, Any]) -> str:
+    return (
+        f"{row['symbols']:>6} sym {row['elapsed_s']:>8}s  "
+        f"scan p50 {row['scan_p50_ms']:>8} p95 {row['scan_p95_ms']:>8} "
+        f"max {row['scan_max_ms']:>8} ms  "
+        f"ok {row['snapshot_ratio']:>5}  "
+        f"lag p95 {row['lag_p95_ms']:>7} max {row['lag_max_ms']:>7} ms  "
+        f"rss {row['rss_mb']:>7} MB (+{row['rss_growth_mb']})  fds {row['fds']}"
+    )
+
+
+async def start_exchange(args: argparse.Namespace) -> tuple[Any, str]:
+    if args.exchange_url:
+        return None, args.exchange_url.rstrip("/")
+
+    if args.in_process:
+        exchange = SyntheticExchange(args.speed, args.seed, args.latency_ms, args.error_rate)
+        runner, url = await exchange.start()
+        return runner, url
+
+    proc = subprocess.Popen([
+        sys.executable, "-m", "sim.synthetic_exchange",
+        "--port", str(args.port),
+        "--speed", str(args.speed),
+        "--seed", str(args.seed),
+        "--latency-ms", str(args.latency_ms),
+        "--error-rate", str(args.error_rate),
+    ])
+    url = f"http://127.0.0.1:{args.port}"
+
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(f"{url}/api/v3/time") as resp:
+                    if resp.status == 200:
+                        return proc, url
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+
+    proc.terminate()
+    raise RuntimeError("Synthetic exchange did not start")
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    handle, url = await start_exchange(args)
+    set_default_pool(EndpointPool(
+        [url], is_host_failure=is_host_failure, rate_limit_delay=rate_limit_delay
+    ))
+    print(f"exchange at {url}", flush=True)
+
+    results: list[dict[str, Any]] = []
+    # Before the first engine starts, so its own growth counts
+    baseline_rss = rss_mb()
+    try:
+        for size in args.sizes:
+            row = await run_step(
+                size, args.step_seconds, args.sample_seconds, args.poll_interval, baseline_rss
+            )
+            results.append(row)
+    finally:
+        if isinstance(handle, subprocess.Popen):
+            handle.terminate()
+            handle.wait()
+        elif handle is not None:
+            await handle.cleanup()
+
+    print("\nSUMMARY")
+    for row in results:
+        print(_format(row))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scale and soak test against a synthetic exchange")
+    parser.add_argument(
+        "--sizes", type=lambda s: [int(x) for x in s.split(",")], default=[100, 500, 1000, 2000],
+        help="Universe sizes to step through, comma separated",
+    )
+    parser.add_argument("--step-seconds", type=float, default=60.0)
+    parser.add_argument("--sample-seconds", type=float, default=15.0)
+    parser.add_argument("--poll-interval", type=int, default=2)
+    parser.add_argument("--exchange-url", help="Use a running synthetic exchange")
+    parser.add_argument(
+        "--in-process", action="store_true", help="Serve the exchange from this process"
+    )
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="Write the per-step results to this file")
+    args = parser.parse_args()
+
+    # Per-tick engine logs would dominate the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
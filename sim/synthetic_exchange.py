@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Synthetic Binance market data for scale and soak tests.
+
+Serves the public REST endpoints BinanceFetcher uses (klines, book ticker,
+depth, server time) for any symbol that is asked for. Each symbol gets a
+seeded random-walk price path, created on first request and advanced one
+step per elapsed exchange second, so thousands of symbols cost nothing
+until they are polled.
+
+`--speed` runs exchange time faster than wall time (60 = a minute per
+second) so long soaks cover many candles.
+
+Usage:
+    python -m sim.synthetic_exchange --port 8901 --speed 60
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from typing import Any
+
+from aiohttp import web
+
+MINUTE_MS = 60_000
+
+# Completed 1m candles kept per symbol, the REST maximum for klines
+HISTORY = 1000
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.8f}"
+
+
+class SymbolPath:
+    """
+    Random-walk 1m candles for one symbol.
+    """
+
+    __slots__ = (
+        "rng", "sigma", "spread", "candles", "minute", "open", "high",
+        "low", "close", "volume", "trades", "last_second", "update_id",
+    )
+
+    def __init__(self, symbol: str, now_ms: int, seed: int) -> None:
+        self.rng = random.Random(f"{seed}:{symbol}")
+        # Per-second log-volatility and relative spread vary by symbol
+        self.sigma = self.rng.uniform(0.0001, 0.0008)
+        self.spread = self.rng.uniform(0.0001, 0.001)
+        self.candles: deque[list[Any]] = deque(maxlen=HISTORY)
+        self.update_id = 1
+
+        # Backfill completed candles at one step per minute
+        price = self.rng.uniform(0.05, 50_000)
+        minute = now_ms // MINUTE_MS
+        sigma_minute = self.sigma * math.sqrt(60)
+        for m in range(minute - HISTORY, minute):
+            open_ = price
+            price *= math.exp(self.rng.gauss(0, sigma_minute))
+            spread = abs(price - open_) + open_ * sigma_minute * self.rng.random()
+            self.candles.append(self._row(
+                m, open_, max(open_, price) + spread / 2, min(open_, price) - spread / 2,
+                price, self.rng.uniform(10, 1000), self.rng.randint(10, 500),
+            ))
+
+        self.minute = minute
+        self.open = self.high = self.low = self.close = price
+        self.volume = 0.0
+        self.trades = 0
+        self.last_second = now_ms // 1000
+
+    @staticmethod
+    def _row(minute: int, o: float, h: float, l: float, c: float, v: float, n: int) -> list[Any]:
+        open_time = minute * MINUTE_MS
+        return [
+            open_time, _fmt(o), _fmt(h), _fmt(l), _fmt(c), _fmt(v),
+            open_time + MINUTE_MS - 1, _fmt(v * c), n, _fmt(v / 2), _fmt(v * c / 2), "0",
+        ]
+
+    def advance(self, now_ms: int) -> None:
+        second = now_ms // 1000
+        # Gaps longer than the history are skipped rather than replayed
+        steps = min(second - self.last_second, HISTORY * 60)
+        start = second - steps
+
+        for s in range(start + 1, second + 1):
+            minute = s // 60
+            if minute != self.minute:
+                self.candles.append(self._row(
+                    self.minute, self.open, self.high, self.low,
+                    self.close, self.volume, self.trades,
+                ))
+                self.minute = minute
+                self.open = self.high = self.low = self.close
+                self.volume = 0.0
+                self.trades = 0
+
+            self.close *= math.exp(self.rng.gauss(0, self.sigma))
+            self.high = max(self.high, self.close)
+            self.low = min(self.low, self.close)
+            self.volume += self.rng.expovariate(1.0)
+            self.trades += 1
+            self.update_id += 1
+
+        self.last_second = second
+
+    def klines(self, limit: int) -> list[list[Any]]:
+        forming = self._row(
+            self.minute, self.open, self.high, self.low, self.close, self.volume, self.trades
+        )
+        completed = list(self.candles)[-(limit - 1):] if limit > 1 else []
+        return completed + [forming]
+
+    def ticker(self, symbol: str) -> dict[str, Any]:
+        half = self.close * self.spread / 2
+        return {
+            "symbol": symbol,
+            "bidPrice": _fmt(self.close - half),
+            "bidQty": _fmt(self.rng.uniform(0.1, 10)),
+            "askPrice": _fmt(self.close + half),
+            "askQty": _fmt(self.rng.uniform(0.1, 10)),
+        }
+
+    def depth(self, limit: int) -> dict[str, Any]:
+        half = self.close * self.spread / 2
+        tick = self.close * 0.0001
+        return {
+            "lastUpdateId": self.update_id,
+            "bids": [
+                [_fmt(self.close - half - i * tick), _fmt(self.rng.uniform(0.1, 10))]
+                for i in range(limit)
+            ],
+            "asks": [
+                [_fmt(self.close + half + i * tick), _fmt(self.rng.uniform(0.1, 10))]
+                for i in range(limit)
+            ],
+        }
+
+
+class SyntheticExchange:
+    def __init__(
+        self,
+        speed: float = 1.0,
+        seed: int = 0,
+        latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+    ) -> None:
+        self._speed = speed
+        self._seed = seed
+        self._latency = latency_ms / 1000
+        self._error_rate = error_rate
+        self._started = time.time()
+        self._rng = random.Random(seed)
+        self.paths: dict[str, SymbolPath] = {}
+        self.requests = 0
+
+    def now_ms(self) -> int:
+        elapsed = time.time() - self._started
+        return int((self._started + elapsed * self._speed) * 1000)
+
+    def path(self, symbol: str) -> SymbolPath:
+        now = self.now_ms()
+        path = self.paths.get(symbol)
+        if path is None:
+            path = self.paths[symbol] = SymbolPath(symbol, now, self._seed)
+        else:
+            path.advance(now)
+        return path
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._faults])
+        app.router.add_get("/api/v3/time", self._time)
+        app.router.add_get("/api/v3/klines", self._klines)
+        app.router.add_get("/api/v3/ticker/bookTicker", self._ticker)
+        app.router.add_get("/api/v3/depth", self._depth)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, str]:
+        """
+        Serve in the current event loop.
+
+        Returns:
+            The runner (call `cleanup()` to stop) and the base URL
+        """
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound = runner.addresses[0]
+        return runner, f"http://{bound[0]}:{bound[1]}"
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests += 1
+        if self._latency:
+            await asyncio.sleep(self._rng.expovariate(1 / self._latency))
+        if self._error_rate and self._rng.random() < self._error_rate:
+            return web.json_response({"code": -1001, "msg": "Internal error"}, status=503)
+        return await handler(request)
+
+    @staticmethod
+    def _symbol(request: web.Request) -> str:
+        symbol = request.query.get("symbol")
+        if not symbol:
+            raise web.HTTPBadRequest(text='{"code":-1102,"msg":"symbol missing"}')
+        return symbol
+
+    async def _time(self, request: web.Request) -> web.Response:
+        return web.json_response({"serverTime": self.now_ms()})
+
+    async def _klines(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get("limit", 500)), HISTORY)
+        return web.json_response(self.path(self._symbol(request)).klines(limit))
+
+    async def _ticker(self, request: web.Request) -> web.Response:
+        symbol = self._symbol(request)
+        return web.json_response(self.path(symbol).ticker(symbol))
+
+    async def _depth(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get("limit", 100)), 5000)
+        return web.json_response(self.path(self._symbol(request)).depth(limit))
+
+
+def symbol_universe(count: int) -> list[str]:
+    return [f"S{i:05d}USDT" for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic Binance market data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--speed", type=float, default=1.0, help="Exchange seconds per wall second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean injected latency")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests answered 503"
+    )
+    args = parser.parse_args()
+
+    exchange = SyntheticExchange(args.speed, args.seed, args.latency_ms, args.error_rate)
+    web.run_app(exchange.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
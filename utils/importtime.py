@@ -0,0 +1,52 @@
+import importlib
+import sys
+import time
+from typing import Iterable
+
+
+def measure_imports(modules: Iterable[str]) -> list[tuple[str, float]]:
+    """
+    Import modules in order and time each one.
+
+    Modules already imported by an earlier entry report only their
+    incremental cost, so the sum is the total cold-start import time.
+
+    Args:
+        modules: Dotted module names
+
+    Returns:
+        List of (module, milliseconds); failed imports report -1
+    """
+    timings: list[tuple[str, float]] = []
+
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            timings.append((name, -1.0))
+            continue
+        timings.append((name, (time.perf_counter() - start) * 1000))
+
+    return timings
+
+
+def print_import_report(timings: list[tuple[str, float]]) -> None:
+    width = max((len(name) for name, _ in timings), default=0)
+    total = 0.0
+
+    print("\n" + "=" * 60)
+    print("IMPORT TIMES")
+    print("=" * 60)
+
+    for name, ms in timings:
+        if ms < 0:
+            print(f"  {name:<{width}}  not installed")
+            continue
+        total += ms
+        print(f"  {name:<{width}}  {ms:8.1f} ms")
+
+    print("-" * 60)
+    print(f"  {'total':<{width}}  {total:8.1f} ms")
+    print(f"  modules loaded: {len(sys.modules)}")
+    print("=" * 60 + "\n")
@@ -1,14 +1,165 @@
-import structlog
+import atexit
+import json
 import logging
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, TextIO
+
+import structlog
+
+# Minimum seconds between two records of the same high-frequency event
+DEFAULT_RATE_LIMITS: dict[str, float] = {
+    "engine.tick": 10.0,
+    "market.selected": 1.0,
+    "trade.blocked": 30.0,
+    "market.stale": 10.0,
+}
+
+
+def _json_serializer() -> Callable[..., str]:
+    try:
+        import orjson
+    except ImportError:
+        def dumps(obj: Any, **kwargs: Any) -> str:
+            return json.dumps(obj, separators=(",", ":"), default=str)
+
+        return dumps
+
+    def dumps_orjson(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    return dumps_orjson
+
+
+class EventRateLimiter:
+    """
+    structlog processor that drops repeats of an event within its interval.
+
+    The next record that gets through carries a `suppressed` count so the
+    volume is still visible in the output.
+    """
+
+    def __init__(self, limits: dict[str, float]) -> None:
+        self._limits = limits
+        self._last_emit: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+        event = event_dict.get("event")
+        interval = self._limits.get(event)
+        if interval is None:
+            return event_dict
+
+        now = time.monotonic()
+        last = self._last_emit.get(event)
+        if last is not None and now - last < interval:
+            self._suppressed[event] = self._suppressed.get(event, 0) + 1
+            raise structlog.DropEvent
+
+        self._last_emit[event] = now
+        suppressed = self._suppressed.pop(event, 0)
+        if suppressed:
+            event_dict["suppressed"] = suppressed
+        return event_dict
+
 
+class QueueLogger:
+    """
+    Minimal structlog logger that hands rendered lines to a background writer.
+    """
 
-def setup_logging() -> None:
+    def __init__(self, writer: "BackgroundWriter") -> None:
+        self._writer = writer
+
+    def msg(self, message: str) -> None:
+        self._writer.put(message)
+
+    log = debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+class BackgroundWriter:
+    """
+    Drains log lines from an in-memory queue to a stream on a daemon thread,
+    so the event loop never blocks on stdout.
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_queue: int = 100_000) -> None:
+        self._stream = stream or sys.stdout
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_queue)
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            # Never stall the caller; the writer reports the loss later
+            self._dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            line = self._queue.get()
+            batch = [line]
+            # Coalesce whatever is already queued into one write
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            lines = [item for item in batch if item is not None]
+
+            if self._dropped:
+                lines.append(json.dumps({"event": "logging.dropped", "count": self._dropped}))
+                self._dropped = 0
+
+            if lines:
+                self._stream.write("\n".join(lines) + "\n")
+                self._stream.flush()
+
+            if stop:
+                return
+
+
+def setup_logging(
+    async_mode: bool = False,
+    rate_limits: dict[str, float] | None = None,
+) -> None:
     logging.basicConfig(level=logging.INFO)
 
+    if not async_mode:
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+            processors=[
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.JSONRenderer()
+            ],
+        )
+        return
+
+    writer = BackgroundWriter()
+    atexit.register(writer.close)
+
     structlog.configure(
         wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
         processors=[
+            EventRateLimiter(DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits),
+            structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.JSONRenderer()
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=_json_serializer()),
         ],
+        logger_factory=lambda *args: QueueLogger(writer),
+        cache_logger_on_first_use=True,
     )
@@ -0,0 +1,174 @@
+"""
+On-demand profiling of the running bot.
+
+Triggers, without restarting the process:
+
+    kill -USR1 <pid>                            # profile for the default duration
+    kill -USR2 <pid>                            # dump asyncio task stacks
+    curl 127.0.0.1:<port>/profile?seconds=30    # admin endpoint, if enabled
+    curl 127.0.0.1:<port>/tasks
+
+Profiles are deterministic (cProfile) and cover everything the event loop
+runs while enabled: engine ticks, snapshot building, repositories and the
+notifier. Results are written to `output_dir` with a UTC timestamp.
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+from datetime import datetime, timezone
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+def format_task_stacks(limit: int = 20) -> str:
+    """
+    Current stack of every asyncio task on the running loop.
+    """
+    out = io.StringIO()
+    tasks = sorted(asyncio.all_tasks(), key=lambda t: t.get_name())
+    out.write(f"{len(tasks)} tasks\n")
+    for task in tasks:
+        out.write(f"\n--- {task.get_name()} {task.get_coro()!r}\n")
+        task.print_stack(limit=limit, file=out)
+    return out.getvalue()
+
+
+class RuntimeProfiler:
+    def __init__(
+        self,
+        output_dir: str | os.PathLike[str] = "state/profiles",
+        default_seconds: float = 30.0,
+        max_seconds: float = 600.0,
+    ) -> None:
+        self._dir = Path(output_dir)
+        self._default_seconds = default_seconds
+        self._max_seconds = max_seconds
+        self._running: asyncio.Task | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._running is not None and not self._running.done()
+
+    def _stamp(self) -> str:
+        return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def _write(self, name: str, data: str | bytes) -> Path:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self._dir / name
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(data)
+        return path
+
+    async def profile(self, seconds: float | None = None) -> Path:
+        """
+        Profile the event loop thread for `seconds`.
+
+        Returns:
+            Path of the text report; the raw .pstats file sits next to it
+        """
+        if self.active:
+            raise RuntimeError("A profile is already running")
+
+        seconds = min(seconds or self._default_seconds, self._max_seconds)
+        self._running = asyncio.current_task()
+        stamp = self._stamp()
+        logger.info("profile.started", seconds=seconds)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            self._running = None
+
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(60)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(30)
+
+        # Task stacks at the end of the window show where time is waiting
+        report.write("\n\n===== asyncio tasks =====\n")
+        report.write(format_task_stacks())
+
+        stats_path = self._dir / f"{stamp}-profile.pstats"
+        await asyncio.to_thread(self._dir.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(stats.dump_stats, stats_path)
+        path = await asyncio.to_thread(self._write, f"{stamp}-profile.txt", report.getvalue())
+
+        logger.info("profile.written", path=str(path), stats=str(stats_path))
+        return path
+
+    async def dump_tasks(self) -> Path:
+        path = await asyncio.to_thread(
+            self._write, f"{self._stamp()}-tasks.txt", format_task_stacks()
+        )
+        logger.info("profile.tasks_written", path=str(path))
+        return path
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        task.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("profile.failed", error=str(task.exception()))
+
+    def install_signal_handlers(self) -> bool:
+        """
+        SIGUSR1 starts a profile, SIGUSR2 dumps task stacks. Must be called
+        from the running loop; returns False where signals are unavailable.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, lambda: self._spawn(self.profile()))
+            loop.add_signal_handler(signal.SIGUSR2, lambda: self._spawn(self.dump_tasks()))
+        except (AttributeError, NotImplementedError, RuntimeError):
+            return False
+        return True
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """
+        Admin endpoint: GET /profile?seconds=N and GET /tasks. Keep it on
+        localhost; it has no authentication.
+        """
+        from aiohttp import web
+
+        async def handle_profile(request: web.Request) -> web.Response:
+            try:
+                seconds = float(request.query.get("seconds", self._default_seconds))
+            except ValueError:
+                return web.json_response({"error": "invalid seconds"}, status=400)
+            try:
+                path = await self.profile(seconds)
+            except RuntimeError as exc:
+                return web.json_response({"error": str(exc)}, status=409)
+            return web.json_response({"path": str(path)})
+
+        async def handle_tasks(request: web.Request) -> web.Response:
+            await self.dump_tasks()
+            return web.Response(text=format_task_stacks())
+
+        app = web.Application()
+        app.router.add_get("/profile", handle_profile)
+        app.router.add_get("/tasks", handle_tasks)
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info("profile.admin_listening", host=host, port=port)
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
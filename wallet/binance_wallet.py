@@ -0,0 +1,438 @@
+import hashlib
+import hmac
+import time
+from collections import deque
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, Decimal
+from typing import Any, Callable
+from urllib.parse import urlencode
+from uuid import uuid4
+
+import aiohttp
+import structlog
+from yarl import URL
+
+from core import clock
+from core.clock import utc_now
+from core.models import Trade
+from wallet.interface import Wallet
+
+logger = structlog.get_logger()
+
+BINANCE_API_URL = "https://api.binance.com"
+
+
+class BinanceAPIError(RuntimeError):
+    def __init__(self, status: int, code: int | None, message: str) -> None:
+        super().__init__(f"Binance API error {status} ({code}): {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+class RequestSigner:
+    """
+    HMAC-SHA256 signer with the key schedule computed once.
+
+    Copying a keyed HMAC object skips re-hashing the secret on every request.
+    """
+
+    def __init__(self, secret: str) -> None:
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, payload: str) -> str:
+        mac = self._mac.copy()
+        mac.update(payload.encode())
+        return mac.hexdigest()
+
+
+@dataclass
+class OrderRecord:
+    client_order_id: str
+    symbol: str
+    side: str
+    order_type: str
+    submitted_at: float
+    acked_at: float | None = None
+    exchange_time_ms: int | None = None
+    status: str | None = None
+
+    @property
+    def latency_ms(self) -> float | None:
+        if self.acked_at is None:
+            return None
+        return (self.acked_at - self.submitted_at) * 1000
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    base_asset: str
+    quote_asset: str
+    tick_size: Decimal
+    step_size: Decimal
+
+    def round_price(self, price: Decimal) -> Decimal:
+        return (price / self.tick_size).to_integral_value(ROUND_DOWN) * self.tick_size
+
+    def round_quantity(self, quantity: Decimal) -> Decimal:
+        return (quantity / self.step_size).to_integral_value(ROUND_DOWN) * self.step_size
+
+
+def _fmt(value: Decimal) -> str:
+    # Plain notation: a normalized step such as 1E+1 would otherwise
+    # stringify quantities as "3E+1", which Binance rejects
+    return format(value, "f")
+
+
+def _fill_totals(order: dict[str, Any]) -> tuple[Decimal, Decimal]:
+    return Decimal(order["executedQty"]), Decimal(order["cummulativeQuoteQty"])
+
+
+def _commission(order: dict[str, Any], asset: str) -> Decimal:
+    return sum(
+        (Decimal(f["commission"]) for f in order.get("fills", []) if f["commissionAsset"] == asset),
+        Decimal("0"),
+    )
+
+
+class BinanceWallet(Wallet):
+    """
+    Live spot wallet.
+
+    Entries are MARKET buys; right after the fill an OCO sell (LIMIT_MAKER
+    take-profit above, STOP_LOSS_LIMIT below) is placed so the exchange
+    exits the position even if the bot is slow or down.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = BINANCE_API_URL,
+        recv_window_ms: int = 5000,
+        stop_limit_buffer: Decimal = Decimal("0.002"),  # 0.2% below stop
+        time_source: Callable[[], int] | None = None,
+        timeout_seconds: int = 5,
+    ) -> None:
+        self._api_key = api_key
+        self._signer = RequestSigner(api_secret)
+        self._base_url = base_url.rstrip("/")
+        self._recv_window = recv_window_ms
+        self._stop_limit_buffer = stop_limit_buffer
+        # Exchange-corrected by default, see market.clock_sync
+        self._time_source = time_source or clock.now_ms
+        self._timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self._session: aiohttp.ClientSession | None = None
+        self._filters: dict[str, SymbolFilters] = {}
+        # trade_id -> {"symbol", "order_list_id"} of the protective OCO
+        self._oco: dict[str, dict[str, Any]] = {}
+        self.order_log: deque[OrderRecord] = deque(maxlen=500)
+
+    async def connect(self) -> None:
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            headers={"X-MBX-APIKEY": self._api_key},
+            connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+        )
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def get_balance(self) -> Decimal:
+        account = await self._request("GET", "/api/v3/account", {}, signed=True)
+        for balance in account["balances"]:
+            if balance["asset"] == "USDT":
+                return Decimal(balance["free"])
+        return Decimal("0")
+
+    async def open_trade(
+        self,
+        symbol: str,
+        price: Decimal,
+        quantity: Decimal,
+        take_profit: Decimal,
+        stop_loss: Decimal,
+    ) -> Trade:
+        filters = await self._get_filters(symbol)
+
+        order = await self._submit_order(
+            symbol=symbol,
+            side="BUY",
+            order_type="MARKET",
+            quantity=filters.round_quantity(quantity),
+        )
+
+        executed_qty, quote_qty = _fill_totals(order)
+        if executed_qty <= 0:
+            raise RuntimeError(f"Entry order for {symbol} did not fill")
+
+        entry_price = quote_qty / executed_qty
+        # Commission charged in the base asset reduces what we can sell
+        received_qty = executed_qty - _commission(order, filters.base_asset)
+        held_qty = filters.round_quantity(received_qty)
+        if held_qty <= 0:
+            raise RuntimeError(f"Entry for {symbol} left less than one lot after commission")
+        # Quote paid per unit actually received, fees included; the step
+        # rounding dust stays in the account and is not costed to the trade
+        unit_cost = (quote_qty + _commission(order, filters.quote_asset)) / received_qty
+
+        trade = Trade(
+            trade_id=str(uuid4()),
+            symbol=symbol,
+            entry_price=entry_price,
+            quantity=held_qty,
+            take_profit=filters.round_price(take_profit),
+            stop_loss=filters.round_price(stop_loss),
+            opened_at=utc_now(),
+            entry_cost=unit_cost * held_qty,
+        )
+
+        try:
+            oco = await self._place_exit_oco(trade, filters)
+            self._oco[trade.trade_id] = {"symbol": symbol, "order_list_id": oco["orderListId"]}
+        except Exception as exc:
+            # The position exists either way; the engine's price-based exit
+            # still covers it, so report the trade instead of losing it
+            logger.error("live.oco.failed", symbol=symbol, trade_id=trade.trade_id, error=str(exc))
+
+        return trade
+
+    async def close_trade(
+        self,
+        trade: Trade,
+        exit_price: Decimal,
+    ) -> Trade:
+        closed = await self.poll_closed(trade)
+        if closed is not None:
+            return closed
+
+        oco = self._oco.get(trade.trade_id)
+        if oco is not None:
+            try:
+                await self._request(
+                    "DELETE",
+                    "/api/v3/orderList",
+                    {"symbol": trade.symbol, "orderListId": oco["order_list_id"]},
+                    signed=True,
+                )
+            except BinanceAPIError:
+                # The OCO finished between the poll and the cancel
+                closed = await self.poll_closed(trade)
+                if closed is not None:
+                    return closed
+                raise
+
+        order = await self._submit_order(
+            symbol=trade.symbol,
+            side="SELL",
+            order_type="MARKET",
+            quantity=trade.quantity,
+        )
+
+        filters = await self._get_filters(trade.symbol)
+        executed_qty, quote_qty = _fill_totals(order)
+        fee = _commission(order, filters.quote_asset)
+
+        self._oco.pop(trade.trade_id, None)
+        return self._finalize(trade, executed_qty, quote_qty, fee)
+
+    async def poll_closed(self, trade: Trade) -> Trade | None:
+        oco = self._oco.get(trade.trade_id)
+        if oco is None:
+            return None
+
+        order_list = await self._request(
+            "GET",
+            "/api/v3/orderList",
+            {"orderListId": oco["order_list_id"]},
+            signed=True,
+        )
+        if order_list.get("listOrderStatus") != "ALL_DONE":
+            return None
+
+        for leg in order_list.get("orders", []):
+            order = await self._request(
+                "GET",
+                "/api/v3/order",
+                {"symbol": trade.symbol, "orderId": leg["orderId"]},
+                signed=True,
+            )
+            if order.get("status") != "FILLED":
+                continue
+
+            executed_qty, quote_qty = _fill_totals(order)
+            # Order queries carry no commission, the account trades do
+            fills = await self._request(
+                "GET",
+                "/api/v3/myTrades",
+                {"symbol": trade.symbol, "orderId": leg["orderId"]},
+                signed=True,
+            )
+            filters = await self._get_filters(trade.symbol)
+            fee = _commission({"fills": fills}, filters.quote_asset)
+            self._oco.pop(trade.trade_id, None)
+            logger.info(
+                "live.exit.filled_on_exchange",
+                symbol=trade.symbol,
+                order_id=order.get("orderId"),
+                order_type=order.get("type"),
+            )
+            return self._finalize(trade, executed_qty, quote_qty, fee)
+
+        return None
+
+    def export_state(self) -> dict:
+        return {"oco": dict(self._oco)}
+
+    def restore_state(self, state: dict) -> None:
+        self._oco = dict(state.get("oco") or {})
+
+    def _finalize(
+        self,
+        trade: Trade,
+        executed_qty: Decimal,
+        quote_qty: Decimal,
+        fee: Decimal,
+    ) -> Trade:
+        exit_price = quote_qty / executed_qty if executed_qty > 0 else Decimal("0")
+        trade.exit_price = exit_price
+        trade.closed_at = utc_now()
+        entry_cost = (
+            trade.entry_cost
+            if trade.entry_cost is not None
+            else trade.entry_price * trade.quantity
+        )
+        # Only the quantity actually sold is costed
+        if 0 < executed_qty < trade.quantity:
+            entry_cost = entry_cost * executed_qty / trade.quantity
+        trade.pnl = quote_qty - fee - entry_cost
+        return trade
+
+    async def _place_exit_oco(self, trade: Trade, filters: SymbolFilters) -> dict[str, Any]:
+        below_price = filters.round_price(
+            trade.stop_loss * (Decimal("1") - self._stop_limit_buffer)
+        )
+        list_client_id = f"bot-oco-{uuid4().hex[:16]}"
+        record = OrderRecord(
+            client_order_id=list_client_id,
+            symbol=trade.symbol,
+            side="SELL",
+            order_type="OCO",
+            submitted_at=time.time(),
+        )
+        self.order_log.append(record)
+
+        response = await self._request(
+            "POST",
+            "/api/v3/orderList/oco",
+            {
+                "symbol": trade.symbol,
+                "side": "SELL",
+                "quantity": _fmt(trade.quantity),
+                "aboveType": "LIMIT_MAKER",
+                "abovePrice": _fmt(trade.take_profit),
+                "belowType": "STOP_LOSS_LIMIT",
+                "belowStopPrice": _fmt(trade.stop_loss),
+                "belowPrice": _fmt(below_price),
+                "belowTimeInForce": "GTC",
+                "listClientOrderId": list_client_id,
+            },
+            signed=True,
+        )
+
+        self._record_ack(record, response.get("transactionTime"), response.get("listOrderStatus"))
+        return response
+
+    async def _submit_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+    ) -> dict[str, Any]:
+        client_order_id = f"bot-{uuid4().hex[:20]}"
+        record = OrderRecord(
+            client_order_id=client_order_id,
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            submitted_at=time.time(),
+        )
+        self.order_log.append(record)
+
+        response = await self._request(
+            "POST",
+            "/api/v3/order",
+            {
+                "symbol": symbol,
+                "side": side,
+                "type": order_type,
+                "quantity": _fmt(quantity),
+                "newClientOrderId": client_order_id,
+                "newOrderRespType": "FULL",
+            },
+            signed=True,
+        )
+
+        self._record_ack(record, response.get("transactTime"), response.get("status"))
+        return response
+
+    def _record_ack(
+        self, record: OrderRecord, exchange_time_ms: int | None, status: str | None
+    ) -> None:
+        record.acked_at = time.time()
+        record.exchange_time_ms = exchange_time_ms
+        record.status = status
+        logger.info(
+            "live.order.acked",
+            client_order_id=record.client_order_id,
+            symbol=record.symbol,
+            side=record.side,
+            type=record.order_type,
+            status=status,
+            latency_ms=round(record.latency_ms or 0.0, 2),
+        )
+
+    async def _get_filters(self, symbol: str) -> SymbolFilters:
+        cached = self._filters.get(symbol)
+        if cached is not None:
+            return cached
+
+        info = await self._request("GET", "/api/v3/exchangeInfo", {"symbol": symbol})
+        data = info["symbols"][0]
+        by_type = {f["filterType"]: f for f in data["filters"]}
+
+        filters = SymbolFilters(
+            base_asset=data["baseAsset"],
+            quote_asset=data["quoteAsset"],
+            tick_size=Decimal(by_type["PRICE_FILTER"]["tickSize"]).normalize(),
+            step_size=Decimal(by_type["LOT_SIZE"]["stepSize"]).normalize(),
+        )
+        self._filters[symbol] = filters
+        return filters
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any],
+        signed: bool = False,
+    ) -> Any:
+        assert self._session is not None, "Wallet not connected"
+
+        if signed:
+            params = {**params, "recvWindow": self._recv_window, "timestamp": self._time_source()}
+            query = urlencode(params)
+            query = f"{query}&signature={self._signer.sign(query)}"
+        else:
+            query = urlencode(params)
+
+        # encoded=True keeps the query byte-identical to what was signed
+        url = URL(f"{self._base_url}{path}?{query}", encoded=True)
+        async with self._session.request(method, url) as resp:
+            data = await resp.json(content_type=None)
+            if resp.status >= 400:
+                raise BinanceAPIError(resp.status, data.get("code"), data.get("msg", ""))
+            return data
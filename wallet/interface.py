@@ -26,3 +26,16 @@ class Wallet(ABC):
         exit_price: Decimal,
     ) -> Trade:
         ...
+
+    async def poll_closed(self, trade: Trade) -> Trade | None:
+        """
+        Closed trade if the exchange exited the position on its own
+        (e.g. an OCO leg filled), otherwise None.
+        """
+        return None
+
+    def export_state(self) -> dict:
+        return {}
+
+    def restore_state(self, state: dict) -> None:
+        return None
@@ -1,9 +1,18 @@
-from decimal import Decimal
-from datetime import datetime, timezone
+from decimal import ROUND_DOWN, Decimal
 from uuid import uuid4
 
 from wallet.interface import Wallet
+from core.clock import Clock, get_clock
 from core.models import Trade
+from execution.fill_simulator import FillResult, FillSimulator
+from core.serialization import trade_from_dict, trade_to_dict
+
+
+def _fee_rate(fill: FillResult) -> Decimal:
+    # The simulator's own fee as a share of the fill's value, so the
+    # wallet charges what the fill model charged
+    value = fill.avg_price * fill.filled
+    return Decimal(repr(fill.fee / value)) if value else Decimal("0")
 
 
 class PaperWallet(Wallet):
@@ -12,10 +21,21 @@ class PaperWallet(Wallet):
         starting_balance: Decimal,
         fee_rate: Decimal = Decimal("0.001"),  # 0.1%
         slippage_rate: Decimal = Decimal("0.0002"),  # 0.02%
+        order_books=None,
+        fill_simulator: FillSimulator | None = None,
+        clock: Clock | None = None,
     ) -> None:
+        self._clock = clock or get_clock()
         self._balance = starting_balance
         self._fee_rate = fee_rate
         self._slippage_rate = slippage_rate
+        # Optional OrderBookManager; when a book is in sync, fills walk its
+        # levels instead of applying the flat slippage
+        self._order_books = order_books
+        self._fill_simulator = fill_simulator or FillSimulator(
+            taker_fee_rate=float(fee_rate),
+            maker_fee_rate=float(fee_rate),
+        )
         self._open_trade: Trade | None = None
 
     async def get_balance(self) -> Decimal:
@@ -33,10 +53,22 @@ class PaperWallet(Wallet):
             raise RuntimeError("Trade already open")
 
         # Simulate slippage on entry (worse price)
-        entry_price = price * (Decimal("1") + self._slippage_rate)
+        fill = await self._simulate_fill(symbol, "BUY", quantity)
+        if fill is not None:
+            entry_price = Decimal(repr(fill.avg_price))
+            # Thin books may only fill part of the order
+            # Round down so the recorded quantity never exceeds what filled
+            filled = Decimal(repr(fill.filled)).quantize(Decimal("0.000001"), rounding=ROUND_DOWN)
+            if filled <= 0:
+                raise RuntimeError(f"Order book for {symbol} too thin to fill the entry")
+            quantity = min(quantity, filled)
+            fee_rate = _fee_rate(fill)
+        else:
+            entry_price = price * (Decimal("1") + self._slippage_rate)
+            fee_rate = self._fee_rate
 
         cost = entry_price * quantity
-        fee = cost * self._fee_rate
+        fee = cost * fee_rate
         total_cost = cost + fee
 
         if total_cost > self._balance:
@@ -51,7 +83,7 @@ class PaperWallet(Wallet):
             quantity=quantity,
             take_profit=take_profit,
             stop_loss=stop_loss,
-            opened_at=datetime.now(timezone.utc),
+            opened_at=self._clock.utc_now(),
         )
 
         self._open_trade = trade
@@ -66,10 +98,20 @@ class PaperWallet(Wallet):
             raise RuntimeError("No open trade to close")
 
         # Simulate slippage on exit (worse price)
-        adjusted_exit_price = exit_price * (Decimal("1") - self._slippage_rate)
+        fallback_price = exit_price * (Decimal("1") - self._slippage_rate)
+        fill = await self._simulate_fill(trade.symbol, "SELL", trade.quantity)
+        if fill is not None:
+            # Whatever the book cannot absorb goes at the flat-slippage price
+            filled = min(trade.quantity, Decimal(repr(fill.filled)))
+            book_value = Decimal(repr(fill.avg_price)) * filled
+            rest_value = fallback_price * (trade.quantity - filled)
+            adjusted_exit_price = (book_value + rest_value) / trade.quantity
+            fee = book_value * _fee_rate(fill) + rest_value * self._fee_rate
+        else:
+            adjusted_exit_price = fallback_price
+            fee = adjusted_exit_price * trade.quantity * self._fee_rate
 
         gross_value = adjusted_exit_price * trade.quantity
-        fee = gross_value * self._fee_rate
         net_value = gross_value - fee
 
         self._balance += net_value
@@ -77,8 +119,42 @@ class PaperWallet(Wallet):
         pnl = net_value - (trade.entry_price * trade.quantity)
 
         trade.exit_price = adjusted_exit_price
-        trade.closed_at = datetime.now(timezone.utc)
+        trade.closed_at = self._clock.utc_now()
         trade.pnl = pnl
 
         self._open_trade = None
         return trade
+
+    async def _simulate_fill(
+        self, symbol: str, side: str, quantity: Decimal
+    ) -> FillResult | None:
+        if self._order_books is None:
+            return None
+
+        latency_ms = self._fill_simulator.latency_ms
+        if latency_ms > 0:
+            # The order reaches the book only after the network delay
+            await self._clock.sleep(latency_ms / 1000)
+
+        book = self._order_books.book(symbol)
+        if book is None:
+            return None
+
+        fill = self._fill_simulator.fill_book_side(
+            side,
+            float(quantity),
+            book.asks if side == "BUY" else book.bids,
+        )
+        return fill if fill.filled > 0 else None
+
+    def export_state(self) -> dict:
+        return {
+            "balance": str(self._balance),
+            "open_trade": trade_to_dict(self._open_trade) if self._open_trade else None,
+        }
+
+    def restore_state(self, state: dict) -> None:
+        balance = Decimal(state["balance"])
+        open_trade = state.get("open_trade")
+        trade = trade_from_dict(open_trade) if open_trade else None
+        self._balance, self._open_trade = balance, trade